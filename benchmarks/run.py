@@ -0,0 +1,252 @@
+""" Benchmark every stage of Beth on generated workloads.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json
+
+Each stage reports its best wall time over `--repeat` runs, its throughput
+(lines, instructions or executed instructions per second) and the peak
+memory allocated while it runs, measured in a separate traced run.
+"""
+from math import inf
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+
+import click
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from beth.Compiler import Compiler  # noqa: E402
+from beth.Loader import Loader  # noqa: E402
+from beth.Parser import Parser  # noqa: E402
+from beth.Preprocessor import Preprocessor  # noqa: E402
+from beth.Profiler import Profiler  # noqa: E402
+from beth.Runner import Runner  # noqa: E402
+from beth.ThreadedVM import ThreadedVM  # noqa: E402
+from beth.Tokenizer import Tokenizer  # noqa: E402
+from beth.VM import VM  # noqa: E402
+
+from workloads import WORKLOADS  # noqa: E402
+
+ENGINES = {
+    'vm': VM,
+    'threaded': ThreadedVM,
+}
+
+
+class Sink:
+    """ Output stream that throws everything away. """
+    def write(self, string):
+        return len(string)
+
+    def flush(self):
+        pass
+
+
+class Bench:
+    def __init__(self, path, repeat, memory):
+        self.path = path
+        self.repeat = repeat
+        self.memory = memory
+
+        loader = Loader()
+        loader.load(path)
+        pre = Preprocessor()
+        pre.process(loader.code)
+        self.code = loader.code
+        self.instructions = pre.instructions
+        self.labels = pre.labels
+
+    def run(self):
+        """ Measure every stage, returns {stage: measurement}. """
+        results = {
+            'loader': self.measure(self.load),
+            'parser': self.measure(self.parse, Parser),
+            'tokenizer': self.measure(self.parse, Tokenizer),
+            'preprocessor': self.measure(self.preprocess),
+            'compiler': self.measure(self.compile),
+        }
+
+        executed = self.count_executed()
+        for name, engine in ENGINES.items():
+            results[f'startup_{name}'] = self.measure(self.start, engine)
+            results[name] = self.measure(
+                self.execute, self.runner(engine), executed)
+
+        return results
+
+    def measure(self, stage, *args):
+        best = inf
+        for _ in range(self.repeat):
+            start = perf_counter()
+            items = stage(*args)
+            best = min(best, perf_counter() - start)
+
+        peak = None
+        if self.memory:
+            tracemalloc.start()
+            stage(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        return {
+            'seconds': best,
+            'items': items,
+            'per_second': items / best if best else None,
+            'peak_bytes': peak,
+        }
+
+    """ Stages, each returns the number of items it processed. """
+    def load(self):
+        loader = Loader()
+        loader.load(self.path)
+        return len(loader.code)
+
+    def parse(self, parser_class):
+        # a Parser is single use, so both get a fresh one per instruction
+        for instruction in self.instructions:
+            parser = parser_class()
+            parser.parse(instruction)
+            if parser.err():
+                raise RuntimeError(f'failed to parse: {instruction}')
+        return len(self.instructions)
+
+    def preprocess(self):
+        pre = Preprocessor()
+        pre.process(self.code)
+        return len(pre.instructions)
+
+    def compile(self):
+        compiler = Compiler(VM().opcodes)
+        compiler.compile(self.instructions, self.labels)
+        return len(compiler.program.code)
+
+    def start(self, engine):
+        """ Load, compile and install from scratch, like `beth --no-cache`.
+        """
+        return len(self.runner(engine).program.code)
+
+    @staticmethod
+    def execute(runner, executed):
+        result = runner.run(stdout=Sink())
+        if result.err:
+            raise RuntimeError(result.err)
+        return executed
+
+    def runner(self, engine, fuse=True):
+        runner = Runner(engine, fuse)
+        runner.load(self.path)
+        if runner.err:
+            raise RuntimeError(runner.err)
+        return runner
+
+    def count_executed(self):
+        """ Number of instructions a run executes, counted without fusion.
+        """
+        runner = self.runner(VM, fuse=False)
+        runner.vm.output.stream = Sink()
+        profiler = Profiler(runner.vm)
+        profiler.execute()
+        return sum(profiler.counts)
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def report(results, baseline=None):
+    click.echo(f'{"workload":<14} {"stage":<18} {"seconds":>9} '
+               f'{"items/s":>12} {"peak KiB":>9}' +
+               (f' {"change":>8}' if baseline else ''))
+
+    for workload, stages in results.items():
+        for stage, measured in stages.items():
+            peak = measured['peak_bytes']
+            peak = '-' if peak is None else f'{peak / 1024:.0f}'
+            line = f'{workload:<14} {stage:<18} ' \
+                   f'{measured["seconds"]:>9.4f} ' \
+                   f'{measured["per_second"] or 0:>12,.0f} {peak:>9}'
+
+            if baseline:
+                before = baseline.get(workload, {}).get(stage)
+                if before and before['seconds']:
+                    change = measured['seconds'] / before['seconds'] - 1
+                    line += f' {change:>+8.1%}'
+
+            click.echo(line)
+
+
+@click.command(help='Benchmark Beth on generated SmallO workloads.')
+@click.option(
+    '--workload', '-w',
+    type=click.Choice(WORKLOADS),
+    multiple=True,
+    help='Workload to run, may be repeated. [default: all]',
+)
+@click.option(
+    '--scale',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Grow every workload by this factor.',
+)
+@click.option(
+    '--repeat',
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help='Runs per stage, the fastest one is reported.',
+)
+@click.option(
+    '--memory/--no-memory',
+    default=True,
+    show_default=True,
+    help='Trace the peak memory of every stage in one extra run.',
+)
+@click.option(
+    '--output', '-o',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Save the results as JSON.',
+)
+@click.option(
+    '--compare',
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help='JSON results of an earlier run to compare against.',
+)
+def main(workload, scale, repeat, memory, output, compare):
+    baseline = None
+    if compare is not None:
+        baseline = json.loads(Path(compare).read_text())['results']
+
+    results = {}
+    with TemporaryDirectory() as directory:
+        for name in workload or WORKLOADS:
+            path = WORKLOADS[name](directory, scale)
+            results[name] = Bench(path, repeat, memory).run()
+
+    report(results, baseline)
+
+    if output is not None:
+        Path(output).write_text(json.dumps({
+            'commit': commit(),
+            'python': platform.python_version(),
+            'scale': scale,
+            'repeat': repeat,
+            'results': results,
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+""" Generated SmallO workloads.
+
+Every workload writes its sources into a directory and returns the path of
+the entry point. `scale` grows each workload roughly linearly.
+"""
+from pathlib import Path
+
+
+def tight_loop(directory, scale):
+    """ Integer arithmetic and a compare-and-branch per iteration. """
+    return _write(directory, 'tight_loop.so', f'''
+        put 0 i
+        put 0 sum
+        loop:
+            add sum i sum
+            mul i 3 t
+            mod t 7 t
+            sub sum t sum
+            add i 1 i
+            lth i {20_000 * scale} c
+            jmpt c loop
+        outl sum
+        end
+    ''')
+
+
+def recursion(directory, scale):
+    """ Deep `br`/`back` recursion in the style of factorial.so. """
+    return _write(directory, 'recursion.so', f'''
+        put 0 round
+        again:
+            put 200 n
+            br down
+            add round 1 round
+            lth round {50 * scale} c
+            jmpt c again
+        outl round
+        end
+
+        down:
+            jmpf n bottom
+            sub n 1 n
+            br down
+            add n 1 n
+        bottom:
+            back
+    ''')
+
+
+def strings(directory, scale):
+    """ Strings built up with `con` and compared with `eq`. """
+    return _write(directory, 'strings.so', f'''
+        put 0 i
+        outer:
+            put "" s
+            put 0 j
+        inner:
+            con s "abc" s
+            con s j s
+            add j 1 j
+            lth j 40 c
+            jmpt c inner
+            eq s "" c
+            add i 1 i
+            lth i {250 * scale} c
+            jmpt c outer
+        outl i
+        end
+    ''')
+
+
+def output(directory, scale):
+    """ A stream of `out`/`outl` lines. """
+    return _write(directory, 'output.so', f'''
+        put 0 i
+        loop:
+            out "line "
+            outl i
+            add i 1 i
+            lth i {10_000 * scale} c
+            jmpt c loop
+        end
+    ''')
+
+
+def include_tree(directory, scale, fanout=4, depth=3):
+    """ A tree of libraries, each included by its parent and called once.
+
+    It is dominated by loading and compiling rather than execution.
+    """
+    directory = Path(directory) / 'include_tree'
+    directory.mkdir(parents=True, exist_ok=True)
+    calls = _library(directory, 'lib', fanout, depth, 25 * scale)
+
+    includes = '\n'.join(f'>"{name}.so"' for name in calls)
+    branches = '\n'.join(f'br {name}' for name in calls)
+    return _write(directory, 'main.so', f'''
+        jump main
+        {includes}
+        main:
+            put 0 a
+            {branches}
+            outl a
+            end
+    ''')
+
+
+WORKLOADS = {
+    'tight_loop': tight_loop,
+    'recursion': recursion,
+    'strings': strings,
+    'output': output,
+    'include_tree': include_tree,
+}
+
+
+def _library(directory, name, fanout, depth, size):
+    """ Write library `name` and its descendants, returns top level names.
+    """
+    children = []
+    if depth > 1:
+        for child in range(fanout):
+            children += _library(directory, f'{name}_{child}', fanout,
+                                 depth - 1, size)
+
+    body = '\n'.join(f'add a {n} a' for n in range(size))
+    includes = '\n'.join(f'>"{child}.so"' for child in children)
+    branches = '\n'.join(f'br {child}' for child in children)
+    _write(directory, f'{name}.so', f'''
+        {includes}
+        {name}:
+            {body}
+            {branches}
+            back
+    ''')
+
+    return [name]
+
+
+def _write(directory, name, source):
+    path = Path(directory) / name
+    lines = (line.strip() for line in source.splitlines())
+    path.write_text('\n'.join(line for line in lines if line) + '\n')
+    return path
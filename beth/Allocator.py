@@ -0,0 +1,55 @@
+from .Linker import Linker
+from .Parser import State
+
+
+class Allocator:
+    def __init__(self):
+        self.program = []
+        self.variables = []
+        self.slots = {}
+
+    def allocate(self, program):
+        """ Allocate `program` in place, sharing identical records. """
+        self.program = program
+        allocated = {}
+
+        for index, record in enumerate(program):
+            if record not in allocated:
+                opcode, operand = record
+                operand = self._allocate_operand(opcode, operand)
+                allocated[record] = (opcode, operand)
+
+            program[index] = allocated[record]
+
+    def allocate_record(self, record):
+        """ Allocate a single record, e.g. one decoded on demand. """
+        opcode, operand = record
+        return opcode, self._allocate_operand(opcode, operand)
+
+    def reserve(self, variables):
+        """ Allocate slots to `variables` in order, e.g. to the variables
+        of a snapshot before any record is.
+        """
+        for name in variables:
+            self._slot(name)
+
+    def _allocate_operand(self, opcode, operand):
+        allocated = ()
+        last = len(operand) - 1
+
+        for index, (kind, value) in enumerate(operand):
+            if opcode in Linker.STORES and index == last:
+                allocated += ((State.IDENTIFIER, self._slot(value)),)
+            elif kind in (State.IDENTIFIER, State.POINTER):
+                allocated += ((kind, self._slot(value)),)
+            else:
+                allocated += ((kind, value),)
+
+        return allocated
+
+    def _slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.variables)
+            self.variables.append(name)
+
+        return self.slots[name]
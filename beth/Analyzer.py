@@ -0,0 +1,277 @@
+import operator
+
+from .Linker import Linker
+from .Parser import State
+
+
+def specialized(opcode, shape):
+    return f'{opcode}:{shape}'
+
+
+class Analyzer:
+    """ Dataflow analysis of a linked and allocated program.
+
+    Variable types are inferred over the whole program. Instructions that
+    are bound to fail because of a literal operand, like `add` with a string
+    literal, are reported before the program runs. Constants are propagated
+    within basic blocks, into operands that read them as they are, and
+    constant instructions are folded into `put`. Integer operations whose
+    operands are known to be integers become variants without kind checks,
+    named after their operand shape: `add:vc` adds a constant to a variable.
+    """
+
+    """ Inferred variable types. """
+    INTEGER = 'integer'
+    STRING = 'string'
+    VALUE = 'value'     # holds integers and strings alike
+
+    #   'opc': operation on integers
+    INTEGER_OPERATIONS = {
+        'add': operator.add,
+        'sub': operator.sub,
+        'mul': operator.mul,
+        'div': operator.floordiv,
+        'mod': operator.mod,
+
+        'gth': lambda x, y: int(x > y),
+        'lth': lambda x, y: int(x < y),
+        'geq': lambda x, y: int(x >= y),
+        'leq': lambda x, y: int(x <= y),
+    }
+
+    #   'opc': operation on values of any type
+    VALUE_OPERATIONS = {
+        'eq': lambda x, y: int(x == y),
+        'neq': lambda x, y: int(x != y),
+        'con': lambda x, y: f'{x}{y}',
+        'and': lambda x, y: int(x and y),
+        'or': lambda x, y: int(x or y),
+    }
+
+    """ Operand shapes of specialized variants, (v)ariable or (c)onstant. """
+    SHAPES = ('vv', 'vc', 'cv')
+
+    #   'opc': {index of an operand it reads: kind of literal it takes}
+    #   A variable holding a constant of another kind does not read like
+    #   that literal, e.g. `sti` takes no integer literal, so such constants
+    #   are not propagated. None takes literals of any kind.
+    READS = {
+        'put': {0: None}, 'not': {0: None}, 'sti': {0: State.STRING},
+        'out': {0: None}, 'outl': {0: None},
+        'err': {0: None, 1: State.INTEGER},
+        **{opcode: {0: State.INTEGER, 1: State.INTEGER}
+           for opcode in INTEGER_OPERATIONS},
+        **{opcode: {0: None, 1: None} for opcode in VALUE_OPERATIONS},
+    }
+
+    #   'opc': type of the value it stores, None for `put`
+    RESULTS = {
+        **dict.fromkeys(Linker.STORES, INTEGER),
+        'con': STRING,
+        'ins': STRING,
+        'put': None,
+    }
+
+    def __init__(self):
+        self.program = []
+        self.types = {}
+        self.folded = 0
+        self.propagated = 0
+        self.specialized = 0
+        self.err = ''
+        #   index of the instruction that failed
+        self.fault = None
+
+    def analyze(self, program, variables):
+        """ Check and rewrite `program` in place. """
+        self.program = program
+        types = self._infer(program, len(variables))
+        self.types = {
+            name: kind for name, kind in zip(variables, types) if kind
+        }
+
+        self._fold(program)
+        if self.err:
+            return
+
+        self._specialize(program, types)
+
+    """ Type inference. """
+    def _infer(self, program, size):
+        types = [None] * size
+        changed = True
+
+        while changed:
+            changed = False
+
+            for opcode, operand in program:
+                if opcode not in self.RESULTS:
+                    continue
+
+                kind, slot = operand[-1]
+                if kind != State.IDENTIFIER:
+                    continue
+
+                result = self.RESULTS[opcode]
+                if result is None:
+                    result = self._type_of(operand[0], types)
+
+                joined = self._join(types[slot], result)
+                if joined != types[slot]:
+                    types[slot] = joined
+                    changed = True
+
+        return types
+
+    def _type_of(self, tok, types):
+        kind, value = tok
+
+        if kind == State.INTEGER:
+            return self.INTEGER
+        elif kind == State.STRING:
+            return self.STRING
+        elif kind == State.IDENTIFIER:
+            return types[value]
+        else:
+            return self.VALUE
+
+    def _join(self, known, kind):
+        if known is None or known == kind:
+            return kind
+        elif kind is None:
+            return known
+        else:
+            return self.VALUE
+
+    """ Checks, constant propagation and folding. """
+    def _fold(self, program):
+        leaders = Linker.leaders(program)
+        propagate = not Linker.has_computed_branches(program)
+        known = {}
+
+        for index, (opcode, operand) in enumerate(program):
+            if index in leaders or not propagate:
+                known.clear()
+
+            operand = self._substitute(opcode, operand, known)
+            error = self._check(opcode, operand)
+            if error:
+                self.err = error
+                self.fault = index
+                return
+
+            record = self._evaluate(opcode, operand)
+            if record is None:
+                record = opcode, operand
+            else:
+                self.folded += 1
+
+            if record != program[index]:
+                program[index] = record
+
+            self._remember(record, known)
+
+    def _substitute(self, opcode, operand, known):
+        reads = [
+            index for index, kind in self.READS.get(opcode, {}).items()
+            if operand[index][0] == State.IDENTIFIER and
+            operand[index][1] in known and
+            kind in (None, known[operand[index][1]][0])
+        ]
+
+        if not reads:
+            return operand
+
+        self.propagated += len(reads)
+        operand = list(operand)
+        for index in reads:
+            operand[index] = known[operand[index][1]]
+
+        return tuple(operand)
+
+    def _check(self, opcode, operand):
+        """ Error of an instruction whose literal operand is wrong. """
+        if opcode == 'sti' and operand[0][0] == State.INTEGER:
+            return f'string expected in sti: {operand[0][1]}'
+
+        if opcode not in self.INTEGER_OPERATIONS:
+            return ''
+
+        for kind, value in operand[:2]:
+            if kind == State.STRING:
+                return f'integer expected in {opcode}: "{value}"'
+
+        if opcode in ('div', 'mod') and operand[1] == (State.INTEGER, 0):
+            return f'division by zero in {opcode}'
+
+        return ''
+
+    def _evaluate(self, opcode, operand):
+        """ The `put` a constant instruction folds into, if it does. """
+        if opcode in self.INTEGER_OPERATIONS or \
+                opcode in self.VALUE_OPERATIONS:
+            x, y, var = operand
+            if not self._is_constant(x) or not self._is_constant(y):
+                return None
+
+            operation = self.INTEGER_OPERATIONS.get(opcode) or \
+                self.VALUE_OPERATIONS[opcode]
+
+            try:
+                value = operation(x[1], y[1])
+            except (ArithmeticError, TypeError, ValueError):
+                # left for the program to fail on when it gets there
+                return None
+        elif opcode == 'not' and self._is_constant(operand[0]):
+            val, var = operand
+            value = int(not val[1])
+        elif opcode == 'sti' and operand[0][0] == State.STRING:
+            string, var = operand
+            try:
+                value = int(string[1])
+            except ValueError:
+                return None
+        else:
+            return None
+
+        kind = State.INTEGER if isinstance(value, int) else State.STRING
+        return 'put', ((kind, value), var)
+
+    @staticmethod
+    def _is_constant(tok):
+        return tok[0] in (State.INTEGER, State.STRING)
+
+    def _remember(self, record, known):
+        opcode, operand = record
+        if opcode not in self.RESULTS:
+            return
+
+        kind, slot = operand[-1]
+        if kind != State.IDENTIFIER:
+            return
+
+        if opcode == 'put' and self._is_constant(operand[0]):
+            known[slot] = operand[0]
+        else:
+            known.pop(slot, None)
+
+    """ Specialization. """
+    def _specialize(self, program, types):
+        for index, (opcode, operand) in enumerate(program):
+            if opcode not in self.INTEGER_OPERATIONS:
+                continue
+
+            shape = ''.join(self._shape(tok, types) for tok in operand[:2])
+            if shape in self.SHAPES:
+                program[index] = specialized(opcode, shape), operand
+                self.specialized += 1
+
+    def _shape(self, tok, types):
+        kind, value = tok
+
+        if kind == State.INTEGER:
+            return 'c'
+        elif kind == State.IDENTIFIER and types[value] == self.INTEGER:
+            return 'v'
+        else:
+            return '?'
@@ -0,0 +1,94 @@
+import asyncio
+
+
+class AsyncSession:
+    """ Runs a VM against asyncio streams, so one event loop can host many
+    programs at once.
+
+    The program runs in slices of `slice_size` instructions with an await in
+    between. When `ini` or `ins` find no line waiting, the instruction is
+    rewound and retried once `reader` delivers one, without blocking the
+    loop. Output is collected during a slice and written to `writer` after
+    it. Smaller slices lower the latency, larger ones raise the throughput.
+
+    The session serves as both the input and the output of its VM.
+    """
+
+    DEFAULT_SLICE_SIZE = 1000
+
+    class Pending(Exception):
+        """ Raised into the VM when no input line is ready yet. """
+
+    def __init__(self, vm, reader, writer,
+                 slice_size=DEFAULT_SLICE_SIZE, encoding='utf-8'):
+        self.vm = vm
+        self.reader = reader
+        self.writer = writer
+        self.slice_size = slice_size
+        self.encoding = encoding
+
+        self._line = None
+        self._eof = False
+        self._chunks = []
+
+    async def execute(self):
+        """ Run the program from a fresh state and return its exit code. """
+        vm = self.vm
+        vm.input = vm.output = self
+        vm.reset()
+
+        try:
+            while True:
+                try:
+                    running = vm.advance(self.slice_size)
+                except AsyncSession.Pending:
+                    # nothing but the output flush ran, so just retry
+                    vm.ip -= 1
+                    await self._drain()
+                    await self._receive()
+                    continue
+
+                await self._drain()
+                if not running:
+                    break
+
+                await asyncio.sleep(0)
+        finally:
+            await self._drain()
+
+        return vm.exit_code
+
+    """ Input and output of the VM. """
+    def readline(self):
+        if self._line is not None:
+            line, self._line = self._line, None
+            return line
+        elif self._eof:
+            raise EOFError
+        else:
+            raise AsyncSession.Pending
+
+    def write(self, string):
+        self._chunks.append(string)
+
+    def flush(self):
+        """ Output is drained between slices, where the session can await. """
+
+    """ Utility methods. """
+    async def _receive(self):
+        line = await self.reader.readline()
+
+        if not line:
+            self._eof = True
+            return
+
+        line = line.decode(self.encoding)
+        self._line = line[:-1] if line[-1] == '\n' else line
+
+    async def _drain(self):
+        if not self._chunks:
+            return
+
+        self.writer.write(''.join(self._chunks).encode(self.encoding))
+        self._chunks.clear()
+        await self.writer.drain()
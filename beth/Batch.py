@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from .Result import Result
+from .Runner import Runner
+from .VM import VM
+
+
+class Batch:
+    """ Runs one program over many inputs in a process pool.
+
+    The program, as a Runner image, is shipped to every worker once, when
+    the worker starts; afterwards only input paths and Results cross process
+    borders. A job that fails, whatever the reason, fails on its own: its
+    Result reports the error with exit code 1.
+    """
+
+    """ Runner and limits of the current worker process. """
+    _runner = None
+    _limits = None
+
+    def __init__(self, image, engine=VM, fuse=True, jobs=None,
+                 limits=None):
+        self.image = image
+        self.limits = limits
+        self.engine = engine
+        self.fuse = fuse
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def run(self, inputs):
+        """ Run the program once per stdin file, returns Results in order. """
+        inputs = list(inputs)
+        chunksize = max(1, len(inputs) // (self.jobs * 4))
+        initargs = (self.engine, self.fuse, self.image, self.limits)
+
+        with ProcessPoolExecutor(self.jobs, initializer=Batch._start_worker,
+                                 initargs=initargs) as pool:
+            return list(pool.map(Batch._run_job, inputs, chunksize=chunksize))
+
+    @staticmethod
+    def _start_worker(engine, fuse, image, limits):
+        Batch._runner = Runner(engine, fuse)
+        Batch._runner.use(image)
+        Batch._limits = limits
+
+    @staticmethod
+    def _run_job(stdin):
+        try:
+            with open(stdin) as file:
+                return Batch._runner.run(file, limits=Batch._limits)
+        except Exception as error:
+            # raised in the parent, it would take every other job down
+            return Result(1, str(error) or type(error).__name__, '')
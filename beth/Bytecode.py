@@ -0,0 +1,63 @@
+from array import array
+import marshal
+import sys
+import zlib
+
+from .Program import Program
+from .SourceMap import SourceMap
+
+
+class Bytecode:
+    """ Binary serialization of a decoded and linked program.
+
+    The payload is a compressed, marshalled tuple of plain ints, strings and
+    tuples, so it is tied to the interpreter version recorded in the header.
+    """
+
+    MAGIC = b'SOC'
+    VERSION = 5
+    HEADER = MAGIC + bytes([VERSION, *sys.version_info[:2]])
+
+    @staticmethod
+    def dumps(program, dependencies):
+        payload = (tuple(dependencies), tuple(program.code),
+                   tuple(program.variables), program.labels,
+                   Bytecode._dump_source_map(program.source_map),
+                   None if program.origin is None else tuple(program.origin))
+        return Bytecode.HEADER + zlib.compress(marshal.dumps(payload))
+
+    @staticmethod
+    def loads(data):
+        if not data.startswith(Bytecode.HEADER):
+            raise ValueError('not a bytecode file for this interpreter')
+
+        try:
+            payload = zlib.decompress(data[len(Bytecode.HEADER):])
+            dependencies, code, variables, labels, source_map, origin = \
+                marshal.loads(payload)
+            source_map = Bytecode._load_source_map(source_map)
+        except (zlib.error, EOFError, TypeError, ValueError) as error:
+            raise ValueError(f'corrupted bytecode: {error}')
+
+        program = Program(list(code), list(variables), labels, source_map,
+                          origin=None if origin is None else list(origin))
+        return program, list(dependencies)
+
+    @staticmethod
+    def _dump_source_map(source_map):
+        if source_map is None:
+            return None
+
+        return (tuple(source_map.files), source_map.file_ids.tobytes(),
+                source_map.lines.tobytes())
+
+    @staticmethod
+    def _load_source_map(data):
+        if data is None:
+            return None
+
+        files, file_ids, lines = data
+        source_map = SourceMap(list(files), array('H'), array('I'))
+        source_map.file_ids.frombytes(file_ids)
+        source_map.lines.frombytes(lines)
+        return source_map
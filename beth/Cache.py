@@ -0,0 +1,73 @@
+from hashlib import sha256
+from pathlib import Path
+import os
+
+from .Bytecode import Bytecode
+from .Program import Program
+
+
+class Cache:
+    SUFFIX = '.soc'
+
+    def __init__(self, source, directory=None):
+        self.source = Path(source).absolute()
+        self.path = self._cache_path(self.source, directory)
+        self.program = Program()
+
+    def read(self):
+        """ Load the cached program, returns False when it is missing or stale.
+        """
+        try:
+            data = self.path.read_bytes()
+            program, dependencies = Bytecode.loads(data)
+        except (OSError, ValueError):
+            return False
+
+        if not all(self._is_fresh(*dependency) for dependency in dependencies):
+            return False
+
+        self.program = program
+        return True
+
+    def write(self, program, sources):
+        dependencies = [self._fingerprint(Path(src)) for src in sources]
+        data = Bytecode.dumps(program, dependencies)
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            # caching is best effort, just like Python's own .pyc files
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _cache_path(source, directory):
+        if directory is None:
+            return source.with_suffix(Cache.SUFFIX)
+
+        digest = sha256(str(source).encode()).hexdigest()[:16]
+        return Path(directory) / f'{source.stem}-{digest}{Cache.SUFFIX}'
+
+    @staticmethod
+    def _fingerprint(path):
+        stat = path.stat()
+        digest = sha256(path.read_bytes()).hexdigest()
+        return str(path), stat.st_mtime_ns, stat.st_size, digest
+
+    @staticmethod
+    def _is_fresh(path, mtime, size, digest):
+        path = Path(path)
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+
+        if stat.st_size != size:
+            return False
+        elif stat.st_mtime_ns == mtime:
+            return True
+        else:
+            return sha256(path.read_bytes()).hexdigest() == digest
@@ -0,0 +1,58 @@
+from .Snapshot import Snapshot
+
+
+class Checkpointer:
+    """ Runs a VM while saving snapshots of it to `path`.
+
+    A snapshot is saved right before the program first reads input, so a
+    later run can skip the initialization prologue, and every `interval`
+    instructions when an interval is given, so a long run can be resumed
+    after a crash. Output is flushed before every snapshot.
+    """
+
+    def __init__(self, path, interval=None):
+        self.path = path
+        self.interval = interval
+        self.saved = 0
+        self._vm = None
+        self._input = None
+
+    def execute(self, vm):
+        """ Run the program from a fresh state and return its exit code. """
+        vm.reset()
+        return self.resume(vm)
+
+    def resume(self, vm):
+        """ Run the program on from its current state, see VM.resume. """
+        self._vm, self._input = vm, vm.input
+        vm.input = self
+
+        try:
+            if self.interval is None:
+                return vm.resume()
+
+            try:
+                while vm.advance(self.interval):
+                    self._save()
+            finally:
+                vm.output.flush()
+
+            return vm.exit_code
+        finally:
+            vm.input = self._input
+
+    def readline(self):
+        """ Input of the VM: snapshots it before handing over to its own
+        input for good.
+        """
+        vm = self._vm
+        vm.input = self._input
+
+        # the reading instruction has already been fetched
+        self._save(vm.ip - 1)
+        return vm.input.readline()
+
+    def _save(self, ip=None):
+        self._vm.output.flush()
+        Snapshot.capture(self._vm, ip).save(self.path)
+        self.saved += 1
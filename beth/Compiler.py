@@ -0,0 +1,63 @@
+from itertools import chain
+
+from .Allocator import Allocator
+from .Analyzer import Analyzer
+from .Decoder import Decoder
+from .Eliminator import Eliminator
+from .Linker import Linker
+from .Program import Program
+
+
+class Compiler:
+    def __init__(self, opcodes):
+        #   'opc': (fn pointer, operand length)
+        self.opcodes = opcodes
+        self.program = Program()
+        self.eliminator = Eliminator()
+        self.err = ''
+        #   index of the instruction that failed
+        self.fault = None
+
+    def compile(self, instructions, labels, source_map=None):
+        """ Decode, link, eliminate dead code, allocate and analyze
+        `instructions`.
+
+        `instructions` may be a lazy stream that fills in `labels` and
+        `source_map` as it is consumed; both are only needed once every
+        instruction is decoded.
+        """
+        decoder = Decoder(self.opcodes)
+        decoder.decode(chain(instructions, ['end']))
+
+        if decoder.err:
+            self.err = decoder.err
+            self.fault = decoder.fault
+            return
+
+        linker = Linker()
+        linker.link(decoder.program, labels)
+
+        if linker.err:
+            self.err = linker.err
+            self.fault = linker.fault
+            return
+
+        eliminator = self.eliminator
+        eliminator.eliminate(linker.program, labels, source_map)
+
+        allocator = Allocator()
+        allocator.allocate(eliminator.program)
+
+        analyzer = Analyzer()
+        analyzer.analyze(allocator.program, allocator.variables)
+
+        if analyzer.err:
+            self.err = analyzer.err
+            # faults are reported against the instructions compiled
+            self.fault = eliminator.origin(analyzer.fault)
+            return
+
+        self.program = Program(analyzer.program, allocator.variables,
+                               eliminator.labels, eliminator.source_map,
+                               origin=eliminator.kept
+                               if eliminator.removed else None)
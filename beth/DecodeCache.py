@@ -0,0 +1,78 @@
+import sys
+
+from .Allocator import Allocator
+from .Decoder import Decoder
+from .Linker import Linker
+from .Parser import State
+
+
+class DecodeCache:
+    """ Decodes, links and allocates instructions on demand.
+
+    Records are memoized by the interned text of their instruction, so
+    identical lines, like the many `back` lines of included libraries, are
+    decoded once and share one record. Branch targets that are no label are
+    taken as computed branches, since variables are only known once the
+    whole program has been decoded.
+    """
+
+    def __init__(self, opcodes, labels):
+        self.labels = labels
+        #   'instruction': record
+        self.records = {}
+        self.hits = 0
+        self.misses = 0
+        self.err = ''
+        self._decoder = Decoder(opcodes)
+        self._allocator = Allocator()
+
+    @property
+    def variables(self):
+        """ Names of the slots allocated so far. """
+        return self._allocator.variables
+
+    def reserve(self, variables):
+        """ Allocate slots to `variables` in order, see Allocator. """
+        self._allocator.reserve(variables)
+
+    def decode(self, instruction):
+        """ Record of `instruction`, None when it is invalid, see `err`. """
+        instruction = sys.intern(instruction)
+        record = self.records.get(instruction)
+
+        if record is not None:
+            self.hits += 1
+            return record
+
+        self.misses += 1
+        record = self._decoder.decode_instruction(instruction)
+        if record is None:
+            self.err = self._decoder.err
+            return None
+
+        record = self._link(record)
+        if self.err:
+            return None
+
+        record = self._allocator.allocate_record(record)
+        self.records[instruction] = record
+        return record
+
+    def _link(self, record):
+        opcode, operand = record
+        if opcode not in Linker.BRANCHES:
+            return record
+
+        index = Linker.BRANCHES[opcode]
+        kind, name = operand[index]
+
+        if kind != State.IDENTIFIER:
+            self.err = f'unknown label: {name}'
+            return record
+
+        if name in self.labels:
+            target = (State.LABEL, self.labels[name])
+        else:
+            target = (State.POINTER, name)
+
+        return opcode, operand[:index] + (target,) + operand[index + 1:]
@@ -0,0 +1,66 @@
+from .Tokenizer import Tokenizer
+
+
+class Decoder:
+    def __init__(self, opcodes):
+        #   'opc': (fn pointer, operand length)
+        self.opcodes = opcodes
+        self.program = []
+        self.err = ''
+        #   index of the instruction that failed
+        self.fault = None
+        self._tokenizer = Tokenizer()
+
+    def decode(self, instructions):
+        """ Decode `instructions` one by one.
+
+        Equal operand tokens and equal records are shared, so only one copy
+        of each is kept alive no matter how often it appears in the program.
+        """
+        shared = {}
+
+        for instruction in instructions:
+            if self.err:
+                break
+
+            record = self._decode(instruction)
+            if self.err:
+                self.fault = len(self.program)
+            elif record is not None:
+                record = self._share(record, shared)
+
+            self.program.append(record)
+
+    def decode_instruction(self, instruction):
+        """ Decode a single instruction, returns None and sets `err` when it
+        is invalid.
+        """
+        record = self._decode(instruction)
+        return None if self.err else record
+
+    @staticmethod
+    def _share(record, shared):
+        opcode, operand = record
+        operand = tuple(shared.setdefault(tok, tok) for tok in operand)
+        record = opcode, operand
+        return shared.setdefault(record, record)
+
+    def _decode(self, instruction):
+        parser = self._tokenizer
+        parser.parse(instruction)
+
+        if parser.err():
+            self.err = f'failed to parse instruction: {parser.instruction}'
+            return None
+
+        self._validate(instruction, parser.opcode, parser.operand)
+        return parser.opcode, parser.operand
+
+    def _validate(self, instruction, opcode, operand):
+        if opcode not in self.opcodes:
+            self.err = f'unknown opcode: {opcode}'
+            return
+
+        _, expected_operand_length = self.opcodes[opcode]
+        if len(operand) != expected_operand_length:
+            self.err = f'incorrect operand length: {instruction}'
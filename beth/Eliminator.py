@@ -0,0 +1,159 @@
+from bisect import bisect_left
+
+from .Linker import Linker
+from .Parser import State
+from .SourceMap import SourceMap
+
+
+class Eliminator:
+    """ Removes instructions that can never be reached.
+
+    The control flow graph is followed from the first instruction along
+    fall through and branch edges; a `br` continues at the instruction after
+    it once the subroutine returns. Everything left behind is dropped, e.g.
+    subroutines of an included library that are never called. Indices are
+    then compacted, so branch targets, labels and the source map are
+    remapped to match.
+
+    Programs with computed branches are left untouched, since any
+    instruction could be their target.
+    """
+
+    def __init__(self):
+        self.program = []
+        self.labels = {}
+        self.source_map = None
+        #   new index: original index
+        self.kept = []
+        #   original indices of the instructions removed
+        self.removed = []
+        #   names of the labels removed with them
+        self.dropped = []
+
+    def eliminate(self, program, labels, source_map=None):
+        """ Eliminate dead code of a linked `program`. """
+        self.program, self.labels, self.source_map = \
+            program, dict(labels), source_map
+        self.kept = list(range(len(program)))
+
+        if Linker.has_computed_branches(program):
+            return
+
+        reachable = self._reachable(program)
+        if len(reachable) == len(program):
+            return
+
+        self.kept = sorted(reachable)
+        self.removed = sorted(set(range(len(program))) - reachable)
+        moved = {index: new for new, index in enumerate(self.kept)}
+
+        self.program = [
+            self._relocate(program[index], moved) for index in self.kept
+        ]
+        self.labels = {
+            name: moved[target]
+            for name, target in labels.items() if target in moved
+        }
+        self.dropped = sorted(
+            name for name, target in labels.items() if target not in moved
+        )
+
+        if source_map is not None:
+            self.source_map = SourceMap(source_map.files)
+            # the implicit trailing `end` is not mapped
+            for index in self.kept[:self._mapped(source_map)]:
+                self.source_map.copy_entry(index, source_map)
+
+    def origin(self, index):
+        """ Original index of the instruction now at `index`. """
+        return None if index is None else self.kept[index]
+
+    def report(self, source_map=None):
+        """ Human readable summary of the removed code, located through the
+        original `source_map` when one is given. Instructions the source map
+        does not cover, like the implicit trailing `end`, are left out then.
+        """
+        removed = self.removed
+        if source_map is not None:
+            removed = [
+                index for index in removed
+                if source_map.locate(index) is not None
+            ]
+
+        if not removed:
+            return 'No unreachable code.'
+
+        lines = [f'Removed {len(removed)} unreachable instructions:']
+
+        for first, last in self._ranges(removed):
+            lines.append(f'  {self._describe(first, last, source_map)}')
+
+        if self.dropped:
+            lines.append(f'Removed labels: {", ".join(self.dropped)}')
+
+        return '\n'.join(lines)
+
+    """ Utility methods. """
+    def _reachable(self, program):
+        reachable = set()
+        pending = [0] if program else []
+
+        while pending:
+            index = pending.pop()
+            if index in reachable or index >= len(program):
+                continue
+
+            reachable.add(index)
+            opcode, operand = program[index]
+
+            if opcode in Linker.BRANCHES:
+                _, target = operand[Linker.BRANCHES[opcode]]
+                pending.append(target)
+
+            if Linker.falls_through(opcode, operand):
+                pending.append(index + 1)
+
+        return reachable
+
+    def _mapped(self, source_map):
+        """ Number of kept instructions covered by `source_map`. """
+        return bisect_left(self.kept, len(source_map))
+
+    @staticmethod
+    def _relocate(record, moved):
+        opcode, operand = record
+        if opcode not in Linker.BRANCHES:
+            return record
+
+        index = Linker.BRANCHES[opcode]
+        _, target = operand[index]
+        target = (State.LABEL, moved[target])
+        return opcode, operand[:index] + (target,) + operand[index + 1:]
+
+    @staticmethod
+    def _ranges(indices):
+        first = last = indices[0]
+
+        for index in indices[1:]:
+            if index != last + 1:
+                yield first, last
+                first = index
+            last = index
+
+        yield first, last
+
+    @staticmethod
+    def _describe(first, last, source_map):
+        start = end = None
+        if source_map is not None:
+            start, end = source_map.locate(first), source_map.locate(last)
+
+        if start is None or end is None:
+            return f'@{first}' if first == last else f'@{first}-{last}'
+
+        (path, line), (end_path, end_line) = start, end
+        if path != end_path:
+            return f'{path}:{line}-{end_path}:{end_line}'
+
+        return f'{path}:{line}' if line == end_line else \
+            f'{path}:{line}-{end_line}'
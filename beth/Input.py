@@ -0,0 +1,85 @@
+import codecs
+import io
+import sys
+
+
+class Input:
+    """ Input source for the VM.
+
+    Interactive input reads one line per request, through input() when no
+    `stream` is given. Batch input reads `stream` (sys.stdin by default) in
+    blocks of up to `block_size` characters and serves lines from that
+    buffer. Blocks of a file backed stream hold whatever is available, so a
+    pipe fed line by line is served every line as it arrives.
+    Lines are returned without their newline and EOFError is raised once the
+    input is exhausted, exactly like input() does.
+    """
+
+    DEFAULT_BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, stream=None, batch=False,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        self.stream = stream
+        self.batch = batch
+        self.block_size = block_size
+        self._buf = ''
+        self._index = 0
+        self._decoder = None
+
+    def readline(self):
+        if self.batch:
+            return self._read_buffered()
+        elif self.stream is None:
+            return input()
+        else:
+            return self._strip(self.stream.readline())
+
+    def _read_buffered(self):
+        while True:
+            end = self._buf.find('\n', self._index)
+            if end >= 0:
+                line = self._buf[self._index:end]
+                self._index = end + 1
+                return line
+
+            block = self._read_block()
+            if not block:
+                return self._read_rest()
+
+            self._buf = self._buf[self._index:] + block
+            self._index = 0
+
+    def _read_block(self):
+        stream = self._stream()
+        raw = getattr(stream, 'buffer', None)
+
+        if not hasattr(raw, 'read1'):
+            return stream.read(self.block_size)
+
+        # read() would wait for a whole block or the end of the input
+        data = raw.read1(self.block_size)
+
+        if self._decoder is None:
+            decoder = codecs.getincrementaldecoder(stream.encoding)
+            self._decoder = io.IncrementalNewlineDecoder(
+                decoder(stream.errors), translate=True)
+
+        return self._decoder.decode(data, final=not data)
+
+    def _read_rest(self):
+        line = self._buf[self._index:]
+        self._buf = ''
+        self._index = 0
+
+        if not line:
+            raise EOFError
+        return line
+
+    def _stream(self):
+        return sys.stdin if self.stream is None else self.stream
+
+    @staticmethod
+    def _strip(line):
+        if not line:
+            raise EOFError
+        return line[:-1] if line[-1] == '\n' else line
@@ -0,0 +1,79 @@
+from hashlib import sha256
+
+from .DecodeCache import DecodeCache
+from .Linker import Linker
+from .Program import Program
+from .VM import VM
+
+
+class LazyVM(VM):
+    """ Decodes every instruction on its first execution.
+
+    Large programs whose code mostly never runs start without decoding all
+    of it up front. Decoded records are memoized in a DecodeCache, whose
+    hit and miss counters tell how much decoding was saved. Whole program
+    passes, like dead code elimination, analysis and fusion, are skipped,
+    and unknown labels are only reported when they are branched to.
+    """
+
+    def __init__(self, instructions=None, labels=None, fuse=True,
+                 input=None, output=None):
+        super().__init__(instructions, labels, fuse, input, output)
+        self.cache = None
+        self.source_map = None
+        self._lines = []
+
+    def decode(self):
+        self.cache = DecodeCache(self.opcodes, self.labels)
+        self._lines = list(self.instructions) + ['end']
+        self.program = [None] * len(self._lines)
+        self.targets = range(len(self._lines))
+        self.variables = self.cache.variables
+        self.slots = []
+        self.compiled = Program(self.program, self.variables,
+                                dict(self.labels), self.source_map,
+                                self._digest())
+
+    def reserve(self, variables):
+        # slots are allocated in the order lines are first run, so a
+        # resumed run takes over the order of the run it was captured from
+        self.decode()
+        self.cache.reserve(variables)
+        self.slots.extend([None] * len(self.variables))
+
+    def _digest(self):
+        """ Identity of the source, whatever has been decoded of it. """
+        data = repr((self._lines, sorted(self.labels.items()))).encode()
+        return sha256(data).hexdigest()
+
+    def fetch(self):
+        if self.program is None:
+            self.decode()
+
+        ip = self.ip
+        if ip < 0 or ip >= len(self.program):
+            self._error(f'instruction pointer out of bounds: {ip}')
+            return
+
+        record = self.program[ip]
+        if record is None:
+            record = self._decode_line(ip)
+            if record is None:
+                return
+
+        self.opcode, self.operand = record
+        self.ip = ip + 1
+
+    def _decode_line(self, ip):
+        record = self.cache.decode(self._lines[ip])
+
+        if record is None:
+            # located at the instruction that failed to decode
+            self.ip = ip + 1
+            self._error(self.cache.err)
+            return None
+
+        record = Linker.indirect(record)
+        self.program[ip] = record
+        self.slots.extend([None] * (len(self.variables) - len(self.slots)))
+        return record
@@ -0,0 +1,80 @@
+from time import monotonic
+import sys
+
+
+class Limits:
+    """ Resource budgets of a run, None leaves a resource unlimited.
+
+    The program runs in slices of `interval` instructions and budgets are
+    checked in between, so a run may overshoot the time, call depth and
+    memory budgets by at most one slice. The instruction budget is exact,
+    it counts both instructions of a superinstruction.
+    """
+
+    """ Exit code of a run that exceeded one of its budgets. """
+    EXIT_CODE = 124
+
+    def __init__(self, instructions=None, seconds=None, depth=None,
+                 memory=None, interval=1000):
+        self.instructions = instructions
+        self.seconds = seconds
+        self.depth = depth
+        self.memory = memory
+        self.interval = interval
+
+    def execute(self, vm):
+        """ Run the program like VM.execute and return its exit code. """
+        for _ in self.steps(vm):
+            pass
+
+        return vm.exit_code
+
+    def steps(self, vm):
+        """ Run the program, yielding control after every slice. """
+        vm.reset()
+        executed = 0
+        deadline = None if self.seconds is None else \
+            monotonic() + self.seconds
+
+        try:
+            while True:
+                if not vm.advance(self._slice(executed)):
+                    break
+
+                executed = vm.executed
+                self._check(vm, executed, deadline)
+                if vm.err:
+                    break
+
+                yield
+        finally:
+            vm.output.flush()
+
+    def _slice(self, executed):
+        if self.instructions is None:
+            return self.interval
+
+        return min(self.interval, self.instructions - executed)
+
+    def _check(self, vm, executed, deadline):
+        if self.instructions is not None and executed >= self.instructions:
+            self._exceeded(vm, f'instruction limit exceeded: '
+                               f'{self.instructions}')
+        elif deadline is not None and monotonic() >= deadline:
+            self._exceeded(vm, f'time limit exceeded: {self.seconds}s')
+        elif self.depth is not None and len(vm.call) > self.depth:
+            self._exceeded(vm, f'call depth limit exceeded: {self.depth}')
+        elif self.memory is not None and \
+                self._memory_used(vm) > self.memory:
+            self._exceeded(vm, f'memory limit exceeded: '
+                               f'{self.memory} bytes')
+
+    @staticmethod
+    def _memory_used(vm):
+        return sum(sys.getsizeof(value) for value in vm.slots
+                   if value is not None)
+
+    @staticmethod
+    def _exceeded(vm, error_message):
+        vm.err = error_message
+        vm.exit_code = Limits.EXIT_CODE
@@ -0,0 +1,130 @@
+from .Parser import State
+
+
+def computed(opcode):
+    return f'{opcode}:ptr'
+
+
+class Linker:
+    #   'opc': index of the branch target in the operand
+    BRANCHES = {
+        'jump': 0,
+        'jmpt': 1,
+        'jmpf': 1,
+        'br': 0,
+        'brt': 1,
+        'brf': 1,
+    }
+
+    """ Opcodes that store a value into their last operand. """
+    STORES = {
+        'put', 'add', 'sub', 'mul', 'div', 'mod',
+        'gth', 'lth', 'geq', 'leq', 'eq', 'neq',
+        'ini', 'ins', 'con', 'sti', 'not', 'and', 'or',
+    }
+
+    """ Opcodes that never fall through to the next one; `err` only stops
+    with a message, see falls_through. """
+    ENDS = {'jump', 'back', 'end'}
+
+    def __init__(self):
+        self.program = []
+        self.err = ''
+        #   index of the instruction that failed
+        self.fault = None
+
+    def link(self, program, labels):
+        """ Link `program` in place. """
+        variables = self._collect_variables(program)
+        self.program = program
+
+        for index, (opcode, operand) in enumerate(program):
+            if self.err:
+                break
+
+            if opcode in self.BRANCHES:
+                operand = self._link_operand(
+                    operand, self.BRANCHES[opcode], labels, variables)
+                program[index] = (opcode, operand)
+
+                if self.err:
+                    self.fault = index
+
+    @classmethod
+    def indirect(cls, record):
+        """ `record`, renamed to the computed variant of its opcode when it
+        branches through a variable, so that direct branches never have to
+        tell the two apart.
+        """
+        opcode, operand = record
+
+        if opcode in cls.BRANCHES and \
+                operand[cls.BRANCHES[opcode]][0] == State.POINTER:
+            return computed(opcode), operand
+
+        return record
+
+    """ Control flow of linked programs, shared by every pass and engine
+    that splits a program into basic blocks. """
+    @classmethod
+    def is_computed(cls, opcode, operand):
+        """ Whether the instruction branches through a variable. """
+        return opcode in cls.BRANCHES and \
+            operand[cls.BRANCHES[opcode]][0] == State.POINTER
+
+    @classmethod
+    def has_computed_branches(cls, program):
+        """ Whether any instruction of `program` may branch anywhere. """
+        return any(
+            cls.is_computed(opcode, operand) for opcode, operand in program
+        )
+
+    @classmethod
+    def falls_through(cls, opcode, operand):
+        """ Whether execution may go on with the next instruction. """
+        if opcode == 'err':
+            # an empty message sets the exit code and carries on
+            kind, message = operand[0]
+            return kind == State.IDENTIFIER or not message
+
+        return opcode not in cls.ENDS
+
+    @classmethod
+    def leaders(cls, program):
+        """ Indices of `program` that may be reached other than by falling
+        through, i.e. the first instructions of its basic blocks: branch
+        targets and whatever follows a branch or an instruction that stops.
+        """
+        leaders = {0}
+
+        for index, (opcode, operand) in enumerate(program):
+            if opcode in cls.BRANCHES:
+                kind, target = operand[cls.BRANCHES[opcode]]
+                if kind == State.LABEL:
+                    leaders.add(target)
+
+            if opcode in cls.BRANCHES or \
+                    not cls.falls_through(opcode, operand):
+                leaders.add(index + 1)
+
+        return {leader for leader in leaders if leader < len(program)}
+
+    def _link_operand(self, operand, index, labels, variables):
+        kind, name = operand[index]
+
+        if kind == State.IDENTIFIER and name in labels:
+            target = (State.LABEL, labels[name])
+        elif kind == State.IDENTIFIER and name in variables:
+            target = (State.POINTER, name)
+        else:
+            self.err = f'unknown label: {name}'
+            return operand
+
+        return operand[:index] + (target,) + operand[index + 1:]
+
+    def _collect_variables(self, program):
+        return {
+            operand[-1][1]
+            for opcode, operand in program
+            if opcode in self.STORES and operand[-1][0] == State.IDENTIFIER
+        }
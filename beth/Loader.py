@@ -1,6 +1,7 @@
 from pathlib import Path
 import re
 
+from .SourceMap import SourceMap
 from .Stack import Stack
 
 
@@ -10,11 +11,22 @@ class Loader:
         self.code = []
         self.err = ''
         self.included = set()
+        self.source_map = SourceMap()
 
     def load(self, src):
-        self.include(Path(src).absolute())
+        self.code.extend(self.stream(src))
+
+    def stream(self, src):
+        """ Lazily yield clean lines of `src` with its includes expanded.
+
+        Every line is located in `self.source_map` by the time it is yielded.
+        """
+        return self._include(Path(src).absolute())
 
     def include(self, path):
+        self.code.extend(self._include(path))
+
+    def _include(self, path):
         if path in self.included:
             return
 
@@ -29,7 +41,9 @@ class Loader:
             self.err = f'path {path} is not a file'
             return
 
-        for line in self._read_lines(path):
+        file_id = self.source_map.add_file(str(path))
+
+        for number, line in enumerate(self._read_lines(path), 1):
             if self.err:
                 return
 
@@ -39,18 +53,19 @@ class Loader:
                 continue
             elif self._is_include(clean_line):
                 if self._is_valid_include(clean_line):
-                    self.include(self._include_path(clean_line))
+                    yield from self._include(self._include_path(clean_line))
                 else:
                     self.err = f'invalid include {clean_line} in {path}'
             else:
-                self.code.append(clean_line)
+                self.source_map.append(file_id, number)
+                yield clean_line
 
         self.current.pop()
 
-    @ staticmethod
+    @staticmethod
     def _read_lines(src):
         with open(src) as file:
-            return file.readlines()
+            yield from file
 
     @staticmethod
     def _clean_line(line):
@@ -0,0 +1,79 @@
+from .Analyzer import Analyzer, specialized
+from .Parser import State
+
+
+def fused(first, second):
+    return f'{first}+{second}'
+
+
+class Optimizer:
+    CONDITIONAL_JUMPS = ('jmpt', 'jmpf')
+
+    #   'fused opc': (first opc, second opc)
+    FUSIONS = {
+        'gth+jmpt': ('gth', 'jmpt'),
+        'gth+jmpf': ('gth', 'jmpf'),
+        'lth+jmpt': ('lth', 'jmpt'),
+        'lth+jmpf': ('lth', 'jmpf'),
+        'geq+jmpt': ('geq', 'jmpt'),
+        'geq+jmpf': ('geq', 'jmpf'),
+        'leq+jmpt': ('leq', 'jmpt'),
+        'leq+jmpf': ('leq', 'jmpf'),
+        'eq+jmpt': ('eq', 'jmpt'),
+        'eq+jmpf': ('eq', 'jmpf'),
+        'neq+jmpt': ('neq', 'jmpt'),
+        'neq+jmpf': ('neq', 'jmpf'),
+
+        'add+jump': ('add', 'jump'),
+        'sub+jump': ('sub', 'jump'),
+    }
+
+    """ Specialized variants of the Analyzer fuse like their originals. """
+    FUSIONS.update({
+        fused(specialized(first, shape), second):
+            (specialized(first, shape), second)
+        for first, second in list(FUSIONS.values())
+        if first in Analyzer.INTEGER_OPERATIONS
+        for shape in Analyzer.SHAPES
+    })
+
+    def __init__(self):
+        self.program = []
+        self.fusions = 0
+
+    def optimize(self, program):
+        """ Fuse common instruction pairs into superinstructions.
+
+        The fused record replaces the first instruction of the pair and the
+        second one is kept in place, so instruction indices (and therefore
+        every label) stay valid.
+        """
+        self.program = list(program)
+
+        index = 0
+        while index < len(self.program) - 1:
+            first, second = self.program[index], self.program[index + 1]
+
+            if self._can_fuse(first, second):
+                self.program[index] = (fused(first[0], second[0]),
+                                       (first[1], second[1]))
+                self.fusions += 1
+                index += 2
+            else:
+                index += 1
+
+    def _can_fuse(self, first, second):
+        (first_opcode, first_operand), (second_opcode, second_operand) = \
+            first, second
+
+        if fused(first_opcode, second_opcode) not in self.FUSIONS:
+            return False
+
+        kind, _ = second_operand[-1]
+        if kind != State.LABEL:
+            return False
+
+        if second_opcode in self.CONDITIONAL_JUMPS:
+            return second_operand[0] == first_operand[-1]
+
+        return True
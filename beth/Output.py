@@ -0,0 +1,42 @@
+import sys
+
+
+class Output:
+    """ Output sink for the VM.
+
+    Writes are collected until `buffer_size` characters are pending and then
+    handed to `stream` in one call. A buffer size of 0 writes through on every
+    call. `stream` defaults to whatever sys.stdout is at the time of writing.
+    """
+
+    DEFAULT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, stream=None, buffer_size=0):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._chunks = []
+        self._size = 0
+
+    def write(self, string):
+        if not self.buffer_size:
+            self._stream().write(string)
+            return
+
+        self._chunks.append(string)
+        self._size += len(string)
+
+        if self._size >= self.buffer_size:
+            self._drain()
+
+    def flush(self):
+        self._drain()
+        self._stream().flush()
+
+    def _drain(self):
+        if self._chunks:
+            self._stream().write(''.join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+
+    def _stream(self):
+        return sys.stdout if self.stream is None else self.stream
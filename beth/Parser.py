@@ -16,10 +16,14 @@ class State:
     NOT_INTEGER = 9
     NOT_STRING = 10
 
+    """ Additional operand kinds for the Linker. """
+    LABEL = 11      # branch target resolved to an instruction index
+    POINTER = 12    # computed branch target held by a variable
+
     """ States translated back as strings. """
     NAME = ['finish', 'error', 'start', 'opcode', 'dump',
             'identifier', 'integer', 'string', 'value',
-            'not integer', 'not string']
+            'not integer', 'not string', 'label', 'pointer']
 
     @staticmethod
     def name(state):
@@ -71,6 +75,10 @@ class Parser:
             self.next()
 
     def next(self):
+        if self._index >= len(self.instruction):
+            self._state = State.ERROR
+            return
+
         self._curs = self.instruction[self._index]
         self.STATES[self._state]()
 
@@ -157,7 +165,9 @@ class Parser:
             self._state = State.ERROR
 
     def _integer_(self):
-        if self._curs == self.ender:
+        if self._buf == '-' and not self._curs.isdecimal():
+            self._state = State.ERROR
+        elif self._curs == self.ender:
             self._add_operand()
             self._state = State.FINISH
         elif self._curs.isspace():
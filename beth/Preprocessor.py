@@ -1,21 +1,46 @@
 import re
 
+from .SourceMap import SourceMap
+
 
 class Preprocessor:
     def __init__(self):
         self.instructions = []
         self.labels = {}
         self.err = ''
+        #   index of the line of code that failed
+        self.fault = None
+        self.source_map = SourceMap()
+        self._count = 0
+
+    def process(self, code, source_map=None):
+        self.instructions.extend(self.stream(code, source_map))
+
+    def stream(self, code, source_map=None):
+        """ Lazily yield instructions of `code` while composing the label map.
 
-    def process(self, code):
-        for line in code:
+        When `source_map` locates the lines of `code`, the instructions are
+        located in `self.source_map`. Both maps are complete once the stream
+        is exhausted.
+        """
+        if source_map is not None:
+            self.source_map.files = source_map.files
+
+        for index, line in enumerate(code):
             if self.err:
                 break
 
             if self._is_label(line):
                 self._check_and_add_label(line)
-            else:
-                self.instructions.append(line)
+                if self.err:
+                    self.fault = index
+                continue
+
+            if source_map is not None:
+                self.source_map.copy_entry(index, source_map)
+
+            self._count += 1
+            yield line
 
         self._check_no_instructions()
 
@@ -27,10 +52,10 @@ class Preprocessor:
         elif label_id in self.labels:
             self.err = f'duplicate labels detected: {line}'
         else:
-            self.labels[label_id] = len(self.instructions)
+            self.labels[label_id] = self._count
 
     def _check_no_instructions(self):
-        if not self.instructions:
+        if not self._count:
             self.err = 'instructions list is empty'
 
     @staticmethod
@@ -0,0 +1,191 @@
+from collections import defaultdict
+from math import inf
+from time import perf_counter
+
+from .TracingVM import TracingVM
+
+
+class Profiler:
+    """ Instrumented dispatch loop that times every instruction of a VM.
+
+    The VM's own loop stays untouched, so profiling costs nothing unless a
+    Profiler drives the run. Fused superinstructions are timed as one and
+    reported under their fused opcode, e.g. `leq+jmpf`. A compiled trace
+    would run a whole loop within one tick, so a TracingVM is profiled with
+    tracing turned off.
+    """
+
+    def __init__(self, vm, clock=perf_counter):
+        self.vm = vm
+        self.clock = clock
+
+        if isinstance(vm, TracingVM):
+            vm.threshold, vm.traces = inf, {}
+
+        """ Per instruction index. """
+        self.counts = []
+        self.times = []
+
+        """ Per branch target index. """
+        self.calls = defaultdict(int)
+        self.inclusive = defaultdict(float)
+
+        """ Wall time of the whole run. """
+        self.elapsed = 0.0
+
+    def execute(self):
+        """ Run the program like VM.execute and return its exit code. """
+        vm = self.vm
+        vm.reset()
+
+        try:
+            if vm.program is None:
+                vm.decode()
+
+            if not vm.err:
+                self._dispatch()
+        finally:
+            vm.output.flush()
+
+        return vm.exit_code
+
+    def _dispatch(self):
+        vm = self.vm
+        call = vm.call
+        clock = self.clock
+        size = len(vm.program)
+        counts = self.counts = [0] * size
+        times = self.times = [0.0] * size
+
+        #   (target index, time of entry)
+        frames = []
+        active = defaultdict(int)
+        started = clock()
+
+        while vm.run and not vm.err:
+            ip = vm.ip
+            depth = len(call)
+
+            start = clock()
+            vm.tick()
+            end = clock()
+
+            if 0 <= ip < size:
+                counts[ip] += 1
+                times[ip] += end - start
+
+            if len(call) > depth:
+                self.calls[vm.ip] += 1
+                active[vm.ip] += 1
+                frames.append((vm.ip, start))
+            elif len(call) < depth:
+                self._leave(frames.pop(), active, end)
+
+        # frames the program never returned from last until it stopped
+        end = clock()
+        while frames:
+            self._leave(frames.pop(), active, end)
+
+        self.elapsed = end - started
+
+    def _leave(self, frame, active, end):
+        target, entered = frame
+        active[target] -= 1
+
+        # recursive calls are already covered by their outermost frame
+        if not active[target]:
+            self.inclusive[target] += end - entered
+
+    def instructions(self):
+        """ (index, opcode, count, seconds) of every executed instruction,
+        hottest first.
+        """
+        rows = [
+            (ip, self.vm.program[ip][0], count, self.times[ip])
+            for ip, count in enumerate(self.counts) if count
+        ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def opcodes(self):
+        """ (opcode, count, seconds) per opcode, hottest first. """
+        counts = defaultdict(int)
+        times = defaultdict(float)
+
+        for _, opcode, count, seconds in self.instructions():
+            counts[opcode] += count
+            times[opcode] += seconds
+
+        rows = [(opcode, counts[opcode], times[opcode]) for opcode in counts]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def branches(self):
+        """ (target index, calls, inclusive seconds) per branch target,
+        hottest first.
+        """
+        rows = [
+            (target, count, self.inclusive[target])
+            for target, count in self.calls.items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def location(self, ip):
+        """ Describe instruction `ip` by its source line when it is known,
+        and relative to the closest label above it.
+        """
+        above = [
+            (index, name)
+            for name, index in self._labels().items() if index <= ip
+        ]
+
+        if not above:
+            label = f'@{ip}'
+        else:
+            index, name = max(above)
+            label = name if index == ip else f'{name}+{ip - index}'
+
+        compiled = self.vm.compiled
+        source = None if compiled is None else compiled.locate(ip)
+        return label if source is None else f'{source} ({label})'
+
+    def report(self, limit=20):
+        total = self.elapsed or 1.0
+        lines = [
+            'Hot spots:',
+            f'{"time (s)":>10} {"%":>6} {"count":>10} {"ip":>6}  '
+            f'{"opcode":<10} location',
+        ]
+
+        for ip, opcode, count, seconds in self.instructions()[:limit]:
+            lines.append(
+                f'{seconds:>10.4f} {seconds / total:>6.1%} {count:>10} '
+                f'{ip:>6}  {opcode:<10} {self.location(ip)}')
+
+        lines += [
+            '',
+            'Opcodes:',
+            f'{"time (s)":>10} {"%":>6} {"count":>10}  opcode',
+        ]
+
+        for opcode, count, seconds in self.opcodes()[:limit]:
+            lines.append(
+                f'{seconds:>10.4f} {seconds / total:>6.1%} {count:>10}  '
+                f'{opcode}')
+
+        lines += [
+            '',
+            'Branches:',
+            f'{"time (s)":>10} {"%":>6} {"calls":>10}  label',
+        ]
+
+        for target, count, seconds in self.branches()[:limit]:
+            lines.append(
+                f'{seconds:>10.4f} {seconds / total:>6.1%} {count:>10}  '
+                f'{self.location(target)}')
+
+        return '\n'.join(lines)
+
+    def _labels(self):
+        if self.vm.compiled is None:
+            return {}
+
+        return self.vm.compiled.labels
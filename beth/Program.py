@@ -0,0 +1,56 @@
+from hashlib import sha256
+
+
+class Program:
+    """ A compiled program: decoded, linked and allocated instructions plus
+    the tables that describe them.
+
+    `variables` holds the name of every slot, `labels` maps label names
+    to instruction indices and `source_map`, when known, locates every
+    instruction in its source file. `origin`, when dead code was removed,
+    holds the index every instruction had before. A program whose code is
+    not known up front, like one decoded lazily, is given its `digest`
+    instead.
+    """
+
+    def __init__(self, code=None, variables=None, labels=None,
+                 source_map=None, digest=None, origin=None):
+        self.code = [] if code is None else code
+        self.variables = [] if variables is None else variables
+        self.labels = {} if labels is None else labels
+        self.source_map = source_map
+        self.origin = origin
+        self._digest = digest
+
+    def __repr__(self):
+        return f'Program(code={self.code!r}, ' + \
+            f'variables={self.variables!r}, labels={self.labels!r}, ' + \
+            f'source_map={self.source_map!r}, origin={self.origin!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, Program) and \
+            (self.code, self.variables, self.labels, self.source_map,
+             self.origin) == \
+            (other.code, other.variables, other.labels, other.source_map,
+             other.origin)
+
+    def digest(self):
+        """ Identity of the program: a hash of its code and variables. """
+        if self._digest is None:
+            # repr, unlike marshal, does not depend on how objects are shared
+            data = repr((self.code, self.variables)).encode()
+            self._digest = sha256(data).hexdigest()
+
+        return self._digest
+
+    def original(self, index):
+        """ Index instruction `index` had in the source program. """
+        return index if self.origin is None else self.origin[index]
+
+    def locate(self, index):
+        """ `path:line` of instruction `index`, or None when it is unknown.
+        """
+        if self.source_map is None:
+            return None
+
+        return self.source_map.describe(index)
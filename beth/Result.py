@@ -0,0 +1,14 @@
+class Result:
+    def __init__(self, exit_code=0, err='', output=None):
+        self.exit_code = exit_code
+        self.err = err
+        self.output = output
+
+    def __repr__(self):
+        return f'Result(exit_code={self.exit_code!r}, err={self.err!r}, ' + \
+            f'output={self.output!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, Result) and \
+            (self.exit_code, self.err, self.output) == \
+            (other.exit_code, other.err, other.output)
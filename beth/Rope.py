@@ -0,0 +1,87 @@
+from itertools import islice
+
+
+def concat(x, y):
+    """ Value of `con x y`, a Rope once it grows long. """
+    if type(x) is Rope:
+        return x.append(y)
+
+    string = f'{x}{y}'
+    if len(string) < Rope.MIN_LENGTH:
+        return string
+
+    return Rope([string], 1, len(string))
+
+
+class Rope:
+    """ String that is appended to without copying it.
+
+    Concatenating two strings copies both, so building a long string piece
+    by piece with `con acc piece acc` takes quadratic time. A rope keeps the
+    pieces in a list of chunks instead, and only joins them when the string
+    is compared, converted or turned into a str. Printing a rope streams its
+    chunks to the output one by one.
+
+    Ropes are values like strings: every rope extending the same one shares
+    its chunk list, which only grows past the last chunk of a rope. Whoever
+    appends to a rope that has already been extended works on a copy.
+    """
+
+    """ Shorter strings are cheaper to copy than to keep in chunks. """
+    MIN_LENGTH = 256
+
+    __slots__ = ('_chunks', '_count', '_length', '_string')
+
+    def __init__(self, chunks, count, length):
+        self._chunks = chunks
+        #   chunks of the shared list that belong to this rope
+        self._count = count
+        self._length = length
+        self._string = None
+
+    def append(self, value):
+        """ Rope of this string followed by `value`. """
+        chunk = f'{value}'
+        chunks = self._chunks
+
+        if len(chunks) != self._count:
+            chunks = chunks[:self._count]
+
+        chunks.append(chunk)
+        return Rope(chunks, len(chunks), self._length + len(chunk))
+
+    def chunks(self):
+        """ Pieces of the string in order, without joining them. """
+        return islice(self._chunks, self._count)
+
+    def __str__(self):
+        if self._string is None:
+            self._string = ''.join(self.chunks())
+            # appending to the joined string does not copy the others
+            self._chunks, self._count = [self._string], 1
+
+        return self._string
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __int__(self):
+        return int(str(self))
+
+    def __eq__(self, other):
+        if type(other) is Rope:
+            other = str(other)
+
+        return str(self) == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self._length
@@ -0,0 +1,164 @@
+from io import StringIO
+
+from .Cache import Cache
+from .Compiler import Compiler
+from .Input import Input
+from .LazyVM import LazyVM
+from .Loader import Loader
+from .Output import Output
+from .Preprocessor import Preprocessor
+from .Program import Program
+from .Result import Result
+from .VM import VM
+
+
+class Runner:
+    """ Compiles a SmallO program once and runs it any number of times.
+
+    Every run starts from a fresh VM state with its own input and output,
+    and returns a Result instead of exiting the process.
+    """
+
+    def __init__(self, engine=VM, fuse=True):
+        self.vm = engine(fuse=fuse)
+        self.program = Program()
+        self.sources = set()
+        #   unreachable code removed by the last compile from source
+        self.dead_code = ''
+        self.err = ''
+
+    def load(self, source, cache=False, cache_dir=None):
+        if isinstance(self.vm, LazyVM):
+            # decoded on demand, there is nothing to compile or cache
+            self._prepare(source)
+            return
+
+        bytecode = Cache(source, cache_dir)
+
+        if cache and bytecode.read():
+            self.install(bytecode.program)
+            return
+
+        compiler = self._compile(source)
+        if self.err:
+            return
+
+        self.install(compiler.program)
+
+        if cache:
+            bytecode.write(compiler.program, self.sources)
+
+    def install(self, program):
+        """ Use an already compiled program, e.g. one shipped to a worker. """
+        self.program = program
+        self.vm.install(program)
+
+    def image(self):
+        """ What another VM of the engine needs to run the loaded program:
+        the compiled Program, or the instructions, labels and source map the
+        lazy engine decodes on its own. Either can be shipped to a worker.
+        """
+        if isinstance(self.vm, LazyVM):
+            return self.vm.instructions, self.vm.labels, self.vm.source_map
+
+        return self.program
+
+    def use(self, image):
+        """ Run the program of another runner's `image`. """
+        if isinstance(self.vm, LazyVM):
+            self.vm.instructions, self.vm.labels, self.vm.source_map = image
+        else:
+            self.install(image)
+
+    def run(self, stdin='', stdout=None,
+            buffer_size=Output.DEFAULT_BUFFER_SIZE, limits=None):
+        """ Run the program once.
+
+        `stdin` is a string or a text stream. Output is written to the
+        `stdout` stream when one is given, and returned in the Result
+        otherwise. The run is held to `limits` when they are given. Running
+        out of input is a runtime error like any other.
+        """
+        if isinstance(stdin, str):
+            stdin = StringIO(stdin)
+
+        capture = StringIO() if stdout is None else None
+        self.vm.input = Input(stdin, batch=True)
+        self.vm.output = Output(stdout or capture, buffer_size)
+        try:
+            if limits is None:
+                self.vm.execute()
+            else:
+                limits.execute(self.vm)
+        except EOFError:
+            self.vm.err = 'unexpected end of input'
+            self.vm.exit_code = 1
+            self.vm.output.flush()
+
+        output = None if capture is None else capture.getvalue()
+        return Result(self.vm.exit_code, self.vm.err, output)
+
+    def session(self, reader, writer, slice_size=None):
+        """ An AsyncSession that runs the program on asyncio streams, in
+        slices of AsyncSession.DEFAULT_SLICE_SIZE instructions by default.
+
+        Every session gets a VM of its own, so any number of them can run
+        concurrently in one event loop.
+        """
+        # imported on first use, asyncio is slow to import
+        from .AsyncSession import AsyncSession
+
+        if slice_size is None:
+            slice_size = AsyncSession.DEFAULT_SLICE_SIZE
+
+        runner = Runner(type(self.vm), self.vm.fuse)
+        runner.use(self.image())
+        return AsyncSession(runner.vm, reader, writer, slice_size)
+
+    def _prepare(self, source):
+        loader = Loader()
+        pre = Preprocessor()
+        code = loader.stream(source)
+        instructions = list(pre.stream(code, loader.source_map))
+        self.sources = loader.included
+
+        if loader.err:
+            self.err = f'[loader] {loader.err}'
+        elif pre.err:
+            self.err = self._error(
+                'preprocessor', pre.err, loader.source_map, pre.fault)
+        else:
+            self.vm.instructions = instructions
+            self.vm.labels = pre.labels
+            self.vm.source_map = pre.source_map
+
+    def _compile(self, source):
+        loader = Loader()
+        pre = Preprocessor()
+        compiler = Compiler(self.vm.opcodes)
+        code = loader.stream(source)
+        instructions = pre.stream(code, loader.source_map)
+        compiler.compile(instructions, pre.labels, pre.source_map)
+        self.sources = loader.included
+
+        if loader.err:
+            self.err = f'[loader] {loader.err}'
+        elif pre.err:
+            self.err = self._error(
+                'preprocessor', pre.err, loader.source_map, pre.fault)
+        elif compiler.err:
+            self.err = self._error(
+                'compiler', compiler.err, pre.source_map, compiler.fault)
+        else:
+            self.dead_code = compiler.eliminator.report(pre.source_map)
+
+        return compiler
+
+    @staticmethod
+    def _error(stage, err, source_map, fault):
+        location = None if fault is None else source_map.describe(fault)
+
+        if location is None:
+            return f'[{stage}] {err}'
+
+        return f'[{stage}] {location}: {err}'
@@ -0,0 +1,37 @@
+from collections import deque
+
+from .Limits import Limits
+
+
+class Scheduler:
+    """ Interleaves many VMs in one thread.
+
+    VMs take turns in round robin order, each running one slice of
+    instructions per turn, so a busy program can not starve the others.
+    """
+
+    def __init__(self):
+        self.vms = []
+        self._runs = deque()
+
+    def add(self, vm, limits=None):
+        """ Schedule a run of `vm`, under `limits` when given. """
+        limits = Limits() if limits is None else limits
+        self.vms.append(vm)
+        self._runs.append(limits.steps(vm))
+
+    def run(self):
+        """ Run every scheduled VM to completion, returns their exit codes
+        in the order they were added.
+        """
+        while self._runs:
+            run = self._runs.popleft()
+
+            try:
+                next(run)
+            except StopIteration:
+                continue
+
+            self._runs.append(run)
+
+        return [vm.exit_code for vm in self.vms]
@@ -0,0 +1,104 @@
+from pathlib import Path
+import marshal
+import os
+import sys
+import zlib
+
+from .Rope import Rope
+
+
+class Snapshot:
+    """ State of a running VM that can be saved and resumed later.
+
+    A snapshot holds the instruction pointer, the variables and the call
+    stack, together with the digest of the program it was taken from and
+    the names of its slots. It does not cover input already read or output
+    already written.
+    """
+
+    MAGIC = b'SOS'
+    VERSION = 2
+    HEADER = MAGIC + bytes([VERSION, *sys.version_info[:2]])
+
+    def __init__(self, digest, ip, slots, call, variables):
+        self.digest = digest
+        self.ip = ip
+        self.slots = slots
+        self.call = call
+        self.variables = variables
+
+    def __repr__(self):
+        return f'Snapshot(digest={self.digest!r}, ip={self.ip!r}, ' + \
+            f'slots={self.slots!r}, call={self.call!r}, ' + \
+            f'variables={self.variables!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and \
+            (self.digest, self.ip, self.slots, self.call,
+             self.variables) == \
+            (other.digest, other.ip, other.slots, other.call,
+             other.variables)
+
+    @staticmethod
+    def capture(vm, ip=None):
+        """ Snapshot `vm` as it is, or as if it were about to execute `ip`.
+        """
+        return Snapshot(
+            vm.compiled.digest(),
+            vm.ip if ip is None else ip,
+            # joined, ropes can not be marshalled
+            [str(value) if type(value) is Rope else value
+             for value in vm.slots],
+            list(vm.call.mem),
+            list(vm.variables),
+        )
+
+    def restore(self, vm):
+        """ Put `vm` into the captured state, ready to resume. """
+        if vm.program is None:
+            vm.decode()
+
+        if vm.compiled is None or vm.compiled.digest() != self.digest:
+            raise ValueError('snapshot was taken from another program')
+
+        vm.reserve(self.variables)
+        if len(self.slots) != len(vm.slots):
+            raise ValueError('snapshot does not match the program variables')
+
+        vm.reset()
+        vm.ip = self.ip
+        # restored in place, compiled code may hold on to the list
+        vm.slots[:] = self.slots
+        for location in self.call:
+            vm.call.push(location)
+
+    def dumps(self):
+        payload = (self.digest, self.ip, tuple(self.slots), tuple(self.call),
+                   tuple(self.variables))
+        return Snapshot.HEADER + zlib.compress(marshal.dumps(payload))
+
+    @staticmethod
+    def loads(data):
+        if not data.startswith(Snapshot.HEADER):
+            raise ValueError('not a snapshot file for this interpreter')
+
+        try:
+            payload = zlib.decompress(data[len(Snapshot.HEADER):])
+            digest, ip, slots, call, variables = marshal.loads(payload)
+        except (zlib.error, EOFError, TypeError, ValueError) as error:
+            raise ValueError(f'corrupted snapshot: {error}')
+
+        return Snapshot(digest, ip, list(slots), list(call),
+                        list(variables))
+
+    def save(self, path):
+        path = Path(path)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+
+        # replaced atomically, a crash never leaves half a snapshot behind
+        tmp.write_bytes(self.dumps())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path):
+        return Snapshot.loads(Path(path).read_bytes())
@@ -0,0 +1,55 @@
+from array import array
+
+
+class SourceMap:
+    """ Locates lines of code in the files they were loaded from.
+
+    Entries are kept in two parallel arrays of file ids and line numbers
+    instead of one object per line; `files` maps file ids to paths.
+    """
+
+    def __init__(self, files=None, file_ids=None, lines=None):
+        self.files = [] if files is None else files
+        self.file_ids = array('H') if file_ids is None else file_ids
+        self.lines = array('I') if lines is None else lines
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __repr__(self):
+        return f'SourceMap(files={self.files!r}, ' + \
+            f'file_ids={self.file_ids!r}, lines={self.lines!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, SourceMap) and \
+            (self.files, self.file_ids, self.lines) == \
+            (other.files, other.file_ids, other.lines)
+
+    def add_file(self, path):
+        """ Register `path` and return its file id. """
+        self.files.append(path)
+        return len(self.files) - 1
+
+    def append(self, file_id, line):
+        self.file_ids.append(file_id)
+        self.lines.append(line)
+
+    def copy_entry(self, index, source_map):
+        """ Append entry `index` of `source_map` to this map. """
+        self.append(source_map.file_ids[index], source_map.lines[index])
+
+    def locate(self, index):
+        """ (path, line) of entry `index`, or None when it is not mapped. """
+        if index < 0 or index >= len(self.lines):
+            return None
+
+        return self.files[self.file_ids[index]], self.lines[index]
+
+    def describe(self, index):
+        """ `path:line` of entry `index`, or None when it is not mapped. """
+        location = self.locate(index)
+
+        if location is None:
+            return None
+
+        return '{}:{}'.format(*location)
@@ -0,0 +1,266 @@
+from functools import partial
+import operator
+
+from .Analyzer import Analyzer, specialized
+from .Optimizer import Optimizer
+from .Parser import State
+from .Rope import Rope, concat
+from .VM import VM
+
+
+class ThreadedVM(VM):
+    """ Compiles every decoded instruction into a specialized closure.
+
+    Opcodes without a compiler fall back to the VM opcode method bound to
+    its operand, so both engines share the same semantics.
+    """
+
+    def __init__(self, instructions=None, labels=None, fuse=True,
+                 input=None, output=None):
+        super().__init__(instructions, labels, fuse, input, output)
+        self.code = []
+
+        #   'opc': (compiler, python operator)
+        self.compilers = {
+            'put': (self._compile_put, None),
+
+            'add': (self._compile_binary_integer, operator.add),
+            'sub': (self._compile_binary_integer, operator.sub),
+            'mul': (self._compile_binary_integer, operator.mul),
+            'div': (self._compile_binary_integer, operator.floordiv),
+            'mod': (self._compile_binary_integer, operator.mod),
+
+            'gth': (self._compile_binary_integer, lambda x, y: int(x > y)),
+            'lth': (self._compile_binary_integer, lambda x, y: int(x < y)),
+            'geq': (self._compile_binary_integer, lambda x, y: int(x >= y)),
+            'leq': (self._compile_binary_integer, lambda x, y: int(x <= y)),
+
+            'eq': (self._compile_binary_value, lambda x, y: int(x == y)),
+            'neq': (self._compile_binary_value, lambda x, y: int(x != y)),
+
+            'out': (self._compile_out, ''),
+            'outl': (self._compile_out, '\n'),
+
+            'con': (self._compile_binary_value, concat),
+
+            'not': (self._compile_not, None),
+            'and': (self._compile_binary_value, lambda x, y: int(x and y)),
+            'or': (self._compile_binary_value, lambda x, y: int(x or y)),
+
+            'jump': (self._compile_jump, None),
+            'jmpt': (self._compile_conditional_jump, operator.truth),
+            'jmpf': (self._compile_conditional_jump, operator.not_),
+
+            'br': (self._compile_branch, None),
+            'brt': (self._compile_conditional_branch, operator.truth),
+            'brf': (self._compile_conditional_branch, operator.not_),
+        }
+
+        """ Specialized variants produced by the Analyzer. """
+        for opcode, op in Analyzer.INTEGER_OPERATIONS.items():
+            for shape in Analyzer.SHAPES:
+                self.compilers[specialized(opcode, shape)] = \
+                    (self._compile_binary_integer, op)
+
+        """ Superinstructions produced by the Optimizer. """
+        for opcode, pair in Optimizer.FUSIONS.items():
+            self.compilers[opcode] = (self._compile_fused, pair)
+
+    def tick(self):
+        if self.program is None:
+            self.decode()
+            if self.err:
+                return
+
+        ip = self.ip
+        if ip < 0 or ip >= len(self.code):
+            self._error(f'instruction pointer out of bounds: {ip}')
+            return
+
+        self.ip = ip + 1
+        self.code[ip]()
+
+    def install(self, program):
+        super().install(program)
+        self.code = [self._compile(opcode, operand)
+                     for opcode, operand in self.program]
+
+    def _compile(self, opcode, operand):
+        if opcode not in self.compilers:
+            opcode_method, _ = self.opcodes[opcode]
+            return partial(opcode_method, operand)
+
+        compiler, op = self.compilers[opcode]
+        return compiler(op, operand)
+
+    """ Operand binding. """
+    @staticmethod
+    def _bind_name(tok):
+        kind, slot = tok
+        return (slot, None) if kind == State.IDENTIFIER else (None, None)
+
+    @staticmethod
+    def _bind_integer(tok):
+        kind, value = tok
+
+        if kind == State.IDENTIFIER:
+            return value, None
+        elif kind == State.INTEGER:
+            return None, value
+        else:
+            return None, None
+
+    @staticmethod
+    def _bind_value(tok):
+        kind, value = tok
+        return (value, None) if kind == State.IDENTIFIER else (None, value)
+
+    def _getter(self, bind, tok):
+        slot, constant = bind(tok)
+
+        if slot is None:
+            return lambda: constant
+
+        return partial(self.slots.__getitem__, slot)
+
+    """ Opcode compilers follow. """
+    def _compile_put(self, _, operand):
+        val, (_, var) = operand
+        slots = self.slots
+        slot, constant = self._bind_value(val)
+
+        if slot is None:
+            def put():
+                slots[var] = constant
+        else:
+            def put():
+                slots[var] = slots[slot]
+
+        return put
+
+    def _compile_binary_integer(self, op, operand):
+        return self._compile_binary(op, operand, self._bind_integer)
+
+    def _compile_binary_value(self, op, operand):
+        return self._compile_binary(op, operand, self._bind_value)
+
+    def _compile_binary(self, op, operand, bind):
+        x, y, (_, var) = operand
+        slots = self.slots
+        x_slot, x = bind(x)
+        y_slot, y = bind(y)
+
+        if x_slot is None and y_slot is None:
+            def binary():
+                slots[var] = op(x, y)
+        elif x_slot is None:
+            def binary():
+                slots[var] = op(x, slots[y_slot])
+        elif y_slot is None:
+            def binary():
+                slots[var] = op(slots[x_slot], y)
+        else:
+            def binary():
+                slots[var] = op(slots[x_slot], slots[y_slot])
+
+        return binary
+
+    def _compile_not(self, _, operand):
+        val, (_, var) = operand
+        slots = self.slots
+        value = self._getter(self._bind_value, val)
+
+        def not_():
+            slots[var] = int(not value())
+
+        return not_
+
+    def _compile_out(self, end, operand):
+        vm = self
+        value = self._getter(self._bind_value, operand[0])
+
+        def out():
+            text = value()
+
+            if type(text) is Rope:
+                vm._print(text, end)
+            else:
+                vm.output.write(f'{text}{end}')
+
+        return out
+
+    def _compile_jump(self, _, operand):
+        vm = self
+        _, target = operand[0]
+
+        def jump():
+            vm.ip = target
+
+        return jump
+
+    def _compile_conditional_jump(self, test, operand):
+        vm = self
+        var, (_, target) = operand
+        var = self._getter(self._bind_name, var)
+
+        def conditional_jump():
+            if test(var()):
+                vm.ip = target
+
+        return conditional_jump
+
+    def _compile_branch(self, _, operand):
+        vm = self
+        call = self.call
+        _, target = operand[0]
+
+        def branch():
+            call.push(vm.ip)
+            vm.ip = target
+
+        return branch
+
+    def _compile_conditional_branch(self, test, operand):
+        vm = self
+        call = self.call
+        var, (_, target) = operand
+        var = self._getter(self._bind_name, var)
+
+        def conditional_branch():
+            if test(var()):
+                call.push(vm.ip)
+                vm.ip = target
+
+        return conditional_branch
+
+    def _compile_fused(self, pair, operand):
+        vm = self
+        slots = self.slots
+        first, second = pair
+        first_operand, (*_, (_, target)) = operand
+        store = self._compile(first, first_operand)
+
+        if second == 'jump':
+            def step_jump():
+                store()
+                if vm.spare:
+                    vm.spare -= 1
+                    vm.ip = target
+
+            return step_jump
+
+        _, test = self.compilers[second]
+        _, var = first_operand[-1]
+
+        def compare_jump():
+            store()
+            if not vm.spare:
+                return
+
+            vm.spare -= 1
+            if test(slots[var]):
+                vm.ip = target
+            else:
+                vm.ip += 1
+
+        return compare_jump
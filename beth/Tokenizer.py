@@ -0,0 +1,103 @@
+import re
+
+from .Parser import State
+
+
+class Tokenizer:
+    """ Drop-in replacement for the Parser built on precompiled regexes.
+
+    It produces the same opcode, the same (State, value) operand tuples and
+    the same error flag as the Parser's character-at-a-time state machine,
+    and a single instance may be reused for any number of instructions.
+    """
+
+    OPCODE = re.compile(r'[a-z]+')
+    SPACE = re.compile(r'\s*')
+    INTEGER = re.compile(r'-?\d*')
+    WORD = re.compile(r'[^\s;]*')
+    STRING = re.compile(r'"((?:[^"]|(?<=\\)")*)(?<!\\)"')
+    ESCAPE = re.compile(r'\\([ntr"])')
+
+    ESCAPE_SEQUENCES = {
+        'n': '\n',
+        't': '\t',
+        'r': '\r',
+        '"': '"',
+    }
+
+    def __init__(self):
+        self.ender = ';'
+        self.instruction = ''
+        self.opcode = ''
+        self.operand = ()
+        self._err = False
+
+    def parse(self, instruction):
+        self.instruction = instruction + self.ender
+        self.opcode = ''
+        self.operand = ()
+        self._err = not self._parse(self.instruction)
+
+    def err(self):
+        return self._err
+
+    def _parse(self, text):
+        match = self.OPCODE.match(text)
+        if not match:
+            return False
+
+        self.opcode = match.group()
+        index = match.end()
+
+        if text[index] == self.ender:
+            return True
+        elif not text[index].isspace():
+            return False
+
+        operand = []
+        while True:
+            index = self.SPACE.match(text, index).end()
+            curs = text[index]
+
+            if curs == self.ender:
+                break
+            elif curs == '"':
+                match = self.STRING.match(text, index)
+                if not match:
+                    return False
+
+                operand.append((State.STRING, self._unescape(match.group(1))))
+                index = match.end()
+                continue
+            elif curs == '-' or curs.isdecimal():
+                match = self.INTEGER.match(text, index)
+                token = match.group()
+                if token == '-':
+                    return False
+
+                operand.append((State.INTEGER, int(token)))
+            elif curs.isidentifier():
+                match = self.WORD.match(text, index)
+                token = match.group()
+                if not token.isidentifier():
+                    return False
+
+                operand.append((State.IDENTIFIER, token))
+            else:
+                return False
+
+            index = match.end()
+            if text[index] == self.ender:
+                break
+            elif not text[index].isspace():
+                return False
+
+        self.operand = tuple(operand)
+        return True
+
+    def _unescape(self, string):
+        if '\\' not in string:
+            return string
+
+        return self.ESCAPE.sub(
+            lambda match: self.ESCAPE_SEQUENCES[match.group(1)], string)
@@ -0,0 +1,247 @@
+from .Linker import Linker
+from .Optimizer import Optimizer
+from .Parser import State
+from .Rope import concat
+from .Transpiler import Transpiler
+from .VM import VM
+
+
+class TracingVM(VM):
+    """ Interprets the program and compiles its hot loops while running.
+
+    Taken backward branches are counted per loop header. Once a header
+    crosses `threshold`, the instructions executed until the loop comes
+    back around are recorded and compiled into a Python function working on
+    local variables. Conditional branches in the trace become guards: when
+    one goes the other way, the variables are written back and the
+    interpreter carries on from there. Cold code is never compiled.
+
+    Traces only hold instructions that can not fail, so input, subroutine
+    calls and computed branches keep a loop in the interpreter. A trace runs
+    at most `ITERATIONS` times per tick before handing control back, so
+    limits and schedulers still get their turn, and never more instructions
+    than the tick has to spare. Every instruction it runs is charged to
+    `spare`, so instruction budgets hold like under the interpreter.
+    """
+
+    DEFAULT_THRESHOLD = 50
+    MAX_TRACE_LENGTH = 256
+    ITERATIONS = 1000
+
+    """ Opcodes that may be part of a trace. """
+    TRACEABLE = {
+        'put', 'add', 'sub', 'mul', 'div', 'mod',
+        'gth', 'lth', 'geq', 'leq', 'eq', 'neq',
+        'out', 'outl', 'nl', 'con', 'not', 'and', 'or',
+        'jump', 'jmpt', 'jmpf',
+    }
+
+    """ Branches that close a loop when they go backward. """
+    LOOPS = {'jump', 'jmpt', 'jmpf'}
+
+    def __init__(self, instructions=None, labels=None, fuse=True,
+                 input=None, output=None, threshold=DEFAULT_THRESHOLD):
+        super().__init__(instructions, labels, fuse, input, output)
+        self.threshold = threshold
+
+        #   loop header: compiled trace
+        self.traces = {}
+        #   loop header: backward branches taken to it
+        self.counters = {}
+        #   headers whose loops can not be traced
+        self.rejected = set()
+        self.side_exits = 0
+
+        self._header = None
+        self._recording = []
+
+        self.loops = {
+            opcode for opcode in self.opcodes
+            if self._parts(opcode)[-1] in self.LOOPS
+        }
+        self.traceable = {
+            opcode for opcode in self.opcodes
+            if all(part in self.TRACEABLE for part in self._parts(opcode))
+        }
+
+    def install(self, program):
+        super().install(program)
+        self.traces = {}
+        self.counters = {}
+        self.rejected = set()
+        self._header = None
+
+    def reset(self):
+        super().reset()
+        # a recording never spans two runs
+        self._header = None
+
+    def tick(self):
+        if self.program is None:
+            self.decode()
+            if self.err:
+                return
+
+        ip = self.ip
+        trace = self.traces.get(ip)
+
+        if trace is not None:
+            if self._header is not None:
+                # an outer loop around a compiled one stays interpreted
+                self.rejected.add(self._header)
+                self._header = None
+
+            exit_to = trace(self)
+            if exit_to is not None:
+                self.ip = exit_to
+                return
+
+        if ip < 0 or ip >= len(self.program):
+            self._error(f'instruction pointer out of bounds: {ip}')
+            return
+
+        self.opcode, self.operand = self.program[ip]
+        self.ip = ip + 1
+        self.opcodes[self.opcode][0](self.operand)
+
+        if self.err:
+            self._header = None
+        elif self._header is not None:
+            self._record(ip)
+        elif self.ip <= ip and self.opcode in self.loops:
+            self._count(self.ip)
+
+    """ Recording. """
+    def _count(self, header):
+        if header in self.rejected or header in self.traces:
+            return
+
+        count = self.counters.get(header, 0) + 1
+        self.counters[header] = count
+
+        if count >= self.threshold:
+            self._header, self._recording = header, []
+
+    def _record(self, ip):
+        opcode, operand = self.program[ip]
+
+        if not self._can_trace(opcode, operand) or \
+                len(self._recording) >= self.MAX_TRACE_LENGTH:
+            self.rejected.add(self._header)
+            self._header = None
+            return
+
+        self._recording.append((ip, self.ip))
+        if self.ip == self._header:
+            self.traces[self._header] = self._compile(self._recording)
+            self._header = None
+
+    def _can_trace(self, opcode, operand):
+        if opcode not in self.traceable:
+            return False
+
+        # every branch of a fused record sits in its second operand
+        branch = operand[-1] if '+' in opcode else operand
+        return not Linker.is_computed(self._parts(opcode)[-1], branch)
+
+    """ Compilation. """
+    def _compile(self, recording):
+        header = recording[0][0]
+        slots = sorted(self._slots(recording))
+        stored = sorted(self._stored(recording))
+        leave = ''.join(f'slots[{slot}] = v{slot}; ' for slot in stored)
+
+        transpiler = Transpiler()
+        body = []
+        # instructions in an iteration, and up to the current one
+        length = len(list(self._records(recording)))
+        position = 0
+
+        for ip, after in recording:
+            for offset, (opcode, operand) in enumerate(self._split(ip)):
+                position += 1
+                if opcode in self.LOOPS:
+                    body += self._guard(opcode, operand, ip + offset + 1,
+                                        after, leave, position, length)
+                else:
+                    body += transpiler.translate(ip + offset, opcode,
+                                                 operand, 2)
+
+        lines = [
+            'def trace(vm):',
+            # the tick that runs the trace accounts for one instruction
+            f'    iterations = min({self.ITERATIONS}, '
+            f'(vm.spare + 1) // {length})',
+            '    if not iterations:',
+            '        return None',
+            '    slots = vm.slots',
+            '    output = vm.output',
+            *[f'    v{slot} = slots[{slot}]' for slot in slots],
+            '    for iteration in range(iterations):',
+            *(body or ['        pass']),
+            *[f'    slots[{slot}] = v{slot}' for slot in stored],
+            f'    vm.spare -= iterations * {length} - 1',
+            f'    return {header}',
+        ]
+
+        namespace = {'concat': concat}
+        exec(compile('\n'.join(lines), f'<trace {header}>', 'exec'),
+             namespace)
+        return namespace['trace']
+
+    @staticmethod
+    def _guard(opcode, operand, fallthrough, after, leave, position,
+               length):
+        """ Lines leaving the trace when a branch does not go where it went
+        while recording, the `position`th of `length` instructions of an
+        iteration.
+        """
+        _, target = operand[-1]
+        if opcode == 'jump' or target == fallthrough:
+            return []
+
+        kind, slot = operand[0]
+        condition = f'v{slot}' if kind == State.IDENTIFIER else 'None'
+        taken = after == target
+        test = '' if (opcode == 'jmpt') != taken else 'not '
+        exit_to = fallthrough if taken else target
+
+        return [
+            f'        if {test}{condition}:',
+            f'            {leave}vm.side_exits += 1',
+            f'            vm.spare -= iteration * {length} + {position} - 1',
+            f'            return {exit_to}',
+        ]
+
+    def _slots(self, recording):
+        return {
+            value
+            for _, operand in self._records(recording)
+            for kind, value in operand if kind == State.IDENTIFIER
+        }
+
+    def _stored(self, recording):
+        return {
+            operand[-1][1]
+            for opcode, operand in self._records(recording)
+            if opcode.split(':')[0] in Linker.STORES
+        }
+
+    def _records(self, recording):
+        for ip, _ in recording:
+            yield from self._split(ip)
+
+    def _split(self, ip):
+        """ Instructions of record `ip`, two when it is fused. """
+        opcode, operand = self.program[ip]
+
+        if '+' in opcode:
+            return list(zip(Optimizer.FUSIONS[opcode], operand))
+
+        return [(opcode, operand)]
+
+    @staticmethod
+    def _parts(opcode):
+        """ Opcodes a possibly fused and specialized opcode consists of. """
+        first, _, second = opcode.partition('+')
+        return [part.split(':')[0] for part in (first, second) if part]
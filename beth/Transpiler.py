@@ -0,0 +1,345 @@
+from .Linker import Linker
+from .Parser import State
+from .Program import Program
+
+
+class Transpiler:
+    """ Translates a compiled Program into the source of a Python module.
+
+    Every basic block becomes straight-line Python code working on local
+    variables, and control flow is a dispatch loop over block indices, which
+    are the instruction indices of their first instructions. A block that
+    jumps back to its own start becomes a `while` loop of its own. The
+    module behaves like the VM down to its output, exit codes and error
+    messages; it uses the VM's input and output classes and can be run as a
+    script or imported and run with `main()`.
+    """
+
+    INDENT = '    '
+
+    #   'opc': python expression template for the value stored
+    EXPRESSIONS = {
+        'add': '{x} + {y}',
+        'sub': '{x} - {y}',
+        'mul': '{x} * {y}',
+        'div': '{x} // {y}',
+        'mod': '{x} % {y}',
+
+        'gth': 'int({x} > {y})',
+        'lth': 'int({x} < {y})',
+        'geq': 'int({x} >= {y})',
+        'leq': 'int({x} <= {y})',
+
+        'eq': 'int({x} == {y})',
+        'neq': 'int({x} != {y})',
+
+        'and': 'int({x} and {y})',
+        'or': 'int({x} or {y})',
+    }
+
+    """ Operations on values of any type, the rest take integers. """
+    VALUE_OPERATIONS = {'eq', 'neq', 'and', 'or'}
+
+    #   'opc': text written after the operand
+    ENDINGS = {
+        'out': '',
+        'outl': '\n',
+        'nl': '\n',
+    }
+
+    """ Instructions that end a basic block. """
+
+    def __init__(self):
+        self.module = ''
+        self.blocks = 0
+        self._lines = []
+        self._program = Program()
+
+    def transpile(self, program, source=''):
+        """ Translate `program`, compiled from `source`, into `module`. """
+        self._lines = []
+        self._program = program
+        code = program.code
+        starts = sorted(Linker.leaders(code))
+
+        self._header(program, source)
+        self._line(0, 'def execute(input, output):')
+        self._line(1, '""" Run the program once, returns its exit code, '
+                      'error message and')
+        self._line(1, 'the index of the instruction that failed. """')
+        self._variables(len(program.variables))
+        self._line(1, 'exit_code = 0')
+        self._line(1, 'call = []')
+        self._line(1, 'block = 0')
+        self._line(0, '')
+        self._line(1, 'try:')
+        self._line(2, 'while True:')
+
+        if not Linker.has_computed_branches(code):
+            blocks = list(zip(starts, starts[1:] + [len(code)]))
+        else:
+            # computed branches may land on any instruction
+            blocks = [(index, index + 1) for index in range(len(code))]
+
+        self.blocks = len(blocks)
+        self._dispatch(code, blocks, 3)
+        self._line(1, 'finally:')
+        self._line(2, 'output.flush()')
+        self._footer()
+
+        self.module = '\n'.join(self._lines) + '\n'
+
+    def translate(self, index, opcode, operand, depth=0):
+        """ Lines of Python running a single straight-line instruction on
+        local variables, e.g. for a trace compiled by the TracingVM.
+        """
+        lines, self._lines = self._lines, []
+
+        try:
+            self._instruction(index, opcode, operand, depth)
+            return self._lines
+        finally:
+            self._lines = lines
+
+    """ Module layout. """
+    def _header(self, program, source):
+        locations = [
+            program.locate(index) for index in range(len(program.code))
+        ]
+
+        self._line(0, f'# Generated by beth-build from {source}, '
+                      'do not edit.')
+        self._line(0, 'import sys')
+        self._line(0, '')
+        self._line(0, 'from beth import util')
+        self._line(0, 'from beth.Input import Input')
+        self._line(0, 'from beth.Output import Output')
+        self._line(0, 'from beth.Rope import concat')
+        self._line(0, '')
+        self._line(0, f'VARIABLES = {tuple(program.variables)!r}')
+        self._line(0, f'LOCATIONS = {tuple(locations)!r}')
+        self._line(0, f'TARGETS = range({len(program.code)})')
+        self._line(0, '')
+        self._line(0, '')
+
+    def _variables(self, count):
+        names = [f'v{slot}' for slot in range(count)]
+
+        for start in range(0, count, 8):
+            self._line(1, ' = '.join(names[start:start + 8] + ['None']))
+
+    def _footer(self):
+        self._line(0, '')
+        self._line(0, '')
+        self._line(0, 'def locate(index):')
+        self._line(1, 'if index is None or not 0 <= index < len(LOCATIONS):')
+        self._line(2, 'return None')
+        self._line(1, 'return LOCATIONS[index]')
+        self._line(0, '')
+        self._line(0, '')
+        self._line(0, 'def main():')
+        self._line(1, 'try:')
+        self._line(2, 'exit_code, err, index = execute(')
+        self._line(3, 'Input(batch=not sys.stdin.isatty()),')
+        self._line(3, 'Output(buffer_size=Output.DEFAULT_BUFFER_SIZE),')
+        self._line(2, ')')
+        self._line(1, 'except KeyboardInterrupt:')
+        self._line(2, 'util.keyboard_interrupt()')
+        self._line(1, 'except EOFError:')
+        self._line(2, "print('\\nAborted!', file=sys.stderr)")
+        self._line(2, 'sys.exit(1)')
+        self._line(0, '')
+        self._line(1, 'if err:')
+        self._line(2, 'location = locate(index)')
+        self._line(2, "prefix = '' if location is None else f'{location}: '")
+        self._line(2, "print(f'Error: {prefix}{err}')")
+        self._line(0, '')
+        self._line(1, 'sys.exit(exit_code)')
+        self._line(0, '')
+        self._line(0, '')
+        self._line(0, "if __name__ == '__main__':")
+        self._line(1, 'main()')
+
+    """ Control flow. """
+    def _dispatch(self, code, blocks, depth):
+        """ Binary search over block indices, so finding a block takes a
+        logarithmic number of comparisons.
+        """
+        if len(blocks) == 1:
+            self._block(code, *blocks[0], depth)
+            return
+
+        middle = len(blocks) // 2
+        self._line(depth, f'if block < {blocks[middle][0]}:')
+        self._dispatch(code, blocks[:middle], depth + 1)
+        self._line(depth, 'else:')
+        self._dispatch(code, blocks[middle:], depth + 1)
+
+    def _block(self, code, start, end, depth):
+        self._line(depth, f'# block {start}')
+        last, (opcode, operand) = end - 1, code[end - 1]
+
+        if self._loops_back(start, opcode, operand):
+            self._line(depth, 'while True:')
+            for index in range(start, last):
+                self._instruction(index, *code[index], depth + 1)
+
+            if opcode == 'jump' and start == last:
+                self._line(depth + 1, 'pass')
+            elif opcode != 'jump':
+                condition = self._name(operand[0])
+                test = 'not ' if opcode == 'jmpt' else ''
+                self._line(depth + 1, f'if {test}{condition}:')
+                self._line(depth + 2, 'break')
+                self._goto(end, depth)
+            return
+
+        for index in range(start, end):
+            self._instruction(index, *code[index], depth)
+
+        if Linker.falls_through(opcode, operand):
+            self._goto(end, depth)
+
+    @staticmethod
+    def _loops_back(start, opcode, operand):
+        return opcode in ('jump', 'jmpt', 'jmpf') and \
+            operand[-1] == (State.LABEL, start)
+
+    def _goto(self, target, depth):
+        self._line(depth, f'block = {target}')
+        self._line(depth, 'continue')
+
+    """ Instructions. """
+    def _instruction(self, index, opcode, operand, depth):
+        # specialized variants of the Analyzer behave like their originals
+        opcode = opcode.split(':')[0]
+
+        if opcode in self.EXPRESSIONS:
+            x, y, var = operand
+            evaluate = self._value if opcode in self.VALUE_OPERATIONS \
+                else self._integer
+            expression = self.EXPRESSIONS[opcode].format(
+                x=evaluate(x), y=evaluate(y))
+            self._line(depth, f'{self._name(var)} = {expression}')
+        elif opcode == 'put':
+            val, var = operand
+            self._line(depth, f'{self._name(var)} = {self._value(val)}')
+        elif opcode == 'con' and \
+                all(kind != State.IDENTIFIER for kind, _ in operand[:2]):
+            x, y, var = operand
+            self._line(depth, f'{self._name(var)} = {self._text([x, y])}')
+        elif opcode == 'con':
+            x, y, var = operand
+            self._line(depth, f'{self._name(var)} = '
+                              f'concat({self._value(x)}, {self._value(y)})')
+        elif opcode == 'not':
+            val, var = operand
+            self._line(depth,
+                       f'{self._name(var)} = int(not {self._value(val)})')
+        elif opcode in ('ini', 'sti'):
+            self._conversion(index, opcode, operand, depth)
+        elif opcode == 'ins':
+            var, = operand
+            self._line(depth, 'output.flush()')
+            self._line(depth, f'{self._name(var)} = input.readline()')
+        elif opcode in self.ENDINGS:
+            text = self._text(operand, self.ENDINGS[opcode])
+            self._line(depth, f'output.write({text})')
+        elif opcode in Linker.BRANCHES:
+            self._branch(index, opcode, operand, depth)
+        elif opcode == 'back':
+            self._line(depth, 'if not call:')
+            self._line(depth + 1, "return 1, 'attempt to branch back with "
+                                  'empty call stack at instruction '
+                                  f"{self._program.original(index) + 1}', "
+                                  f'{index}')
+            self._line(depth, 'block = call.pop()')
+            self._line(depth, 'continue')
+        elif opcode == 'err':
+            self._err(index, operand, depth)
+        elif opcode == 'end':
+            self._line(depth, "return exit_code, '', None")
+
+    def _conversion(self, index, opcode, operand, depth):
+        if opcode == 'ini':
+            var, = operand
+            self._line(depth, 'output.flush()')
+            self._line(depth, 'string = input.readline()')
+        else:
+            string, var = operand
+            self._line(depth, f'string = {self._string(string)}')
+
+        self._line(depth, 'try:')
+        self._line(depth + 1, f'{self._name(var)} = int(string)')
+        self._line(depth, 'except ValueError:')
+        self._line(depth + 1, 'return 1, f\'invalid literal "{string}" for '
+                              f"integer conversion', {index}")
+
+    def _branch(self, index, opcode, operand, depth):
+        location = Linker.BRANCHES[opcode]
+        kind, target = operand[location]
+
+        if kind == State.POINTER:
+            self._line(depth, f'if v{target} not in TARGETS:')
+            self._line(depth + 1, f'if v{target} is None:')
+            self._line(depth + 2, "return 1, 'unknown label: ' + "
+                                  f'VARIABLES[{target}], {index}')
+            self._line(depth + 1, "return 1, 'invalid branch target: ' + "
+                                  f'str(v{target}), {index}')
+            target = f'v{target}'
+
+        if location:
+            test = 'not ' if opcode in ('jmpf', 'brf') else ''
+            self._line(depth, f'if {test}{self._name(operand[0])}:')
+            depth += 1
+
+        if opcode in ('br', 'brt', 'brf'):
+            self._line(depth, f'call.append({index + 1})')
+
+        self._goto(target, depth)
+
+    def _err(self, index, operand, depth):
+        message, code = operand
+        self._line(depth, f'message = {self._value(message)}')
+        self._line(depth, f'exit_code = {self._integer(code)}')
+        self._line(depth, 'if message is None:')
+        self._line(depth + 1, "message = ''")
+        self._line(depth, 'if exit_code is None:')
+        self._line(depth + 1, 'exit_code = 0')
+        self._line(depth, 'if message:')
+        # the program's own message, not located
+        self._line(depth + 1, 'return exit_code, message, None')
+        self._line(depth, 'output.flush()')
+
+    """ Operands. """
+    @staticmethod
+    def _name(tok):
+        kind, slot = tok
+        return f'v{slot}' if kind == State.IDENTIFIER else 'None'
+
+    @staticmethod
+    def _value(tok):
+        kind, value = tok
+        return f'v{value}' if kind == State.IDENTIFIER else repr(value)
+
+    def _integer(self, tok):
+        return 'None' if tok[0] == State.STRING else self._value(tok)
+
+    def _string(self, tok):
+        return 'None' if tok[0] == State.INTEGER else self._value(tok)
+
+    @staticmethod
+    def _text(toks, ending=''):
+        """ Expression of the text `toks` print as, followed by `ending`. """
+        if all(kind != State.IDENTIFIER for kind, _ in toks):
+            return repr(''.join(str(value) for _, value in toks) + ending)
+
+        body = ''.join(
+            f'{{v{value}}}' if kind == State.IDENTIFIER else
+            str(value).replace('{', '{{').replace('}', '}}')
+            for kind, value in toks
+        )
+        return f'f{body + ending!r}'
+
+    def _line(self, depth, text):
+        self._lines.append(f'{self.INDENT * depth}{text}' if text else '')
@@ -1,23 +1,47 @@
+from functools import partial
 import sys
 
+from .Analyzer import Analyzer, specialized
 from .Stack import Stack
-from .Parser import Parser, State
+from .Parser import State
+from .Compiler import Compiler
+from .Linker import Linker, computed
+from .Optimizer import Optimizer
+from .Input import Input
+from .Output import Output
+from .Rope import Rope, concat
 
 
 class VM:
-    def __init__(self, instructions=[], labels={}):
+    def __init__(self, instructions=None, labels=None, fuse=True,
+                 input=None, output=None):
         self.ip = 0
-        self.instruction = ''
         self.opcode = ''
         self.operand = ()
 
-        self.instructions = instructions + ['end']
-        self.names = labels
+        self.instructions = [] if instructions is None else instructions
+        self.labels = {} if labels is None else labels
+        self.compiled = None
+        self.variables = []
+        self.slots = []
+        #   instruction indices a computed branch may go to
+        self.targets = range(0)
+        self.fuse = fuse
         self.call = Stack()
+        self.input = Input() if input is None else input
+        self.output = Output() if output is None else output
 
         self.run = True
         self.err = ''
         self.exit_code = 0
+        #   err holds the program's own message, reported by `err`
+        self.reported = False
+
+        #   instructions run by `advance` since the last reset
+        self.executed = 0
+        #   instructions a tick may run beyond its first, e.g. the second
+        #   one of a superinstruction
+        self.spare = sys.maxsize
 
         #   'opc': (fn pointer, operand length)
         self.opcodes = {
@@ -63,57 +87,186 @@ class VM:
             'end': (self._end_, 0),
         }
 
+        """ Specialized variants produced by the Analyzer. """
+        for opcode, op in Analyzer.INTEGER_OPERATIONS.items():
+            for shape in Analyzer.SHAPES:
+                method = getattr(self, f'_binary_{shape}_')
+                self.opcodes[specialized(opcode, shape)] = \
+                    (partial(method, op), 3)
+
+        """ Branches through a variable, see Linker.indirect. """
+        for opcode, index in Linker.BRANCHES.items():
+            method, length = self.opcodes[opcode]
+            self.opcodes[computed(opcode)] = \
+                (partial(self._computed_, method, index), length)
+
+        """ Superinstructions produced by the Optimizer. """
+        for opcode, (first, second) in Optimizer.FUSIONS.items():
+            first_method, _ = self.opcodes[first]
+            second_method, _ = self.opcodes[second]
+            self.opcodes[opcode] = \
+                (partial(self._fused_, first_method, second_method), 2)
+
     def boot(self):
-        while self.run and not self.err:
-            self.tick()
+        self.execute()
+        self.halt()
 
+    def halt(self):
+        """ Report the outcome of the last run and exit with its code.
+        Errors of the VM are located, the program's own are shown as is.
+        """
         if self.err:
-            print(f'Error: {self.err}')
+            location = None if self.reported else self.location()
+            prefix = '' if location is None else f'{location}: '
+            print(f'Error: {prefix}{self.err}')
 
         sys.exit(self.exit_code)
 
+    def execute(self):
+        """ Run the program from a fresh state and return its exit code. """
+        self.reset()
+        return self.resume()
+
+    def resume(self):
+        """ Run the program on from the current state, e.g. one restored
+        from a Snapshot, and return its exit code.
+        """
+        self.spare = sys.maxsize
+
+        try:
+            while self.run and not self.err:
+                self.tick()
+        finally:
+            self.output.flush()
+
+        return self.exit_code
+
+    def advance(self, instructions):
+        """ Execute at most `instructions` instructions of a run started by
+        reset, returns whether the program is still running.
+
+        A tick may run more than one instruction, so half of what is left
+        is handed to the ticks as `spare` instructions at a time. Every
+        instruction they run is counted in `executed`.
+        """
+        tick = self.tick
+        end = self.executed + instructions
+
+        while self.run and not self.err and self.executed < end:
+            left = end - self.executed
+            ticks = (left + 1) // 2
+            spare = self.spare = left - ticks
+            done = 0
+
+            try:
+                for done in range(ticks):
+                    if not self.run or self.err:
+                        break
+                    tick()
+                else:
+                    done = ticks
+            finally:
+                self.executed += done + spare - self.spare
+
+        return self.run and not self.err
+
+    def reset(self):
+        self.ip = 0
+        self.executed = 0
+        self.call.clear()
+        self.run = True
+        self.err = ''
+        self.exit_code = 0
+        self.reported = False
+
+        # cleared in place, compiled code may hold on to the list
+        self.slots[:] = [None] * len(self.slots)
+
     def tick(self):
         self.fetch()
-        if self.err:
-            return
-        self.decode()
         if self.err:
             return
         self.exec()
 
+    @property
+    def instructions(self):
+        return self._instructions
+
+    @instructions.setter
+    def instructions(self, instructions):
+        self._instructions = instructions
+        self.program = None
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @labels.setter
+    def labels(self, labels):
+        self._labels = labels
+        self.program = None
+
+    @property
+    def names(self):
+        """ Name-keyed view of the variable slots for inspection. """
+        return {
+            name: value
+            for name, value in zip(self.variables, self.slots)
+            if value is not None
+        }
+
+    def reserve(self, variables):
+        """ Allocate slots to `variables`, the variables of a snapshot.
+        A compiled program has allocated all of its slots already.
+        """
+
+    def location(self):
+        """ `path:line` of the last executed instruction, e.g. the one that
+        failed, or None when it is unknown.
+        """
+        if self.compiled is None:
+            return None
+
+        return self.compiled.locate(self.ip - 1)
+
     def fetch(self):
-        if self.ip < 0 or self.ip >= len(self.instructions):
+        if self.program is None:
+            self.decode()
+            if self.err:
+                return
+
+        if self.ip < 0 or self.ip >= len(self.program):
             self._error(f'instruction pointer out of bounds: {self.ip}')
             return
 
-        self.instruction = self.instructions[self.ip]
+        self.opcode, self.operand = self.program[self.ip]
         self.ip += 1
 
     def decode(self):
-        self._parse()
-        if self.err:
+        compiler = Compiler(self.opcodes)
+        compiler.compile(self.instructions, self.labels)
+
+        if compiler.err:
+            self._error(compiler.err)
             return
-        self._validate()
 
-    def _parse(self):
-        parser = Parser()
-        parser.parse(self.instruction)
+        self.install(compiler.program)
 
-        if parser.err():
-            self._error(f'failed to parse instruction: {parser.instruction}')
-            return
+    def install(self, program):
+        """ Install a compiled Program, e.g. one read from bytecode. """
+        self.compiled = program
+        self.program = [Linker.indirect(record) for record in program.code]
+        self.targets = range(len(self.program))
+        self.variables = program.variables
+        self.slots = [None] * len(program.variables)
 
-        self.opcode = parser.opcode
-        self.operand = parser.operand
+        if self.fuse:
+            self.optimize()
 
-    def _validate(self):
-        if self.opcode not in self.opcodes:
-            self._error(f'unknown opcode: {self.opcode}')
-            return
-        
-        _, expected_operand_length = self.opcodes[self.opcode]
-        if len(self.operand) != expected_operand_length:
-            self._error(f'incorrect operand length: {self.instruction}')
+    def optimize(self):
+        optimizer = Optimizer()
+        optimizer.optimize(self.program)
+        self.program = optimizer.program
 
     def _error(self, error_message, exit_code=1):
         self.err = error_message
@@ -124,12 +277,12 @@ class VM:
         opcode_method(self.operand)
 
     def _eval_name(self, tok):
-        kind, name = tok
+        kind, slot = tok
 
         if kind != State.IDENTIFIER:
             return None
         else:
-            return self.names.get(name)
+            return self.slots[slot]
 
     def _eval_integer(self, tok):
         kind, integer = tok
@@ -177,8 +330,20 @@ class VM:
         var = self._eval_variable(var)
         return x, y, var
 
-    def _store_name(self, name, value):
-        self.names[name] = value
+    def _store_name(self, slot, value):
+        self.slots[slot] = value
+
+    def _print(self, value, end):
+        """ Write `value` and `end`, streaming the chunks of a Rope. """
+        if type(value) is not Rope:
+            self.output.write(f'{value}{end}')
+            return
+
+        for chunk in value.chunks():
+            self.output.write(chunk)
+
+        if end:
+            self.output.write(end)
 
     def _push_call(self):
         self.call.push(self.ip)
@@ -243,8 +408,9 @@ class VM:
     def _ini_(self, operand):
         var = self._eval_variable(operand[0])
         string = ''
+        self.output.flush()
         try:
-            string = input()
+            string = self.input.readline()
             self._store_name(var, int(string))
         except ValueError:
             self._error(
@@ -252,21 +418,22 @@ class VM:
 
     def _ins_(self, operand):
         var = self._eval_variable(operand[0])
-        self._store_name(var, input())
+        self.output.flush()
+        self._store_name(var, self.input.readline())
 
     def _out_(self, operand):
-        print(self._eval_value(operand[0]), end='')
+        self._print(self._eval_value(operand[0]), '')
 
     def _outl_(self, operand):
-        print(self._eval_value(operand[0]))
+        self._print(self._eval_value(operand[0]), '\n')
 
     def _nl_(self, operand):
-        print()
+        self.output.write('\n')
 
     """ String operations. """
     def _con_(self, operand):
         x, y, var = self._binary_value_unpack(operand)
-        self._store_name(var, f'{x}{y}')
+        self._store_name(var, concat(x, y))
 
     def _sti_(self, operand):
         string, var = operand
@@ -295,94 +462,104 @@ class VM:
 
     """ Control flow. """
     def _jump_(self, operand):
-        label = operand[0]
-        location = self._eval_name(label)
-
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
-
-        self.ip = location
+        self.ip = operand[0][1]
 
     def _jmpt_(self, operand):
-        var, label = operand
-        var = self._eval_name(var)
-        location = self._eval_name(label)
+        var, (_, location) = operand
 
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
-
-        if var:
+        if self._eval_name(var):
             self.ip = location
 
     def _jmpf_(self, operand):
-        var, label = operand
-        var = self._eval_name(var)
-        location = self._eval_name(label)
-
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
+        var, (_, location) = operand
 
-        if not var:
+        if not self._eval_name(var):
             self.ip = location
 
     def _br_(self, operand):
         self._push_call()
-        label = operand[0]
-        location = self._eval_name(label)
-
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
-
-        self.ip = location
+        self.ip = operand[0][1]
 
     def _brt_(self, operand):
-        var, label = operand
-        var = self._eval_name(var)
-        location = self._eval_name(label)
-
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
+        var, (_, location) = operand
 
-        if var:
+        if self._eval_name(var):
             self._push_call()
             self.ip = location
 
     def _brf_(self, operand):
-        var, label = operand
-        var = self._eval_name(var)
-        location = self._eval_name(label)
+        var, (_, location) = operand
 
-        if location is None:
-            self._error(f'unknown label: {label[1]}')
-            return
-
-        if not var:
+        if not self._eval_name(var):
             self._push_call()
             self.ip = location
 
+    def _computed_(self, branch_method, index, operand):
+        """ Check the target held by a variable against the jump table and
+        branch to it like to a label.
+        """
+        _, slot = operand[index]
+        location = self.slots[slot]
+
+        if location in self.targets:
+            branch_method(operand[:index] + ((State.LABEL, location),) +
+                          operand[index + 1:])
+        elif location is None:
+            self._error(f'unknown label: {self.variables[slot]}')
+        else:
+            self._error(f'invalid branch target: {location}')
+
     def _back_(self, operand):
         if self.call.empty():
             self._error(
                 'attempt to branch back with empty call stack at ' +
-                f'instruction {self.ip}'
+                f'instruction {self.compiled.original(self.ip - 1) + 1}'
             )
         else:
             self.ip = self.call.pop()
 
     def _err_(self, operand):
         err, exit_code = operand
+        self.reported = True
         self.err = self._eval_value(err)
         if self.err is None:
             self.err = ''
+        elif type(self.err) is Rope:
+            self.err = str(self.err)
 
         self.exit_code = self._eval_integer(exit_code)
         if self.exit_code is None:
             self.exit_code = 0
 
+        self.output.flush()
+
     def _end_(self, operand):
         self.run = False
+        self.output.flush()
+
+    """ Integer operations on operands known to be integers. """
+    def _binary_vv_(self, op, operand):
+        (_, x), (_, y), (_, var) = operand
+        slots = self.slots
+        slots[var] = op(slots[x], slots[y])
+
+    def _binary_vc_(self, op, operand):
+        (_, x), (_, y), (_, var) = operand
+        slots = self.slots
+        slots[var] = op(slots[x], y)
+
+    def _binary_cv_(self, op, operand):
+        (_, x), (_, y), (_, var) = operand
+        slots = self.slots
+        slots[var] = op(x, slots[y])
+
+    """ Superinstructions. """
+    def _fused_(self, first_method, second_method, operand):
+        first_operand, second_operand = operand
+        first_method(first_operand)
+
+        # without a spare instruction, the second one runs on its own
+        if self.spare:
+            self.spare -= 1
+            self.ip += 1
+            second_method(second_operand)
@@ -0,0 +1,17 @@
+from .Checkpointer import Checkpointer
+from .Limits import Limits
+from .Result import Result
+from .Runner import Runner
+from .Scheduler import Scheduler
+from .Snapshot import Snapshot
+
+
+def __getattr__(name):
+    # imported on first use, asyncio is slow to import
+    if name == 'AsyncSession':
+        from .AsyncSession import AsyncSession
+        # importing the module bound its name in the package
+        globals()[name] = AsyncSession
+        return AsyncSession
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
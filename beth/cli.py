@@ -1,13 +1,85 @@
+from pathlib import Path
+import sys
+
 import click
 import colorama
 
 from . import util
-from .Loader import Loader
-from .Preprocessor import Preprocessor
+from .Batch import Batch
+from .Checkpointer import Checkpointer
+from .Input import Input
+from .LazyVM import LazyVM
+from .Limits import Limits
+from .Output import Output
+from .Profiler import Profiler
+from .Runner import Runner
+from .Snapshot import Snapshot
+from .Transpiler import Transpiler
 from .VM import VM
+from .ThreadedVM import ThreadedVM
+from .TracingVM import TracingVM
 
 colorama.init()
 
+ENGINES = {
+    'vm': VM,
+    'threaded': ThreadedVM,
+    'jit': TracingVM,
+    'lazy': LazyVM,
+}
+
+
+def limit_options(command):
+    """ Options that hold every run of `command` to resource budgets. """
+    options = [
+        click.option(
+            '--max-instructions',
+            type=click.IntRange(min=0),
+            default=None,
+            help='Stop a run after this many instructions.',
+        ),
+        click.option(
+            '--max-seconds',
+            type=click.FloatRange(min=0),
+            default=None,
+            help='Stop a run after this many seconds of wall time.',
+        ),
+        click.option(
+            '--max-depth',
+            type=click.IntRange(min=0),
+            default=None,
+            help='Stop a run once its call stack is deeper than this.',
+        ),
+        click.option(
+            '--max-memory',
+            type=click.IntRange(min=0),
+            default=None,
+            help='Stop a run once its variables take more bytes than this.',
+        ),
+        click.option(
+            '--check-interval',
+            type=click.IntRange(min=1),
+            default=1000,
+            show_default=True,
+            help='Instructions to run between two checks of the limits.',
+        ),
+    ]
+
+    for option in reversed(options):
+        command = option(command)
+
+    return command
+
+
+def make_limits(max_instructions, max_seconds, max_depth, max_memory,
+                check_interval):
+    budgets = (max_instructions, max_seconds, max_depth, max_memory)
+
+    if all(budget is None for budget in budgets):
+        return None
+
+    return Limits(*budgets, interval=check_interval)
+
 
 @click.command(help='Run SmallO code.')
 @click.argument(
@@ -16,24 +88,244 @@ colorama.init()
                     file_okay=True,
                     dir_okay=False),
 )
-def run(source):
+@click.option(
+    '--engine',
+    type=click.Choice(ENGINES),
+    default='vm',
+    show_default=True,
+    help='Execution engine to run the program with.',
+)
+@click.option(
+    '--fuse/--no-fuse',
+    default=True,
+    show_default=True,
+    help='Fuse common instruction pairs into superinstructions.',
+)
+@click.option(
+    '--cache/--no-cache',
+    default=True,
+    show_default=True,
+    help='Reuse compiled bytecode (.soc) while sources are unchanged.',
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help='Keep bytecode in this directory instead of next to the source.',
+)
+@click.option(
+    '--buffer-size',
+    type=click.IntRange(min=0),
+    default=Output.DEFAULT_BUFFER_SIZE,
+    show_default=True,
+    help='Characters of output to buffer before writing, 0 to write through.',
+)
+@click.option(
+    '--batch-input/--interactive-input',
+    default=None,
+    help='Read stdin in large blocks instead of line by line. '
+         '[default: batch unless stdin is a terminal]',
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    default=False,
+    help='Time every instruction and print a hot spot report to stderr.',
+)
+@click.option(
+    '--dead-code',
+    is_flag=True,
+    default=False,
+    help='Print the unreachable code removed at compile time to stderr; '
+         'compiles from source.',
+)
+@click.option(
+    '--checkpoint',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Save a snapshot of the run to this file before the first input '
+         'is read.',
+)
+@click.option(
+    '--checkpoint-every',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Also save a snapshot every this many instructions.',
+)
+@click.option(
+    '--resume',
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help='Resume the run saved in this snapshot file.',
+)
+@limit_options
+def run(source, engine, fuse, cache, cache_dir, buffer_size, batch_input,
+        profile, dead_code, checkpoint, checkpoint_every, resume,
+        **budgets):
     if util.source_file_extension_is_invalid(source):
         util.err("source file extension is invalid: '.so' expected")
 
     try:
-        loader = Loader()
-        loader.load(source)
+        if batch_input is None:
+            batch_input = not sys.stdin.isatty()
+
+        runner = Runner(ENGINES[engine], fuse)
+        runner.load(source, cache and not dead_code, cache_dir)
+
+        if runner.err:
+            util.err(runner.err)
+
+        if dead_code:
+            click.echo(runner.dead_code, err=True)
+
+        vm = runner.vm
+        vm.input = Input(batch=batch_input)
+        vm.output = Output(buffer_size=buffer_size)
+        limits = make_limits(**budgets)
+        snapshots = checkpoint is not None or resume is not None
+
+        if snapshots and (profile or limits is not None):
+            util.err('snapshots can not be combined with --profile or limits')
+
+        if profile:
+            profiler = Profiler(vm)
+            profiler.execute()
+            click.echo(profiler.report(), err=True)
+            vm.halt()
+        elif limits is not None:
+            limits.execute(vm)
+            vm.halt()
+        elif not snapshots:
+            vm.boot()
+
+        if resume is None:
+            vm.reset()
+        else:
+            try:
+                Snapshot.load(resume).restore(vm)
+            except (OSError, ValueError) as error:
+                util.err(f'can not resume from {resume}: {error}')
+
+        if checkpoint is None:
+            vm.resume()
+        else:
+            Checkpointer(checkpoint, checkpoint_every).resume(vm)
 
-        if loader.err:
-            util.err(f'[loader] {loader.err}')
+        vm.halt()
+
+    except KeyboardInterrupt:
+        util.keyboard_interrupt()
+
+
+@click.command(help='Run SmallO code once per input file in parallel.')
+@click.argument(
+    'source',
+    type=click.Path(exists=True,
+                    file_okay=True,
+                    dir_okay=False),
+)
+@click.argument(
+    'inputs',
+    nargs=-1,
+    type=click.Path(exists=True,
+                    file_okay=True,
+                    dir_okay=False),
+)
+@click.option(
+    '--engine',
+    type=click.Choice(ENGINES),
+    default='vm',
+    show_default=True,
+    help='Execution engine to run the program with.',
+)
+@click.option(
+    '--fuse/--no-fuse',
+    default=True,
+    show_default=True,
+    help='Fuse common instruction pairs into superinstructions.',
+)
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Number of worker processes. [default: number of CPUs]',
+)
+@click.option(
+    '--output-dir',
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help='Write the output of every input to <output-dir>/<input>.out '
+         'instead of standard output.',
+)
+@limit_options
+def batch(source, inputs, engine, fuse, jobs, output_dir, **budgets):
+    if util.source_file_extension_is_invalid(source):
+        util.err("source file extension is invalid: '.so' expected")
+
+    try:
+        runner = Runner(ENGINES[engine], fuse)
+        runner.load(source)
+
+        if runner.err:
+            util.err(runner.err)
+
+        results = Batch(runner.image(), ENGINES[engine], fuse, jobs,
+                        make_limits(**budgets)).run(inputs)
+
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        for stdin, result in zip(inputs, results):
+            if output_dir is None:
+                click.echo(result.output, nl=False)
+            else:
+                out = Path(output_dir) / f'{Path(stdin).name}.out'
+                out.write_text(result.output)
+
+            report = f'{stdin}: exit code {result.exit_code}'
+            if result.err:
+                report += f' ({result.err})'
+            click.echo(report, err=True)
+
+        sys.exit(int(any(result.exit_code for result in results)))
+
+    except KeyboardInterrupt:
+        util.keyboard_interrupt()
+
+
+@click.command(help='Translate SmallO code into a Python module.')
+@click.argument(
+    'source',
+    type=click.Path(exists=True,
+                    file_okay=True,
+                    dir_okay=False),
+)
+@click.option(
+    '--output', '-o',
+    type=click.Path(file_okay=True, dir_okay=False),
+    default=None,
+    help='Path of the module to write. [default: the source path with a '
+         '.py extension]',
+)
+def build(source, output):
+    if util.source_file_extension_is_invalid(source):
+        util.err("source file extension is invalid: '.so' expected")
+
+    try:
+        runner = Runner()
+        runner.load(source)
 
-        pre = Preprocessor()
-        pre.process(loader.code)
+        if runner.err:
+            util.err(runner.err)
 
-        if pre.err:
-            util.err(f'[preprocessor] {pre.err}')
+        transpiler = Transpiler()
+        transpiler.transpile(runner.program, source)
 
-        VM(pre.instructions, pre.labels).boot()
+        output = Path(source).with_suffix('.py') if output is None \
+            else Path(output)
+        output.write_text(transpiler.module)
+        click.echo(f'{output}: {len(runner.program.code)} instructions in '
+                   f'{transpiler.blocks} blocks', err=True)
 
     except KeyboardInterrupt:
         util.keyboard_interrupt()
@@ -18,5 +18,7 @@ setup(
     entry_points="""
         [console_scripts]
         beth=beth.cli:run
+        beth-batch=beth.cli:batch
+        beth-build=beth.cli:build
     """,
 )
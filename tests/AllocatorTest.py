@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from beth.Allocator import Allocator
+from beth.Parser import State
+
+
+class AllocatorTest(TestCase):
+    def setUp(self) -> None:
+        self.allocator = Allocator()
+
+    def test_assigns_slots_in_order_of_appearance(self):
+        self.allocator.allocate([
+            ('put', ((State.INTEGER, 1), (State.IDENTIFIER, 'i'))),
+            ('add', ((State.IDENTIFIER, 'i'), (State.INTEGER, 1),
+                     (State.IDENTIFIER, 'j'))),
+        ])
+        self.assertEqual(['i', 'j'], self.allocator.variables)
+        self.assertEqual([
+            ('put', ((State.INTEGER, 1), (State.IDENTIFIER, 0))),
+            ('add', ((State.IDENTIFIER, 0), (State.INTEGER, 1),
+                     (State.IDENTIFIER, 1))),
+        ], self.allocator.program)
+
+    def test_allocates_pointers_and_keeps_labels(self):
+        self.allocator.allocate([
+            ('put', ((State.INTEGER, 50), (State.IDENTIFIER, 'mp'))),
+            ('jump', ((State.POINTER, 'mp'),)),
+            ('jmpt', ((State.IDENTIFIER, 'b'), (State.LABEL, 0))),
+        ])
+        self.assertEqual(['mp', 'b'], self.allocator.variables)
+        self.assertEqual(('jump', ((State.POINTER, 0),)),
+                         self.allocator.program[1])
+        self.assertEqual(
+            ('jmpt', ((State.IDENTIFIER, 1), (State.LABEL, 0))),
+            self.allocator.program[2])
+
+    def test_leaves_literals_untouched(self):
+        program = [('outl', ((State.STRING, 'hi'),))]
+        self.allocator.allocate(program)
+        self.assertEqual(program, self.allocator.program)
+        self.assertEqual([], self.allocator.variables)
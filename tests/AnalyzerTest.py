@@ -0,0 +1,149 @@
+from io import StringIO
+from unittest import TestCase
+
+from beth.Allocator import Allocator
+from beth.Analyzer import Analyzer
+from beth.Decoder import Decoder
+from beth.Input import Input
+from beth.Linker import Linker
+from beth.Output import Output
+from beth.Parser import State
+from beth.VM import VM
+
+
+class AnalyzerTest(TestCase):
+    def setUp(self) -> None:
+        self.analyzer = Analyzer()
+
+    def test_infers_variable_types(self):
+        self._analyze(['ins s', 'put s t', 'add x 1 x', 'put t u',
+                       'put 1 v', 'put "a" v'])
+        self.assertEqual({
+            's': Analyzer.STRING,
+            't': Analyzer.STRING,
+            'u': Analyzer.STRING,
+            'x': Analyzer.INTEGER,
+            'v': Analyzer.VALUE,
+        }, self.analyzer.types)
+
+    def test_folds_constant_instructions(self):
+        program = self._analyze(['add 40 2 x', 'con "a" 1 s', 'not 0 b',
+                                 'sti "12" i', 'eq 1 "1" e'])
+        self.assertEqual([
+            ('put', ((State.INTEGER, 42), (State.IDENTIFIER, 0))),
+            ('put', ((State.STRING, 'a1'), (State.IDENTIFIER, 1))),
+            ('put', ((State.INTEGER, 1), (State.IDENTIFIER, 2))),
+            ('put', ((State.INTEGER, 12), (State.IDENTIFIER, 3))),
+            ('put', ((State.INTEGER, 0), (State.IDENTIFIER, 4))),
+        ], program[:5])
+        self.assertEqual(5, self.analyzer.folded)
+        self._assert_err_flag_not_set()
+
+    def test_propagates_constants_within_a_block(self):
+        program = self._analyze(['put 2 x', 'mul x x y', 'outl y'])
+        self.assertEqual(
+            ('put', ((State.INTEGER, 4), (State.IDENTIFIER, 1))), program[1])
+        self.assertEqual(('outl', ((State.INTEGER, 4),)), program[2])
+        self.assertEqual(3, self.analyzer.propagated)
+
+    def test_does_not_propagate_across_labels(self):
+        program = self._analyze(
+            ['put 2 x', 'add x 1 x', 'jmpt x loop'], {'loop': 1})
+        self.assertEqual('add:vc', program[1][0])
+
+    def test_does_not_propagate_into_branch_operands(self):
+        program = self._analyze(['put 1 b', 'jmpt b exit', 'end'],
+                                {'exit': 2})
+        self.assertEqual(('jmpt', ((State.IDENTIFIER, 0), (State.LABEL, 2))),
+                         program[1])
+
+    def test_does_not_propagate_with_computed_branches(self):
+        program = self._analyze(['put 2 x', 'put 3 p', 'add x 1 y',
+                                 'jump p', 'end'])
+        self.assertEqual('add:vc', program[2][0])
+        self.assertEqual(0, self.analyzer.propagated)
+
+    def test_specializes_integer_operations(self):
+        program = self._analyze(['ini x', 'add x x y', 'sub x 1 y',
+                                 'lth 1 y y', 'ins s', 'eq s x y'])
+        self.assertEqual(['add:vv', 'sub:vc', 'lth:cv', 'ins', 'eq'],
+                         [opcode for opcode, _ in program[1:6]])
+        self.assertEqual(3, self.analyzer.specialized)
+
+    def test_does_not_specialize_values_of_any_type(self):
+        program = self._analyze(['ini x', 'ins x', 'add x 1 y'])
+        self.assertEqual('add', program[2][0])
+
+    def test_does_not_propagate_constants_of_another_kind(self):
+        program = self._analyze(['put "ab" s', 'add s s t', 'put 5 n',
+                                 'sti n x', 'put "x" c', 'err "m" c'])
+        self.assertEqual(('add', ((State.IDENTIFIER, 0),
+                                  (State.IDENTIFIER, 0),
+                                  (State.IDENTIFIER, 1))), program[1])
+        self.assertEqual(('sti', ((State.IDENTIFIER, 2),
+                                  (State.IDENTIFIER, 3))), program[3])
+        self.assertEqual(('err', ((State.STRING, 'm'),
+                                  (State.IDENTIFIER, 4))), program[5])
+        self.assertEqual(0, self.analyzer.propagated)
+        self._assert_err_flag_not_set()
+
+    def test_leaves_failing_constant_instructions_unfolded(self):
+        program = self._analyze(['outl 1', 'and "a" "b" x'])
+        self.assertEqual('and', program[1][0])
+        self.assertEqual(0, self.analyzer.folded)
+        self._assert_err_flag_not_set()
+
+    def test_string_variables_run_through_integer_operations(self):
+        self.assertEqual('abab\n', self._run(
+            ['put "ab" s', 'add s s t', 'outl t']))
+        self.assertEqual('1\n', self._run(
+            ['ins s', 'ins t', 'lth s t c', 'outl c'], 'a\nb\n'))
+        self.assertEqual('5\n', self._run(['put 5 s', 'sti s x', 'outl x']))
+
+    def test_specialized_programs_keep_their_semantics(self):
+        stream = StringIO()
+        vm = VM(['ini n', 'put 0 i', 'add i 1 i', 'mul i 2 d',
+                 'lth i n b', 'jmpt b loop', 'outl d', 'end'],
+                {'loop': 2},
+                input=Input(StringIO('5\n'), batch=True),
+                output=Output(stream))
+        vm.execute()
+        self.assertEqual('10\n', stream.getvalue())
+        self.assertEqual('', vm.err)
+
+    """ Destructive tests. """
+    def test_sets_err_flag_on_string_literal_in_integer_operation(self):
+        self._analyze(['ini x', 'add x "1" y'])
+        self.assertEqual('integer expected in add: "1"', self.analyzer.err)
+        self.assertEqual(1, self.analyzer.fault)
+
+    def test_sets_err_flag_on_integer_literal_in_sti(self):
+        self._analyze(['sti 12 i'])
+        self.assertEqual('string expected in sti: 12', self.analyzer.err)
+
+    def test_sets_err_flag_on_division_by_zero_literal(self):
+        self._analyze(['ini x', 'mod x 0 y'])
+        self.assertEqual('division by zero in mod', self.analyzer.err)
+        self.assertEqual(1, self.analyzer.fault)
+
+    """ Utility methods. """
+    def _analyze(self, instructions, labels=None):
+        labels = {} if labels is None else labels
+        decoder = Decoder(VM().opcodes)
+        decoder.decode(instructions + ['end'])
+        linker = Linker()
+        linker.link(decoder.program, labels)
+        allocator = Allocator()
+        allocator.allocate(linker.program)
+        self.analyzer.analyze(allocator.program, allocator.variables)
+        return self.analyzer.program
+
+    @staticmethod
+    def _run(instructions, stdin=''):
+        stream = StringIO()
+        VM(instructions, input=Input(StringIO(stdin), batch=True),
+           output=Output(stream)).execute()
+        return stream.getvalue()
+
+    def _assert_err_flag_not_set(self):
+        self.assertEqual('', self.analyzer.err)
@@ -0,0 +1,129 @@
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+import os
+import subprocess
+import sys
+
+from beth.AsyncSession import AsyncSession
+from beth.Runner import Runner
+from beth.ThreadedVM import ThreadedVM
+from beth.VM import VM
+
+
+class AsyncSessionTest(IsolatedAsyncioTestCase):
+    ECHO = (
+        'outl "ready"\n'
+        'loop:\n'
+        'ins s\n'
+        'eq s "quit" q\n'
+        'jmpt q done\n'
+        'ini n\n'
+        'mul n n n\n'
+        'con s ": " s\n'
+        'con s n s\n'
+        'outl s\n'
+        'jump loop\n'
+        'done:\n'
+        'err "bye" 7\n'
+    )
+
+    async def asyncSetUp(self) -> None:
+        with open('test.so', 'w') as file:
+            file.write(self.ECHO)
+
+        self.runner = Runner()
+        self.runner.load('test.so')
+        self.exit_codes = []
+        self.server = await asyncio.start_server(
+            self._serve, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        os.remove('test.so')
+
+    async def test_serves_a_session(self):
+        self.assertEqual(['ready', 'a: 4', 'b: 9'],
+                         await self._client(['a', '2', 'b', '3']))
+        self.assertEqual([7], self.exit_codes)
+
+    async def test_serves_many_sessions_concurrently(self):
+        clients = [self._client([f'c{n}', str(n)]) for n in range(50)]
+        replies = await asyncio.gather(*clients)
+        self.assertEqual(
+            [['ready', f'c{n}: {n * n}'] for n in range(50)], replies)
+        self.assertEqual([7] * 50, self.exit_codes)
+
+    async def test_interleaves_busy_sessions(self):
+        order = []
+        sessions = [
+            self._session(VM, ['outl 0', 'put 0 i', 'loop:', 'add i 1 i',
+                               'lth i 100 c', 'jmpt c loop', 'outl 2'],
+                          order),
+            self._session(ThreadedVM, ['outl 1'], order),
+        ]
+        await asyncio.gather(*(session.execute() for session in sessions))
+        self.assertEqual(['0\n', '1\n', '2\n'], order)
+
+    async def test_raises_eof_like_input(self):
+        vm = VM(['ins s'])
+        reader = asyncio.StreamReader()
+        reader.feed_eof()
+        session = AsyncSession(vm, reader, _Writer([]))
+        with self.assertRaises(EOFError):
+            await session.execute()
+
+    def test_package_imports_asyncio_on_first_use(self):
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys; import beth; print("asyncio" in sys.modules); '
+             'print(beth.AsyncSession.__name__, "asyncio" in sys.modules)'],
+            capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': os.path.abspath('..')})
+        self.assertEqual('False\nAsyncSession True\n', result.stdout)
+
+    """ Utility methods. """
+    async def _serve(self, reader, writer):
+        session = self.runner.session(reader, writer, slice_size=3)
+        self.exit_codes.append(await session.execute())
+        writer.close()
+
+    async def _client(self, lines):
+        reader, writer = await asyncio.open_connection(
+            '127.0.0.1', self.port)
+        replies = [(await reader.readline()).decode().strip()]
+
+        for name, number in zip(lines[::2], lines[1::2]):
+            writer.write(f'{name}\n{number}\n'.encode())
+            replies.append((await reader.readline()).decode().strip())
+
+        writer.write(b'quit\n')
+        await writer.drain()
+        await reader.read()
+        writer.close()
+        return replies
+
+    @staticmethod
+    def _session(engine, code, order):
+        instructions, labels = [], {}
+        for line in code:
+            if line.endswith(':'):
+                labels[line[:-1]] = len(instructions)
+            else:
+                instructions.append(line)
+
+        vm = engine(instructions, labels)
+        return AsyncSession(vm, asyncio.StreamReader(), _Writer(order), 10)
+
+
+class _Writer:
+    """ Stand-in for asyncio.StreamWriter that records every write. """
+    def __init__(self, writes):
+        self.writes = writes
+
+    def write(self, data):
+        self.writes.append(data.decode())
+
+    async def drain(self):
+        pass
@@ -0,0 +1,68 @@
+from unittest import TestCase
+import os
+
+from beth.Batch import Batch
+from beth.LazyVM import LazyVM
+from beth.Result import Result
+from beth.Runner import Runner
+from beth.ThreadedVM import ThreadedVM
+
+
+class BatchTest(TestCase):
+    INPUTS = ['batch0.txt', 'batch1.txt', 'batch2.txt', 'batch3.txt']
+
+    def setUp(self) -> None:
+        self._write_to_file('test.so', 'ini n\nmul n n s\noutl s\n'
+                                       'ini n\noutl n')
+        for n, path in enumerate(self.INPUTS):
+            self._write_to_file(path, f'{n}\n{n}\n')
+        self._write_to_file('wrong.txt', 'wrong\n')
+        self._write_to_file('short.txt', '5\n')
+
+        self.runner = Runner()
+        self.runner.load('test.so')
+
+    def tearDown(self) -> None:
+        for path in ['test.so', 'wrong.txt', 'short.txt'] + self.INPUTS:
+            os.remove(path)
+
+    def test_collects_results_in_order(self):
+        batch = Batch(self.runner.image(), jobs=2)
+        self.assertEqual(
+            [Result(0, '', f'{n * n}\n{n}\n') for n in range(4)],
+            batch.run(self.INPUTS))
+
+    def test_reports_failing_jobs(self):
+        batch = Batch(self.runner.image(), ThreadedVM, jobs=2)
+        results = batch.run(['batch3.txt', 'wrong.txt'])
+        self.assertEqual(Result(0, '', '9\n3\n'), results[0])
+        self.assertEqual(1, results[1].exit_code)
+
+    def test_reports_jobs_running_out_of_input(self):
+        batch = Batch(self.runner.image(), jobs=2)
+        results = batch.run(['batch1.txt', 'short.txt', 'batch3.txt'])
+        self.assertEqual(
+            [Result(0, '', '1\n1\n'),
+             Result(1, 'unexpected end of input', '25\n'),
+             Result(0, '', '9\n3\n')], results)
+
+    def test_reports_jobs_that_can_not_run(self):
+        batch = Batch(self.runner.image(), jobs=2)
+        results = batch.run(['missing.txt', 'batch3.txt'])
+        self.assertEqual(1, results[0].exit_code)
+        self.assertIn('missing.txt', results[0].err)
+        self.assertEqual(Result(0, '', '9\n3\n'), results[1])
+
+    def test_runs_lazy_engine(self):
+        runner = Runner(LazyVM)
+        runner.load('test.so')
+        batch = Batch(runner.image(), LazyVM, jobs=2)
+        self.assertEqual(
+            [Result(0, '', f'{n * n}\n{n}\n') for n in range(4)],
+            batch.run(self.INPUTS))
+
+    """ Utility methods. """
+    @staticmethod
+    def _write_to_file(path, string):
+        with open(path, 'w') as file:
+            file.write(string)
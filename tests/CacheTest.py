@@ -0,0 +1,75 @@
+from unittest import TestCase
+import os
+
+from beth.Bytecode import Bytecode
+from beth.Cache import Cache
+from beth.Compiler import Compiler
+from beth.Loader import Loader
+from beth.Preprocessor import Preprocessor
+from beth.VM import VM
+
+
+class CacheTest(TestCase):
+    def setUp(self) -> None:
+        self._write_to_file('lib.so', 'lib:\n put 1 a\n back')
+        self._write_to_file('test.so', '>"lib.so"\n br lib\n outl a')
+        self.cache = Cache('test.so')
+
+    def tearDown(self) -> None:
+        for path in ('lib.so', 'test.so', 'test.soc'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_bytecode_round_trip(self):
+        program, sources = self._compile()
+        data = Bytecode.dumps(program, [('test.so', 0, 0, '')])
+        self.assertEqual(
+            (program, [('test.so', 0, 0, '')]), Bytecode.loads(data))
+
+    def test_misses_without_bytecode(self):
+        self.assertFalse(self.cache.read())
+
+    def test_hits_when_sources_are_unchanged(self):
+        program, sources = self._compile()
+        self.cache.write(program, sources)
+        cache = Cache('test.so')
+        self.assertTrue(cache.read())
+        self.assertEqual(program, cache.program)
+        self.assertEqual({'lib': 0}, cache.program.labels)
+        self.assertEqual(
+            f'{os.path.abspath("lib.so")}:3', cache.program.locate(1))
+
+    def test_hits_when_only_mtime_changed(self):
+        self._write_bytecode()
+        os.utime('lib.so', (0, 0))
+        self.assertTrue(self.cache.read())
+
+    def test_misses_when_include_changed(self):
+        self._write_bytecode()
+        self._write_to_file('lib.so', 'lib:\n put 2 a\n back')
+        self.assertFalse(self.cache.read())
+
+    def test_misses_on_corrupted_bytecode(self):
+        self._write_bytecode()
+        with open('test.soc', 'wb') as file:
+            file.write(Bytecode.HEADER + b'garbage')
+        self.assertFalse(self.cache.read())
+
+    """ Utility methods. """
+    @staticmethod
+    def _write_to_file(path, string):
+        with open(path, 'w') as file:
+            file.write(string)
+
+    @staticmethod
+    def _compile():
+        loader = Loader()
+        loader.load('test.so')
+        pre = Preprocessor()
+        pre.process(loader.code, loader.source_map)
+        compiler = Compiler(VM().opcodes)
+        compiler.compile(pre.instructions, pre.labels, pre.source_map)
+        return compiler.program, loader.included
+
+    def _write_bytecode(self):
+        self.cache.write(*self._compile())
@@ -0,0 +1,58 @@
+from unittest import TestCase
+from io import StringIO
+import os
+
+from beth.Checkpointer import Checkpointer
+from beth.Input import Input
+from beth.Output import Output
+from beth.Snapshot import Snapshot
+from beth.VM import VM
+
+
+class CheckpointerTest(TestCase):
+    INSTRUCTIONS = [
+        'put 7 seed',
+        'outl "ready"',
+        'ini n',
+        'add n seed n',
+        'outl n',
+        'jump loop',
+    ]
+    LABELS = {'loop': 2}
+
+    def tearDown(self) -> None:
+        if os.path.exists('test.sos'):
+            os.remove('test.sos')
+
+    def test_saves_before_first_input(self):
+        vm = self._vm('1\n')
+        with self.assertRaises(EOFError):
+            Checkpointer('test.sos').execute(vm)
+
+        snapshot = Snapshot.load('test.sos')
+        self.assertEqual(2, snapshot.ip)
+        self.assertEqual([7, None], snapshot.slots)
+
+    def test_warm_starts_from_snapshot(self):
+        with self.assertRaises(EOFError):
+            Checkpointer('test.sos').execute(self._vm(''))
+
+        vm = self._vm('1\n2\n')
+        Snapshot.load('test.sos').restore(vm)
+        with self.assertRaises(EOFError):
+            vm.resume()
+        self.assertEqual('8\n9\n', vm.output.stream.getvalue())
+
+    def test_saves_every_interval(self):
+        vm = VM(['put 0 i', 'add i 1 i', 'lth i 10 c', 'jmpt c loop'],
+                {'loop': 1}, fuse=False)
+        checkpointer = Checkpointer('test.sos', interval=5)
+        self.assertEqual(0, checkpointer.execute(vm))
+        self.assertEqual(6, checkpointer.saved)
+        self.assertEqual([10, 0], Snapshot.load('test.sos').slots)
+
+    """ Utility methods. """
+    def _vm(self, stdin):
+        return VM(list(self.INSTRUCTIONS), self.LABELS,
+                  input=Input(StringIO(stdin), batch=True),
+                  output=Output(StringIO()))
@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from beth.DecodeCache import DecodeCache
+from beth.Parser import State
+from beth.VM import VM
+
+
+class DecodeCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.cache = DecodeCache(VM().opcodes, {'loop': 3})
+
+    def test_decodes_links_and_allocates(self):
+        self.assertEqual(
+            ('add', ((State.IDENTIFIER, 0), (State.INTEGER, 1),
+                     (State.IDENTIFIER, 0))),
+            self.cache.decode('add i 1 i'))
+        self.assertEqual(
+            ('jmpt', ((State.IDENTIFIER, 1), (State.LABEL, 3))),
+            self.cache.decode('jmpt c loop'))
+        self.assertEqual(['i', 'c'], self.cache.variables)
+
+    def test_takes_other_branch_targets_as_computed(self):
+        self.assertEqual(('jump', ((State.POINTER, 0),)),
+                         self.cache.decode('jump mp'))
+
+    def test_memoizes_identical_lines(self):
+        first = self.cache.decode('back')
+        second = self.cache.decode(''.join(['ba', 'ck']))
+        self.assertIs(first, second)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    """ Destructive tests. """
+    def test_sets_err_flag_on_invalid_instruction(self):
+        self.assertIsNone(self.cache.decode('add 1'))
+        self.assertEqual('incorrect operand length: add 1', self.cache.err)
+
+    def test_sets_err_flag_on_literal_branch_target(self):
+        self.assertIsNone(self.cache.decode('jump 1'))
+        self.assertEqual('unknown label: 1', self.cache.err)
+        self.assertEqual({}, self.cache.records)
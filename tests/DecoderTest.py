@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from beth.Decoder import Decoder
+from beth.Parser import State
+from beth.VM import VM
+
+
+class DecoderTest(TestCase):
+    def setUp(self) -> None:
+        self.decoder = Decoder(VM().opcodes)
+
+    def test_decodes_every_instruction_once(self):
+        self.decoder.decode(['put 1 a', 'outl a', 'end'])
+        self.assertEqual([
+            ('put', ((State.INTEGER, 1), (State.IDENTIFIER, 'a'))),
+            ('outl', ((State.IDENTIFIER, 'a'),)),
+            ('end', ()),
+        ], self.decoder.program)
+        self._assert_err_flag_not_set()
+
+    def test_decodes_lazy_streams_and_shares_equal_records(self):
+        self.decoder.decode(iter(['back', 'put 1 a', 'back']))
+        first, _, last = self.decoder.program
+        self.assertIs(first, last)
+
+    """ Destructive tests. """
+    def test_sets_err_flag_on_malformed_instruction(self):
+        self.decoder.decode(['put 1 a', 'put 1a'])
+        self.assertEqual(
+            'failed to parse instruction: put 1a;', self.decoder.err)
+
+    def test_sets_err_flag_on_unknown_opcode(self):
+        self.decoder.decode(['unknown 1 a'])
+        self.assertEqual('unknown opcode: unknown', self.decoder.err)
+
+    def test_sets_err_flag_on_invalid_operand_length(self):
+        self.decoder.decode(['put 1'])
+        self.assertEqual('incorrect operand length: put 1', self.decoder.err)
+
+    def test_stops_at_first_error(self):
+        self.decoder.decode(['put 1', 'unknown 1 a'])
+        self.assertEqual(1, len(self.decoder.program))
+
+    """ Utility methods. """
+    def _assert_err_flag_not_set(self):
+        self.assertFalse(self.decoder.err)
@@ -0,0 +1,103 @@
+from unittest import TestCase
+
+from beth.Eliminator import Eliminator
+from beth.Parser import State
+from beth.SourceMap import SourceMap
+
+
+class EliminatorTest(TestCase):
+    PROGRAM = [
+        ('jump', ((State.LABEL, 3),)),
+        ('outl', ((State.STRING, 'unused'),)),
+        ('back', ()),
+        ('br', ((State.LABEL, 6),)),
+        ('jmpt', ((State.IDENTIFIER, 'b'), (State.LABEL, 3))),
+        ('end', ()),
+        ('outl', ((State.STRING, 'used'),)),
+        ('back', ()),
+        ('end', ()),
+    ]
+    LABELS = {'main': 3, 'unused': 1, 'used': 6}
+
+    def setUp(self) -> None:
+        self.eliminator = Eliminator()
+
+    def test_removes_unreachable_instructions(self):
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS)
+        self.assertEqual([
+            ('jump', ((State.LABEL, 1),)),
+            ('br', ((State.LABEL, 4),)),
+            ('jmpt', ((State.IDENTIFIER, 'b'), (State.LABEL, 1))),
+            ('end', ()),
+            ('outl', ((State.STRING, 'used'),)),
+            ('back', ()),
+        ], self.eliminator.program)
+        self.assertEqual([1, 2, 8], self.eliminator.removed)
+
+    def test_remaps_and_drops_labels(self):
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS)
+        self.assertEqual({'main': 1, 'used': 4}, self.eliminator.labels)
+        self.assertEqual(['unused'], self.eliminator.dropped)
+
+    def test_remaps_source_map(self):
+        source_map = SourceMap()
+        file_id = source_map.add_file('main.so')
+        for line in range(1, len(self.PROGRAM) + 1):
+            source_map.append(file_id, line)
+
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS,
+                                  source_map)
+        self.assertEqual([1, 4, 5, 6, 7, 8],
+                         list(self.eliminator.source_map.lines))
+        self.assertEqual(9, len(source_map))
+
+    def test_maps_indices_to_their_origin(self):
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS)
+        self.assertEqual(3, self.eliminator.origin(1))
+        self.assertIsNone(self.eliminator.origin(None))
+
+    def test_keeps_code_after_err_without_message(self):
+        program = [
+            ('err', ((State.STRING, ''), (State.INTEGER, 3))),
+            ('err', ((State.IDENTIFIER, 'e'), (State.INTEGER, 3))),
+            ('err', ((State.STRING, 'stop'), (State.INTEGER, 3))),
+            ('end', ()),
+        ]
+        self.eliminator.eliminate(list(program), {})
+        self.assertEqual([3], self.eliminator.removed)
+
+    def test_keeps_programs_with_computed_branches(self):
+        program = [
+            ('put', ((State.INTEGER, 2), (State.IDENTIFIER, 'p'))),
+            ('jump', ((State.POINTER, 'p'),)),
+            ('end', ()),
+        ]
+        self.eliminator.eliminate(list(program), {})
+        self.assertEqual(program, self.eliminator.program)
+        self.assertEqual([], self.eliminator.removed)
+
+    def test_reports_removed_code(self):
+        source_map = SourceMap()
+        file_id = source_map.add_file('lib.so')
+        for line in range(1, len(self.PROGRAM)):
+            source_map.append(file_id, line)
+
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS)
+        self.assertEqual(
+            'Removed 2 unreachable instructions:\n'
+            '  lib.so:2-3\n'
+            'Removed labels: unused',
+            self.eliminator.report(source_map))
+
+    def test_reports_removed_indices_without_source_map(self):
+        self.eliminator.eliminate(list(self.PROGRAM), self.LABELS)
+        self.assertEqual(
+            'Removed 3 unreachable instructions:\n'
+            '  @1-2\n'
+            '  @8\n'
+            'Removed labels: unused',
+            self.eliminator.report())
+
+    def test_reports_nothing_to_remove(self):
+        self.eliminator.eliminate([('end', ())], {})
+        self.assertEqual('No unreachable code.', self.eliminator.report())
@@ -0,0 +1,87 @@
+from unittest import TestCase, mock
+from io import StringIO
+from threading import Thread
+import os
+import subprocess
+import sys
+
+from beth.Input import Input
+
+
+class InputTest(TestCase):
+    def test_interactive_input_uses_input(self):
+        with mock.patch('builtins.input', return_value='42'):
+            self.assertEqual('42', Input().readline())
+
+    def test_interactive_input_reads_stream_lines(self):
+        source = Input(StringIO('one\ntwo'))
+        self.assertEqual('one', source.readline())
+        self.assertEqual('two', source.readline())
+        self.assertRaises(EOFError, source.readline)
+
+    def test_batch_input_serves_lines_across_blocks(self):
+        source = Input(StringIO('first\nsecond\n\nlast'),
+                       batch=True, block_size=4)
+        for line in ['first', 'second', '', 'last']:
+            self.assertEqual(line, source.readline())
+        self.assertRaises(EOFError, source.readline)
+
+    def test_batch_input_reads_in_blocks(self):
+        stream = StringIO(''.join(f'{i}\n' for i in range(1000)))
+        stream.read = mock.Mock(side_effect=stream.read)
+        source = Input(stream, batch=True, block_size=1 << 16)
+        for i in range(1000):
+            self.assertEqual(str(i), source.readline())
+        self.assertEqual(1, stream.read.call_count)
+
+    def test_batch_input_serves_pipe_lines_as_they_arrive(self):
+        read, write = os.pipe()
+
+        with os.fdopen(read) as stream, os.fdopen(write, 'w') as writer:
+            source = Input(stream, batch=True)
+            writer.write('first\r\n')
+            writer.flush()
+            self.assertEqual('first', self._call(source.readline))
+
+            writer.write('second\nlast')
+            writer.close()
+            self.assertEqual('second', self._call(source.readline))
+            self.assertEqual('last', self._call(source.readline))
+            self.assertRaises(EOFError, source.readline)
+
+    def test_cli_answers_lines_piped_one_by_one(self):
+        with open('test.so', 'w') as file:
+            file.write('ins s\noutl s\nins s\noutl s')
+
+        process = subprocess.Popen(
+            [sys.executable, '-c',
+             'import sys; from beth.cli import run; '
+             'sys.argv = ["beth", "test.so"]; run()'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+            env={**os.environ, 'PYTHONPATH': os.path.abspath('..')})
+
+        try:
+            process.stdin.write('hello\n')
+            process.stdin.flush()
+            self.assertEqual('hello\n', self._call(process.stdout.readline))
+            process.stdin.write('again\n')
+            process.stdin.close()
+            self.assertEqual('again\n', self._call(process.stdout.readline))
+            self.assertEqual(0, process.wait(10))
+        finally:
+            process.kill()
+            process.stdout.close()
+            os.remove('test.so')
+
+    """ Utility methods. """
+    @staticmethod
+    def _call(function, timeout=10):
+        """ Result of `function`, None when it is still blocked after
+        `timeout` seconds.
+        """
+        results = []
+        thread = Thread(target=lambda: results.append(function()),
+                        daemon=True)
+        thread.start()
+        thread.join(timeout)
+        return results[0] if results else None
@@ -0,0 +1,143 @@
+from unittest import TestCase
+from io import StringIO
+import os
+
+import VMTest as base
+from beth.Checkpointer import Checkpointer
+from beth.Input import Input
+from beth.LazyVM import LazyVM
+from beth.Output import Output
+from beth.Result import Result
+from beth.Runner import Runner
+from beth.Snapshot import Snapshot
+
+
+class LazyVMTest(base.VMTest):
+    """ Runs the whole VM test suite against the lazy engine. """
+    def setUp(self) -> None:
+        self.vm = LazyVM()
+
+    def test_fusion_can_be_turned_off(self):
+        self.vm.instructions = ['put 0 i', 'add i 1 i', 'jump start']
+        self.vm.labels = {'start': 1}
+        self.vm.tick()
+        self.vm.tick()
+        self.assertEqual(2, self.vm.ip)
+        self.assertEqual('add', self.vm.program[1][0])
+
+    def test_decodes_instructions_on_first_execution(self):
+        self.vm.instructions = ['jump skip', 'outl "cold"', 'put 1 a', 'end']
+        self.vm.labels = {'skip': 2}
+        self.vm.execute()
+        self.assertIsNone(self.vm.program[1])
+        self.assertEqual({'a': 1}, self.vm.names)
+        self.assertEqual(3, self.vm.cache.misses)
+
+    def test_shares_records_of_identical_lines(self):
+        self.vm.instructions = ['add i 1 i', 'add i 1 i', 'add i 1 i', 'end']
+        self.vm.slots = []
+        self.vm.fetch()
+        self.vm.slots[0] = 0
+        self.vm.exec()
+        self.vm.resume()
+        self.assertEqual(3, self.vm.names['i'])
+        self.assertIs(self.vm.program[0], self.vm.program[2])
+        self.assertEqual(2, self.vm.cache.hits)
+
+    """ Destructive tests. """
+    def test_unknown_label_is_reported_before_execution(self):
+        self.vm.instructions = ['put 1 a', 'jump unknown']
+        self.vm.tick()
+        self.vm.tick()
+        self._assert_err_flag_set()
+        self.assertEqual('unknown label: unknown', self.vm.err)
+
+    def test_reports_invalid_instructions_when_reached(self):
+        self.vm.instructions = ['put 1 a', 'unknown 1 a']
+        self.vm.execute()
+        self.assertEqual('unknown opcode: unknown', self.vm.err)
+        self.assertEqual(2, self.vm.ip)
+
+
+class LazyRunnerTest(TestCase):
+    def setUp(self) -> None:
+        with open('test.so', 'w') as file:
+            file.write('ini n\nmul n n s\noutl s\nend\nbroken 1 2 3')
+
+    def tearDown(self) -> None:
+        os.remove('test.so')
+
+    def test_runs_without_compiling(self):
+        runner = Runner(LazyVM)
+        runner.load('test.so')
+        self.assertEqual('', runner.err)
+        self.assertEqual(Result(0, '', '49\n'), runner.run('7\n'))
+        self.assertEqual(Result(0, '', '9\n'), runner.run('3\n'))
+
+    def test_locates_decode_errors(self):
+        with open('test.so', 'w') as file:
+            file.write('outl 1\nbroken 1 2 3')
+
+        runner = Runner(LazyVM)
+        runner.load('test.so')
+        result = runner.run()
+        self.assertEqual('unknown opcode: broken', result.err)
+        self.assertEqual(f'{os.path.abspath("test.so")}:2',
+                         runner.vm.location())
+
+
+class LazySnapshotTest(TestCase):
+    INSTRUCTIONS = [
+        'put 7 seed',
+        'outl "ready"',
+        'ini n',
+        'add n seed n',
+        'outl n',
+        'jump loop',
+    ]
+    LABELS = {'loop': 2}
+
+    def tearDown(self) -> None:
+        if os.path.exists('test.sos'):
+            os.remove('test.sos')
+
+    def test_identifies_program_whatever_was_decoded(self):
+        vm = self._vm('1\n')
+        vm.decode()
+        digest = vm.compiled.digest()
+        vm.advance(4)
+        self.assertEqual(digest, vm.compiled.digest())
+
+        other = self._vm('')
+        other.decode()
+        self.assertEqual(digest, other.compiled.digest())
+
+    def test_resumes_checkpoint_of_lazy_run(self):
+        with self.assertRaises(EOFError):
+            Checkpointer('test.sos').execute(self._vm(''))
+
+        vm = self._vm('1\n2\n')
+        Snapshot.load('test.sos').restore(vm)
+        with self.assertRaises(EOFError):
+            vm.resume()
+        self.assertEqual('8\n9\n', vm.output.stream.getvalue())
+
+    def test_resumes_slots_in_captured_order(self):
+        vm = LazyVM(['jump second', 'put "a" a', 'end', 'put 1 b',
+                     'jump first'], {'first': 1, 'second': 3},
+                    output=Output(StringIO()))
+        vm.reset()
+        vm.advance(4)
+        snapshot = Snapshot.capture(vm, 2)
+        self.assertEqual(['b', 'a'], snapshot.variables)
+
+        resumed = LazyVM(list(vm.instructions), dict(vm.labels))
+        snapshot.restore(resumed)
+        self.assertEqual({'b': 1, 'a': 'a'}, resumed.names)
+        self.assertEqual([1, 'a'], resumed.slots)
+
+    """ Utility methods. """
+    def _vm(self, stdin):
+        return LazyVM(list(self.INSTRUCTIONS), self.LABELS,
+                      input=Input(StringIO(stdin), batch=True),
+                      output=Output(StringIO()))
@@ -0,0 +1,90 @@
+from unittest import TestCase
+from functools import partial
+from io import StringIO
+
+from beth.Limits import Limits
+from beth.Output import Output
+from beth.ThreadedVM import ThreadedVM
+from beth.TracingVM import TracingVM
+from beth.VM import VM
+
+
+class LimitsTest(TestCase):
+    ENGINE = VM
+
+    def setUp(self) -> None:
+        self.output = StringIO()
+
+    def test_runs_within_limits(self):
+        vm = self._vm(['put 1 a', 'outl a'])
+        self.assertEqual(0, Limits(100, 10, 10, 1000).execute(vm))
+        self.assertEqual('1\n', self.output.getvalue())
+
+    def test_limits_instructions_exactly(self):
+        vm = self._vm(['loop:', 'jump loop'], {'loop': 0})
+        self.assertEqual(Limits.EXIT_CODE,
+                         Limits(instructions=11, interval=4).execute(vm))
+        self.assertEqual('instruction limit exceeded: 11', vm.err)
+
+    def test_counts_instructions_exactly(self):
+        vm = self._vm(['put 0 i', 'loop:', 'add i 1 i', 'jump loop'],
+                      {'loop': 1})
+        Limits(instructions=11, interval=4).execute(vm)
+        self.assertEqual({'i': 5}, vm.names)
+
+    def test_counts_both_instructions_of_superinstructions(self):
+        code = ['put 0 i', 'loop:', 'add i 1 i', 'lth i 1000 c',
+                'jmpt c loop']
+        for budget in range(1, 40):
+            fused = self._vm(code, {'loop': 1})
+            unfused = self._vm(code, {'loop': 1}, fuse=False)
+            Limits(instructions=budget, interval=7).execute(fused)
+            Limits(instructions=budget, interval=7).execute(unfused)
+            self.assertEqual(unfused.names, fused.names)
+            self.assertEqual(unfused.ip, fused.ip)
+
+    def test_limits_time(self):
+        vm = self._vm(['loop:', 'jump loop'], {'loop': 0})
+        self.assertEqual(Limits.EXIT_CODE, Limits(seconds=0).execute(vm))
+        self.assertEqual('time limit exceeded: 0s', vm.err)
+
+    def test_limits_call_depth(self):
+        vm = self._vm(['down:', 'br down'], {'down': 0})
+        Limits(depth=10, interval=5).execute(vm)
+        self.assertEqual('call depth limit exceeded: 10', vm.err)
+        self.assertLessEqual(len(vm.call), 15)
+
+    def test_limits_memory(self):
+        vm = self._vm(['put "x" s', 'loop:', 'con s s s', 'jump loop'],
+                      {'loop': 1})
+        Limits(memory=1000, interval=2).execute(vm)
+        self.assertEqual('memory limit exceeded: 1000 bytes', vm.err)
+        self.assertEqual(Limits.EXIT_CODE, vm.exit_code)
+
+    def test_yields_between_slices(self):
+        vm = self._vm(['put 0 i', 'loop:', 'add i 1 i', 'lth i 10 c',
+                       'jmpt c loop'], {'loop': 1})
+        steps = Limits(interval=3).steps(vm)
+        next(steps)
+        self.assertEqual(3, vm.ip)
+        self.assertEqual(9, len(list(steps)))
+        self.assertEqual({'i': 10, 'c': 0}, vm.names)
+
+    def test_keeps_program_errors(self):
+        vm = self._vm(['err "bad" 3'])
+        self.assertEqual(3, Limits(interval=1).execute(vm))
+        self.assertEqual('bad', vm.err)
+
+    """ Utility methods. """
+    def _vm(self, code, labels=None, fuse=True):
+        instructions = [line for line in code if not line.endswith(':')]
+        return self.ENGINE(instructions, labels, fuse,
+                           output=Output(self.output))
+
+
+class ThreadedLimitsTest(LimitsTest):
+    ENGINE = ThreadedVM
+
+
+class TracingLimitsTest(LimitsTest):
+    ENGINE = partial(TracingVM, threshold=2)
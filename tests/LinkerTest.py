@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+from beth.Linker import Linker
+from beth.Parser import State
+
+
+class LinkerTest(TestCase):
+    def setUp(self) -> None:
+        self.linker = Linker()
+
+    def test_resolves_labels_to_instruction_indices(self):
+        self.linker.link([
+            ('jump', ((State.IDENTIFIER, 'exit'),)),
+            ('jmpt', ((State.IDENTIFIER, 'b'), (State.IDENTIFIER, 'exit'))),
+        ], {'exit': 2})
+        self.assertEqual([
+            ('jump', ((State.LABEL, 2),)),
+            ('jmpt', ((State.IDENTIFIER, 'b'), (State.LABEL, 2))),
+        ], self.linker.program)
+        self._assert_err_flag_not_set()
+
+    def test_marks_branches_through_variables_as_pointers(self):
+        self.linker.link([
+            ('put', ((State.INTEGER, 50), (State.IDENTIFIER, 'mp'))),
+            ('jump', ((State.IDENTIFIER, 'mp'),)),
+        ], {})
+        self.assertEqual(
+            ('jump', ((State.POINTER, 'mp'),)), self.linker.program[1])
+        self._assert_err_flag_not_set()
+
+    def test_labels_take_precedence_over_variables(self):
+        self.linker.link([
+            ('put', ((State.INTEGER, 0), (State.IDENTIFIER, 'start'))),
+            ('br', ((State.IDENTIFIER, 'start'),)),
+        ], {'start': 0})
+        self.assertEqual(
+            ('br', ((State.LABEL, 0),)), self.linker.program[1])
+
+    def test_leaves_other_instructions_untouched(self):
+        program = [('outl', ((State.IDENTIFIER, 'exit'),))]
+        self.linker.link(program, {'exit': 0})
+        self.assertEqual(program, self.linker.program)
+
+    def test_renames_computed_branches_to_their_indirect_opcode(self):
+        self.assertEqual(
+            ('jmpt:ptr', ((State.IDENTIFIER, 0), (State.POINTER, 1))),
+            Linker.indirect(
+                ('jmpt', ((State.IDENTIFIER, 0), (State.POINTER, 1)))))
+        direct = ('jmpt', ((State.IDENTIFIER, 0), (State.LABEL, 1)))
+        self.assertIs(direct, Linker.indirect(direct))
+
+    def test_finds_basic_block_leaders(self):
+        program = [
+            ('put', ((State.INTEGER, 0), (State.IDENTIFIER, 0))),
+            ('jmpt', ((State.IDENTIFIER, 0), (State.LABEL, 4))),
+            ('err', ((State.STRING, ''), (State.INTEGER, 2))),
+            ('err', ((State.STRING, 'stop'), (State.INTEGER, 2))),
+            ('outl', ((State.IDENTIFIER, 0),)),
+            ('back', ()),
+        ]
+        self.assertEqual({0, 2, 4}, Linker.leaders(program))
+        self.assertFalse(Linker.has_computed_branches(program))
+
+    def test_errors_without_message_fall_through(self):
+        self.assertTrue(Linker.falls_through(
+            'err', ((State.STRING, ''), (State.INTEGER, 2))))
+        self.assertTrue(Linker.falls_through(
+            'err', ((State.IDENTIFIER, 0), (State.INTEGER, 2))))
+        self.assertFalse(Linker.falls_through(
+            'err', ((State.STRING, 'stop'), (State.INTEGER, 2))))
+        self.assertFalse(Linker.falls_through('jump', ((State.LABEL, 0),)))
+
+    def test_finds_computed_branches(self):
+        self.assertTrue(Linker.has_computed_branches([
+            ('outl', ((State.INTEGER, 1),)),
+            ('br', ((State.POINTER, 0),)),
+        ]))
+
+    """ Destructive tests. """
+    def test_sets_err_flag_on_unknown_label(self):
+        self.linker.link([('br', ((State.IDENTIFIER, 'nowhere'),))], {})
+        self.assertEqual('unknown label: nowhere', self.linker.err)
+
+    def test_sets_err_flag_on_literal_branch_target(self):
+        self.linker.link([('jump', ((State.INTEGER, 1),))], {})
+        self.assertEqual('unknown label: 1', self.linker.err)
+
+    """ Utility methods. """
+    def _assert_err_flag_not_set(self):
+        self.assertFalse(self.linker.err)
@@ -87,12 +87,37 @@ class LoaderTest(TestCase):
         os.remove('one.so')
         os.remove('two.so')
 
+    def test_streams_lines_lazily(self):
+        self._write_to_file('one.so', 'ini a')
+        self._write_to_test_file('ini b\n>"one.so"\nini c')
+        stream = self.loader.stream('test.so')
+        self.assertEqual('ini b', next(stream))
+        self.assertEqual(1, len(self.loader.included))
+        self.assertEqual(['ini a', 'ini c'], list(stream))
+        self.assertEqual([], self.loader.code)
+        os.remove('one.so')
+
+    def test_locates_lines_through_includes(self):
+        self._write_to_file('one.so', '@ library\n\nini a')
+        self._write_to_test_file('ini b\n>"one.so"\n\nini c')
+        self._load()
+        one, test = os.path.abspath('one.so'), os.path.abspath('test.so')
+        self.assertEqual(
+            [(test, 1), (one, 3), (test, 4)],
+            [self.loader.source_map.locate(i) for i in range(3)])
+        os.remove('one.so')
+
     """ Destructive tests. """
     def test_sets_err_flag_on_nonexistent_include(self):
         self._write_to_test_file('>"non-existent.so"')
         self._load()
         self._assert_err_flag_set()
 
+    def test_stream_stops_on_nonexistent_include(self):
+        self._write_to_test_file('ini a\n>"non-existent.so"\nini b')
+        self.assertEqual(['ini a'], list(self.loader.stream('test.so')))
+        self._assert_err_flag_set()
+
     def test_catches_empty_include_statements(self):
         self._write_to_test_file('>')
         self._load()
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from beth.Optimizer import Optimizer
+from beth.Parser import State
+
+
+LEQ = ('leq', ((State.IDENTIFIER, 0), (State.INTEGER, 5),
+               (State.IDENTIFIER, 1)))
+JMPF = ('jmpf', ((State.IDENTIFIER, 1), (State.LABEL, 4)))
+ADD = ('add', ((State.IDENTIFIER, 0), (State.INTEGER, 1),
+               (State.IDENTIFIER, 0)))
+JUMP = ('jump', ((State.LABEL, 0),))
+
+
+class OptimizerTest(TestCase):
+    def setUp(self) -> None:
+        self.optimizer = Optimizer()
+
+    def test_fuses_compare_and_branch(self):
+        self.optimizer.optimize([LEQ, JMPF])
+        self.assertEqual([
+            ('leq+jmpf', (LEQ[1], JMPF[1])),
+            JMPF,
+        ], self.optimizer.program)
+        self.assertEqual(1, self.optimizer.fusions)
+
+    def test_fuses_increment_and_jump(self):
+        self.optimizer.optimize([LEQ, ADD, JUMP])
+        self.assertEqual(('add+jump', (ADD[1], JUMP[1])),
+                         self.optimizer.program[1])
+
+    def test_keeps_instruction_indices(self):
+        program = [LEQ, JMPF, ADD, JUMP, ('end', ())]
+        self.optimizer.optimize(program)
+        self.assertEqual(len(program), len(self.optimizer.program))
+        self.assertEqual(2, self.optimizer.fusions)
+
+    def test_does_not_fuse_branch_on_other_variable(self):
+        jmpf = ('jmpf', ((State.IDENTIFIER, 2), (State.LABEL, 4)))
+        self.optimizer.optimize([LEQ, jmpf])
+        self.assertEqual([LEQ, jmpf], self.optimizer.program)
+
+    def test_does_not_fuse_computed_jump(self):
+        jump = ('jump', ((State.POINTER, 0),))
+        self.optimizer.optimize([ADD, jump])
+        self.assertEqual([ADD, jump], self.optimizer.program)
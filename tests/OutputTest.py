@@ -0,0 +1,36 @@
+from unittest import TestCase
+from io import StringIO
+
+from beth.Output import Output
+
+
+class OutputTest(TestCase):
+    def setUp(self) -> None:
+        self.stream = StringIO()
+
+    def test_writes_through_without_buffer(self):
+        output = Output(self.stream)
+        output.write('hello')
+        self.assertEqual('hello', self.stream.getvalue())
+
+    def test_buffers_until_flush(self):
+        output = Output(self.stream, buffer_size=100)
+        output.write('hello ')
+        output.write('world')
+        self.assertEqual('', self.stream.getvalue())
+        output.flush()
+        self.assertEqual('hello world', self.stream.getvalue())
+
+    def test_drains_when_buffer_is_full(self):
+        output = Output(self.stream, buffer_size=8)
+        output.write('hello ')
+        self.assertEqual('', self.stream.getvalue())
+        output.write('world')
+        self.assertEqual('hello world', self.stream.getvalue())
+
+    def test_flush_twice_writes_once(self):
+        output = Output(self.stream, buffer_size=100)
+        output.write('hi')
+        output.flush()
+        output.flush()
+        self.assertEqual('hi', self.stream.getvalue())
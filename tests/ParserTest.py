@@ -59,6 +59,24 @@ class ParserTest(TestCase):
             )
         )
 
+    """ Destructive tests. """
+    def test_sets_err_flag_on_lone_minus(self):
+        self._parse_and_check_err('put - a')
+        self._parse_and_check_err('put -')
+
+    def test_sets_err_flag_on_unterminated_string(self):
+        self._parse_and_check_err('out "hello')
+        self._parse_and_check_err(r'out "hello\"')
+
+    def test_sets_err_flag_on_invalid_identifier(self):
+        self._parse_and_check_err('put 1 a"b')
+
+    """ Utility methods. """
+    def _parse_and_check_err(self, instruction):
+        self.parser = Parser()
+        self.parser.parse(instruction)
+        self.assertTrue(self.parser.err())
+
     def _parse_and_check_result(self, instruction, opcode, operand):
         self.parser = Parser()
         self.parser.parse(instruction)
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from beth.Preprocessor import Preprocessor
+from beth.SourceMap import SourceMap
 
 
 class PreprocessorTest(TestCase):
@@ -36,6 +37,24 @@ class PreprocessorTest(TestCase):
         self.assertEqual({'exit': 4}, self.pre.labels)
         self._assert_err_flag_not_set()
 
+    def test_streams_instructions_and_labels(self):
+        stream = self.pre.stream(iter(['start:', 'inn n', 'exit:', 'end']))
+        self.assertEqual('inn n', next(stream))
+        self.assertEqual({'start': 0}, self.pre.labels)
+        self.assertEqual(['end'], list(stream))
+        self.assertEqual({'start': 0, 'exit': 1}, self.pre.labels)
+        self.assertEqual([], self.pre.instructions)
+        self._assert_err_flag_not_set()
+
+    def test_locates_instructions(self):
+        code_map = SourceMap(['test.so'])
+        for line in (1, 2, 4, 5):
+            code_map.append(0, line)
+
+        self.pre.process(['start:', 'inn n', 'exit:', 'end'], code_map)
+        self.assertEqual(['test.so:2', 'test.so:5'],
+                         [self.pre.source_map.describe(i) for i in (0, 1)])
+
     """ Destructive tests. """
     def test_sets_err_flag_on_empty_code(self):
         self.pre.process([])
@@ -44,6 +63,11 @@ class PreprocessorTest(TestCase):
     def test_sets_err_flag_on_duplicate_labels(self):
         self.pre.process(['start:', 'end', 'start:', 'add 1 2 s', 'back'])
         self._assert_err_flag_set()
+        self.assertEqual(2, self.pre.fault)
+
+    def test_stream_sets_err_flag_on_empty_code(self):
+        self.assertEqual([], list(self.pre.stream(iter(['start:']))))
+        self._assert_err_flag_set()
 
     def test_catches_invalid_labels(self):
         self.pre.process(['1invalid:'])
@@ -0,0 +1,88 @@
+from unittest import TestCase
+from io import StringIO
+from itertools import count
+
+from beth.Output import Output
+from beth.Profiler import Profiler
+from beth.ThreadedVM import ThreadedVM
+from beth.TracingVM import TracingVM
+from beth.VM import VM
+
+
+class ProfilerTest(TestCase):
+    INSTRUCTIONS = [
+        'put 0 i',
+        'add i 1 i',
+        'br twice',
+        'lth i 3 c',
+        'jmpt c loop',
+        'end',
+        'out i',
+        'back',
+    ]
+    LABELS = {'loop': 1, 'twice': 6}
+
+    def setUp(self) -> None:
+        self.vm = VM(list(self.INSTRUCTIONS), self.LABELS, fuse=False,
+                     output=Output(StringIO()))
+        self.profiler = Profiler(self.vm, clock=count().__next__)
+
+    def test_executes_program(self):
+        self.assertEqual(0, self.profiler.execute())
+        self.assertEqual('123', self.vm.output.stream.getvalue())
+
+    def test_counts_instructions(self):
+        self.profiler.execute()
+        self.assertEqual([1, 3, 3, 3, 3, 1, 3, 3], self.profiler.counts)
+
+    def test_times_instructions(self):
+        self.profiler.execute()
+        self.assertEqual([1, 3, 3, 3, 3, 1, 3, 3], self.profiler.times)
+
+    def test_sums_opcodes(self):
+        self.profiler.execute()
+        self.assertIn(('br', 3, 3.0), self.profiler.opcodes())
+
+    def test_times_branch_targets_inclusively(self):
+        self.profiler.execute()
+        self.assertEqual([(6, 3, 15)], self.profiler.branches())
+
+    def test_locates_instructions_by_label(self):
+        self.profiler.execute()
+        self.assertEqual('@0', self.profiler.location(0))
+        self.assertEqual('loop', self.profiler.location(1))
+        self.assertEqual('loop+3', self.profiler.location(4))
+
+    def test_reports_hot_spots(self):
+        self.profiler.execute()
+        report = self.profiler.report()
+        self.assertIn('Hot spots:', report)
+        self.assertIn('twice', report)
+
+    def test_reports_fused_opcodes(self):
+        self.vm.fuse = True
+        self.profiler.execute()
+        opcodes = [row[0] for row in self.profiler.opcodes()]
+        self.assertIn('lth:vc+jmpt', opcodes)
+
+    def test_stops_on_error(self):
+        self.vm.instructions = ['jump nowhere']
+        self.assertEqual(1, self.profiler.execute())
+        self.assertEqual('unknown label: nowhere', self.vm.err)
+
+    def test_profiles_threaded_engine(self):
+        vm = ThreadedVM(list(self.INSTRUCTIONS), self.LABELS,
+                        output=Output(StringIO()))
+        profiler = Profiler(vm)
+        profiler.execute()
+        self.assertEqual('123', vm.output.stream.getvalue())
+        self.assertEqual(3, profiler.counts[6])
+
+    def test_profiles_loops_of_tracing_engine_one_by_one(self):
+        vm = TracingVM(['put 0 i', 'add i 1 i', 'lth i 100 c', 'jmpt c loop'],
+                       {'loop': 1}, fuse=False, threshold=2)
+        profiler = Profiler(vm)
+        profiler.execute()
+        self.assertEqual([1, 100, 100, 100, 1], profiler.counts)
+        self.assertEqual({}, vm.traces)
+
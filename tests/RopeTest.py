@@ -0,0 +1,52 @@
+from unittest import TestCase
+import sys
+
+from beth.Rope import Rope, concat
+
+
+class RopeTest(TestCase):
+    LONG = 'x' * Rope.MIN_LENGTH
+
+    def test_short_strings_stay_strings(self):
+        self.assertEqual('ab1', concat('ab', 1))
+        self.assertIs(str, type(concat('ab', 1)))
+
+    def test_long_strings_become_ropes(self):
+        rope = concat(self.LONG, 'y')
+        self.assertIs(Rope, type(rope))
+        self.assertEqual(self.LONG + 'y', rope)
+        self.assertEqual(len(self.LONG) + 1, len(rope))
+
+    def test_appends_chunks_without_joining_them(self):
+        rope = concat(concat(concat(self.LONG, 'a'), 1), 'b')
+        self.assertEqual([self.LONG + 'a', '1', 'b'], list(rope.chunks()))
+        self.assertEqual(f'{self.LONG}a1b', str(rope))
+
+    def test_is_a_value(self):
+        base = concat(self.LONG, 'a')
+        first = concat(base, 'b')
+        second = concat(base, 'c')
+        self.assertEqual(self.LONG + 'a', base)
+        self.assertEqual(self.LONG + 'ab', first)
+        self.assertEqual(self.LONG + 'ac', second)
+
+    def test_appends_to_joined_string(self):
+        rope = concat(self.LONG, 'a')
+        str(rope)
+        self.assertEqual([self.LONG + 'a', 'b'],
+                         list(concat(rope, 'b').chunks()))
+        self.assertEqual(self.LONG + 'a', rope)
+
+    def test_appends_ropes_as_strings(self):
+        rope = concat(self.LONG, concat(self.LONG, 'a'))
+        self.assertEqual(self.LONG * 2 + 'a', rope)
+
+    def test_behaves_like_its_string(self):
+        rope = concat(self.LONG, '')
+        self.assertTrue(rope)
+        self.assertEqual(rope, concat(self.LONG, ''))
+        self.assertNotEqual(rope, 1)
+        self.assertEqual(hash(self.LONG), hash(rope))
+        self.assertEqual(f'<{self.LONG}>', f'<{rope}>')
+        self.assertEqual(42, int(concat(' ' * Rope.MIN_LENGTH, 42)))
+        self.assertGreater(sys.getsizeof(rope), len(self.LONG))
@@ -0,0 +1,176 @@
+from unittest import TestCase
+from contextlib import redirect_stdout
+from io import StringIO
+import os
+
+from beth.Limits import Limits
+from beth.Result import Result
+from beth.Runner import Runner
+from beth.ThreadedVM import ThreadedVM
+from beth.VM import VM
+
+
+class RunnerTest(TestCase):
+    def setUp(self) -> None:
+        self._write_to_test_file(
+            'ini n\n'
+            'jmpt seen repeat\n'
+            'put 1 seen\n'
+            'mul n n s\n'
+            'outl s\n'
+            'end\n'
+            'repeat:\n'
+            'err "state leaked" 3\n'
+        )
+        self.runner = Runner()
+        self.runner.load('test.so')
+
+    def tearDown(self) -> None:
+        os.remove('test.so')
+
+    def test_runs_many_times_with_fresh_state(self):
+        for n in range(5):
+            self.assertEqual(Result(0, '', f'{n * n}\n'),
+                             self.runner.run(f'{n}\n'))
+
+    def test_reports_runtime_errors_in_result(self):
+        result = self.runner.run('two\n')
+        self.assertEqual(1, result.exit_code)
+        self.assertEqual(
+            'invalid literal "two" for integer conversion', result.err)
+        self.assertEqual(Result(0, '', '9\n'), self.runner.run('3\n'))
+
+    def test_reports_end_of_input_in_result(self):
+        self._write_to_test_file('ini a\nout a\nini b\nout b')
+        runner = Runner()
+        runner.load('test.so')
+        self.assertEqual(Result(1, 'unexpected end of input', '5'),
+                         runner.run('5\n'))
+        self.assertEqual(Result(0, '', '56'), runner.run('5\n6\n'))
+
+    def test_writes_to_given_stream(self):
+        stdout = StringIO()
+        result = self.runner.run(StringIO('7\n'), stdout)
+        self.assertEqual('49\n', stdout.getvalue())
+        self.assertIsNone(result.output)
+
+    def test_threaded_engine(self):
+        runner = Runner(ThreadedVM)
+        runner.load('test.so')
+        for n in range(3):
+            self.assertEqual(Result(0, '', f'{n * n}\n'), runner.run(f'{n}'))
+
+    def test_does_not_share_state_between_vms(self):
+        first, second = VM(), VM()
+        first.labels['start'] = 0
+        first.instructions.append('end')
+        self.assertEqual({}, second.labels)
+        self.assertEqual([], second.instructions)
+
+    def test_holds_runs_to_limits(self):
+        result = self.runner.run('3\n', limits=Limits(instructions=2))
+        self.assertEqual(
+            Result(Limits.EXIT_CODE, 'instruction limit exceeded: 2', ''),
+            result)
+        self.assertEqual(Result(0, '', '9\n'),
+                         self.runner.run('3\n', limits=Limits(10)))
+
+    def test_reports_dead_code(self):
+        self._write_to_file('lib.so', 'unused:\n  outl 1\n  back\n'
+                                      'used:\n  outl 2\n  back')
+        self._write_to_test_file('jump main\n>"lib.so"\nmain:\n'
+                                 'br used\nend')
+        runner = Runner()
+        runner.load('test.so')
+        os.remove('lib.so')
+        self.assertEqual(
+            'Removed 2 unreachable instructions:\n'
+            f'  {os.path.abspath("lib.so")}:2-3\n'
+            'Removed labels: unused', runner.dead_code)
+        self.assertEqual(Result(0, '', '2\n'), runner.run())
+
+    """ Destructive tests. """
+    def test_sets_err_flag_on_compile_error(self):
+        self._write_to_test_file('jump nowhere')
+        runner = Runner()
+        runner.load('test.so')
+        self.assertEqual(
+            f'[compiler] {os.path.abspath("test.so")}:1: '
+            'unknown label: nowhere', runner.err)
+
+    def test_locates_errors_in_included_files(self):
+        self._write_to_file('lib.so', 'lib:\n\n  back\n  jump nowhere')
+        self._write_to_test_file('>"lib.so"\nbr lib')
+        runner = Runner()
+        runner.load('test.so')
+        os.remove('lib.so')
+        self.assertTrue(runner.err.endswith(
+            f'{os.path.abspath("lib.so")}:4: unknown label: nowhere'))
+
+    def test_locates_errors_after_removing_dead_code(self):
+        self._write_to_test_file('jump main\nout "dead"\nmain:\n'
+                                 'ins s\nadd "s" 1 n')
+        runner = Runner()
+        runner.load('test.so')
+        self.assertEqual(
+            f'[compiler] {os.path.abspath("test.so")}:5: '
+            'integer expected in add: "s"', runner.err)
+
+    def test_numbers_instructions_as_written_after_removing_dead_code(self):
+        self._write_to_test_file('jump main\ndead:\noutl "x"\nback\n'
+                                 'main:\nback')
+        # compiled first, then read back from bytecode
+        for _ in range(2):
+            runner = Runner()
+            runner.load('test.so', cache=True)
+            self.assertEqual('attempt to branch back with empty call stack '
+                             'at instruction 4', runner.run().err)
+
+        os.remove('test.soc')
+
+    def test_locates_preprocessor_errors(self):
+        self._write_to_test_file('end\nend:\nend:')
+        runner = Runner()
+        runner.load('test.so')
+        self.assertEqual(
+            f'[preprocessor] {os.path.abspath("test.so")}:3: '
+            'duplicate labels detected: end:', runner.err)
+
+    def test_locates_runtime_errors(self):
+        self.runner.run('two\n')
+        self.assertEqual(
+            f'{os.path.abspath("test.so")}:1', self.runner.vm.location())
+
+    def test_halts_with_located_runtime_errors(self):
+        self.runner.run('two\n')
+        self.assertEqual(
+            (1, f'Error: {os.path.abspath("test.so")}:1: '
+                'invalid literal "two" for integer conversion\n'),
+            self._halt(self.runner.vm))
+
+    def test_halts_with_program_errors_as_written(self):
+        self._write_to_test_file('outl 1\nerr "state leaked" 3')
+        runner = Runner()
+        runner.load('test.so')
+        runner.run()
+        self.assertEqual((3, 'Error: state leaked\n'), self._halt(runner.vm))
+
+    def test_sets_err_flag_on_missing_source(self):
+        runner = Runner()
+        runner.load('non-existent.so')
+        self.assertTrue(runner.err.startswith('[loader]'))
+
+    """ Utility methods. """
+    def _halt(self, vm):
+        stdout = StringIO()
+        with redirect_stdout(stdout), self.assertRaises(SystemExit) as exit:
+            vm.halt()
+        return exit.exception.code, stdout.getvalue()
+
+    def _write_to_test_file(self, string):
+        self._write_to_file('test.so', string)
+
+    @staticmethod
+    def _write_to_file(path, string):
+        with open(path, 'w') as file:
+            file.write(string)
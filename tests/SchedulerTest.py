@@ -0,0 +1,40 @@
+from unittest import TestCase
+from io import StringIO
+
+from beth.Limits import Limits
+from beth.Output import Output
+from beth.Scheduler import Scheduler
+from beth.VM import VM
+
+
+class SchedulerTest(TestCase):
+    def setUp(self) -> None:
+        self.output = StringIO()
+        self.scheduler = Scheduler()
+
+    def test_interleaves_vms(self):
+        for name in 'ab':
+            self.scheduler.add(self._counter(name, 3), Limits(interval=5))
+
+        self.assertEqual([0, 0], self.scheduler.run())
+        self.assertEqual('a0b0a1b1a2b2', self.output.getvalue())
+
+    def test_stops_runaway_vm_only(self):
+        runaway = VM(['jump forever'], {'forever': 0},
+                     output=Output(self.output))
+        self.scheduler.add(runaway, Limits(instructions=100))
+        self.scheduler.add(self._counter('a', 2))
+        self.assertEqual([Limits.EXIT_CODE, 0], self.scheduler.run())
+        self.assertEqual('a0a1', self.output.getvalue())
+
+    """ Utility methods. """
+    def _counter(self, name, count):
+        # every iteration prints within one slice of 5 instructions
+        return VM([
+            'put 0 i',
+            f'out "{name}"',
+            'out i',
+            'add i 1 i',
+            f'lth i {count} c',
+            'jmpt c loop',
+        ], {'loop': 1}, fuse=False, output=Output(self.output))
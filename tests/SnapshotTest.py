@@ -0,0 +1,92 @@
+from unittest import TestCase
+from io import StringIO
+import os
+
+from beth.Input import Input
+from beth.Output import Output
+from beth.Snapshot import Snapshot
+from beth.ThreadedVM import ThreadedVM
+from beth.VM import VM
+
+
+class SnapshotTest(TestCase):
+    ENGINE = VM
+    INSTRUCTIONS = [
+        'put 0 i',
+        'br step',
+        'lth i 6 c',
+        'jmpt c loop',
+        'end',
+        'add i 1 i',
+        'outl i',
+        'back',
+    ]
+    LABELS = {'loop': 1, 'step': 5}
+
+    def tearDown(self) -> None:
+        if os.path.exists('test.sos'):
+            os.remove('test.sos')
+
+    def test_resumes_where_it_was_captured(self):
+        vm = self._vm()
+        vm.reset()
+        vm.advance(10)
+        snapshot = Snapshot.capture(vm)
+
+        resumed = self._vm()
+        snapshot.restore(resumed)
+        self.assertEqual(0, resumed.resume())
+        self.assertEqual('3\n4\n5\n6\n', resumed.output.stream.getvalue())
+
+    def test_captures_call_stack(self):
+        vm = self._vm()
+        vm.reset()
+        vm.advance(3)
+        snapshot = Snapshot.capture(vm)
+        self.assertEqual([2], snapshot.call)
+        self.assertEqual(6, snapshot.ip)
+        self.assertEqual([1, None], snapshot.slots)
+
+    def test_round_trips_through_file(self):
+        vm = self._vm()
+        vm.reset()
+        vm.advance(7)
+        Snapshot.capture(vm).save('test.sos')
+        self.assertEqual(Snapshot.capture(vm), Snapshot.load('test.sos'))
+
+    def test_captures_long_strings(self):
+        vm = self.ENGINE(['ins s', 'con s s s', 'jump double'],
+                         {'double': 1}, input=Input(StringIO('ab\n')))
+        vm.reset()
+        vm.advance(21)
+        Snapshot.capture(vm).save('test.sos')
+        self.assertEqual(['ab' * 2 ** 10], Snapshot.load('test.sos').slots)
+
+    def test_identifies_program_across_compilations(self):
+        first, second = self._vm(), self._vm()
+        first.decode()
+        second.decode()
+        self.assertEqual(first.compiled.digest(), second.compiled.digest())
+
+    """ Destructive tests. """
+    def test_refuses_other_programs(self):
+        vm = self._vm()
+        vm.decode()
+        other = VM(['outl 1'])
+        with self.assertRaises(ValueError):
+            Snapshot.capture(vm).restore(other)
+
+    def test_refuses_corrupted_data(self):
+        with self.assertRaises(ValueError):
+            Snapshot.loads(Snapshot.HEADER + b'garbage')
+        with self.assertRaises(ValueError):
+            Snapshot.loads(b'garbage')
+
+    """ Utility methods. """
+    def _vm(self):
+        return self.ENGINE(list(self.INSTRUCTIONS), self.LABELS,
+                           output=Output(StringIO()))
+
+
+class ThreadedSnapshotTest(SnapshotTest):
+    ENGINE = ThreadedVM
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from beth.SourceMap import SourceMap
+
+
+class SourceMapTest(TestCase):
+    def setUp(self) -> None:
+        self.source_map = SourceMap()
+        main = self.source_map.add_file('main.so')
+        lib = self.source_map.add_file('lib.so')
+        self.source_map.append(main, 1)
+        self.source_map.append(lib, 7)
+
+    def test_registers_files(self):
+        self.assertEqual(['main.so', 'lib.so'], self.source_map.files)
+        self.assertEqual(2, len(self.source_map))
+
+    def test_locates_entries(self):
+        self.assertEqual(('lib.so', 7), self.source_map.locate(1))
+
+    def test_describes_entries(self):
+        self.assertEqual('main.so:1', self.source_map.describe(0))
+
+    def test_copies_entries(self):
+        other = SourceMap(self.source_map.files)
+        other.copy_entry(1, self.source_map)
+        self.assertEqual(('lib.so', 7), other.locate(0))
+
+    def test_ignores_unmapped_entries(self):
+        self.assertIsNone(self.source_map.locate(2))
+        self.assertIsNone(self.source_map.describe(-1))
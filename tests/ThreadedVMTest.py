@@ -0,0 +1,42 @@
+from unittest import TestCase
+from contextlib import redirect_stdout
+from io import StringIO
+
+import VMTest as base
+from beth.Loader import Loader
+from beth.Preprocessor import Preprocessor
+from beth.ThreadedVM import ThreadedVM
+from beth.VM import VM
+
+
+class ThreadedVMTest(base.VMTest):
+    """ Runs the whole VM test suite against the threaded engine. """
+    def setUp(self) -> None:
+        self.vm = ThreadedVM()
+
+
+class EngineParityTest(TestCase):
+    def test_while_example_output_matches(self):
+        self._assert_same_output('../examples/theory/while.so')
+
+    def test_out_of_bounds_example_output_matches(self):
+        self._assert_same_output('../examples/exe/mem_ptr_out_of_bounds.so')
+
+    """ Utility methods. """
+    def _assert_same_output(self, src):
+        self.assertEqual(self._boot(VM, src), self._boot(ThreadedVM, src))
+
+    @staticmethod
+    def _boot(engine, src):
+        loader = Loader()
+        loader.load(src)
+        pre = Preprocessor()
+        pre.process(loader.code)
+
+        out = StringIO()
+        with redirect_stdout(out):
+            try:
+                engine(pre.instructions, pre.labels).boot()
+            except SystemExit as exit:
+                code = exit.code
+        return out.getvalue(), code
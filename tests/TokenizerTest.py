@@ -0,0 +1,50 @@
+from unittest import TestCase
+import random
+
+import ParserTest as base
+from beth.Parser import Parser
+from beth.Tokenizer import Tokenizer
+
+
+class TokenizerTest(base.ParserTest):
+    """ Runs the whole Parser test suite against the Tokenizer. """
+    def _parse_and_check_err(self, instruction):
+        self.parser = Tokenizer()
+        self.parser.parse(instruction)
+        self.assertTrue(self.parser.err())
+
+    def _parse_and_check_result(self, instruction, opcode, operand):
+        self.parser = Tokenizer()
+        self.parser.parse(instruction)
+        self.assertEqual(opcode, self.parser.opcode)
+        self.assertEqual(operand, self.parser.operand)
+
+
+class TokenizerParityTest(TestCase):
+    ALPHABET = [
+        'a', 'z', '_', 'X', '1', '0', '-', '"', '\\', 'n', 't', ' ', '\t',
+        ';', 'é', '٣', ' ', 'put', 'x1', '"hi"', '\\"', '@', '.',
+    ]
+
+    def test_matches_parser_on_random_instructions(self):
+        rnd = random.Random(42)
+        tokenizer = Tokenizer()
+
+        for i in range(20000):
+            instruction = rnd.choice(['put ', 'out ', 'x ', '']) + ''.join(
+                rnd.choice(self.ALPHABET) for _ in range(rnd.randint(0, 8)))
+            parser = Parser()
+            parser.parse(instruction)
+            tokenizer.parse(instruction)
+
+            self.assertEqual(parser.err(), tokenizer.err(), instruction)
+            if not parser.err():
+                self.assertEqual(parser.opcode, tokenizer.opcode)
+                self.assertEqual(parser.operand, tokenizer.operand)
+
+    def test_can_be_reused(self):
+        tokenizer = Tokenizer()
+        tokenizer.parse('put 1')
+        tokenizer.parse('back')
+        self.assertEqual('back', tokenizer.opcode)
+        self.assertEqual((), tokenizer.operand)
@@ -0,0 +1,140 @@
+from unittest import TestCase
+from io import StringIO
+
+import VMTest as base
+from beth.Input import Input
+from beth.Limits import Limits
+from beth.Output import Output
+from beth.TracingVM import TracingVM
+
+
+class TracingVMTest(base.VMTest):
+    """ Runs the whole VM test suite against the tracing engine, compiling
+    every loop as soon as it comes around.
+    """
+    def setUp(self) -> None:
+        self.vm = TracingVM(threshold=1)
+
+
+class TraceTest(TestCase):
+    LOOP = [
+        'put 0 i',
+        'put 0 sum',
+        'add sum i sum',
+        'add i 1 i',
+        'lth i 100 c',
+        'jmpt c loop',
+        'outl sum',
+        'end',
+    ]
+
+    def setUp(self) -> None:
+        self.stream = StringIO()
+        self.vm = TracingVM(list(self.LOOP), {'loop': 2}, threshold=10,
+                            output=Output(self.stream))
+
+    def test_compiles_hot_loops(self):
+        self.vm.execute()
+        self.assertEqual('4950\n', self.stream.getvalue())
+        self.assertEqual([2], list(self.vm.traces))
+
+    def test_leaves_cold_loops_interpreted(self):
+        self.vm.threshold = 1000
+        self.vm.execute()
+        self.assertEqual('4950\n', self.stream.getvalue())
+        self.assertEqual({}, self.vm.traces)
+        self.assertEqual(99, self.vm.counters[2])
+
+    def test_takes_side_exits(self):
+        self.vm.execute()
+        self.assertEqual(1, self.vm.side_exits)
+        self.assertEqual(100, self.vm.names['i'])
+
+    def test_keeps_traces_between_runs(self):
+        self.vm.execute()
+        trace = self.vm.traces[2]
+        self.vm.execute()
+        self.assertIs(trace, self.vm.traces[2])
+        self.assertEqual('4950\n4950\n', self.stream.getvalue())
+
+    def test_follows_branches_inside_traces(self):
+        self._run([
+            'put 0 i',
+            'put 0 odd',
+            'mod i 2 r',
+            'jmpf r even',
+            'add odd 1 odd',
+            'add i 1 i',
+            'lth i 9 c',
+            'jmpt c loop',
+            'outl odd',
+        ], {'loop': 2, 'even': 5}, threshold=2)
+        self.assertEqual('4\n', self.stream.getvalue())
+        self.assertGreater(self.vm.side_exits, 1)
+
+    def test_runs_fused_and_unfused_code_alike(self):
+        self.vm.fuse = False
+        self.vm.execute()
+        self.assertEqual('4950\n', self.stream.getvalue())
+        self.assertEqual([2], list(self.vm.traces))
+
+    def test_rejects_loops_calling_subroutines(self):
+        self._run([
+            'put 0 i',
+            'br step',
+            'lth i 20 c',
+            'jmpt c loop',
+            'outl i',
+            'end',
+            'add i 1 i',
+            'back',
+        ], {'loop': 1, 'step': 6}, threshold=2)
+        self.assertEqual('20\n', self.stream.getvalue())
+        self.assertEqual({}, self.vm.traces)
+        self.assertIn(1, self.vm.rejected)
+
+    def test_rejects_loops_reading_input(self):
+        self.vm.input = Input(StringIO('1\n' * 20), batch=True)
+        self._run([
+            'put 0 i',
+            'ini x',
+            'add i x i',
+            'lth i 20 c',
+            'jmpt c loop',
+            'outl i',
+        ], {'loop': 1}, threshold=2)
+        self.assertEqual('20\n', self.stream.getvalue())
+        self.assertEqual({}, self.vm.traces)
+
+    def test_hands_control_back_between_iterations(self):
+        self.vm.instructions = ['put 0 i', 'add i 1 i', 'jump loop']
+        self.vm.labels = {'loop': 1}
+        limits = Limits(seconds=0.05, interval=100)
+        self.assertEqual(Limits.EXIT_CODE, limits.execute(self.vm))
+        self.assertEqual([1], list(self.vm.traces))
+
+    def test_charges_trace_instructions_to_budgets(self):
+        self.vm.instructions = ['put 0 i', 'add i 1 i', 'jump loop']
+        self.vm.labels = {'loop': 1}
+        limits = Limits(instructions=5000)
+        self.assertEqual(Limits.EXIT_CODE, limits.execute(self.vm))
+        # put, then add and jump 2499 times and add once more
+        self.assertEqual(2500, self.vm.names['i'])
+        self.assertEqual(5000, self.vm.executed)
+        self.assertEqual([1], list(self.vm.traces))
+
+    def test_charges_side_exits_to_budgets(self):
+        for budget in range(300, 320):
+            Limits(instructions=budget, interval=50).execute(self.vm)
+            interpreted = TracingVM(list(self.LOOP), {'loop': 2},
+                                    threshold=10 ** 6, output=Output())
+            Limits(instructions=budget, interval=50).execute(interpreted)
+            self.assertEqual(interpreted.names, self.vm.names)
+            self.assertEqual(interpreted.ip, self.vm.ip)
+
+    """ Utility methods. """
+    def _run(self, instructions, labels, threshold):
+        self.vm.instructions = instructions
+        self.vm.labels = labels
+        self.vm.threshold = threshold
+        self.vm.execute()
@@ -0,0 +1,119 @@
+from unittest import TestCase
+from io import StringIO
+import os
+
+from beth.Input import Input
+from beth.Output import Output
+from beth.Runner import Runner
+from beth.Transpiler import Transpiler
+
+
+class TranspilerTest(TestCase):
+    def tearDown(self) -> None:
+        if os.path.exists('test.so'):
+            os.remove('test.so')
+
+    def test_arithmetic_and_comparisons(self):
+        self._assert_same(
+            'ini x\nini y\nadd x y a\nsub x y b\nmul x y c\ndiv x y d\n'
+            'mod x y e\ngth x y f\nlth x y g\ngeq x y h\nleq x y i\n'
+            'eq x y j\nneq x y k\nand x y l\nor x y m\nnot x n\n'
+            'outl a\nout b\nout " "\nout c\nnl\noutl d\noutl e\nout f\n'
+            'out g\nout h\nout i\nout j\nout k\nout l\nout m\noutl n',
+            '17\n-5\n')
+
+    def test_strings(self):
+        self._assert_same(
+            'ins s\ncon s "{x}" t\ncon 1 s u\nsti "42" n\nadd n 1 n\n'
+            'outl t\noutl u\noutl n\nout "a\\tb"\nout unset\nnl',
+            'hello\n')
+
+    def test_loops_and_subroutines(self):
+        self._assert_same(
+            'jump main\n'
+            'double:\n  mul n 2 n\n  back\n'
+            'main:\n  ini n\n  put 0 i\n'
+            'loop:\n  br double\n  add i 1 i\n  lth i 5 c\n  jmpt c loop\n'
+            'tail:\n  sub i 1 i\n  gth i 0 c\n  brt c double\n'
+            '  jmpt c tail\n  put 0 k\n'
+            'count:\n  add k 1 k\n  lth k 3 c\n  jmpt c count\n'
+            '  outl n\n  outl k\n  end',
+            '1\n')
+
+    def test_computed_branches(self):
+        self._assert_same(
+            'put 3 p\njump p\noutl "skipped"\noutl "landed"\n'
+            'put 8 p\nbr p\noutl "returned"\nend\noutl "called"\nback',
+            '')
+
+    def test_err_without_message_carries_on(self):
+        self._assert_same('err "" 3\noutl "still here"\nend', '')
+
+    def test_unconditional_self_loop(self):
+        transpiler = self._transpile('put 1 x\nforever:\njump forever')
+        self.assertIn('while True:', transpiler.module)
+
+    """ Destructive tests. """
+    def test_err(self):
+        self._assert_same('outl "before"\nerr "failed" 7\noutl "after"', '')
+
+    def test_invalid_integer_input(self):
+        self._assert_same('ini x\noutl x', 'x\n')
+
+    def test_invalid_integer_conversion(self):
+        self._assert_same('ins s\nsti s n', 'twelve\n')
+
+    def test_back_with_empty_call_stack(self):
+        self._assert_same('outl 1\nback', '')
+
+    def test_back_after_dead_code(self):
+        self._assert_same('jump main\ndead:\noutl "x"\nback\nmain:\nback',
+                          '')
+
+    def test_unknown_computed_label(self):
+        self._assert_same('jmpt p p\nput 1 p', '')
+
+    def test_computed_branch_out_of_bounds(self):
+        self._assert_same('put 99 p\njump p', '')
+
+    def test_input_exhausted(self):
+        module = self._load(self._transpile('ini x'))
+        with self.assertRaises(EOFError):
+            module['execute'](Input(StringIO(''), batch=True), Output())
+
+    """ Utility methods. """
+    def _assert_same(self, code, stdin):
+        transpiler = self._transpile(code)
+        runner = Runner()
+        runner.load('test.so')
+        expected = runner.run(stdin)
+
+        module = self._load(transpiler)
+        stdout = StringIO()
+        exit_code, err, index = module['execute'](
+            Input(StringIO(stdin), batch=True), Output(stdout))
+
+        self.assertEqual(
+            (expected.exit_code, expected.err, expected.output),
+            (exit_code, err, stdout.getvalue()))
+        located = err and not runner.vm.reported
+        self.assertEqual(runner.vm.location() if located else None,
+                         module['locate'](index))
+
+    def _transpile(self, code):
+        with open('test.so', 'w') as file:
+            file.write(code)
+
+        runner = Runner()
+        runner.load('test.so')
+        self.assertEqual('', runner.err)
+
+        transpiler = Transpiler()
+        transpiler.transpile(runner.program, 'test.so')
+        return transpiler
+
+    @staticmethod
+    def _load(transpiler):
+        namespace = {'__name__': 'test'}
+        exec(compile(transpiler.module, 'test.py', 'exec'), namespace)
+        return namespace
@@ -3,6 +3,8 @@ import sys
 from io import StringIO
 from contextlib import contextmanager
 
+from beth.Input import Input
+from beth.Output import Output
 from beth.VM import VM
 
 
@@ -265,7 +267,7 @@ class VMTest(TestCase):
             'put 1 a',
             'end',
         ]
-        self.vm.names = {'point': 3}
+        self.vm.labels = {'point': 3}
         for i in range(3):
             self.vm.tick()
         self._assert_name_equals(0, 'a')
@@ -279,7 +281,7 @@ class VMTest(TestCase):
             'jmpt i exit',  # jump!
             'put 0 b',      # unreachable
         ]
-        self.vm.names = {'exit': 6}
+        self.vm.labels = {'exit': 6}
         for i in range(5):
             self.vm.tick()
         self._assert_name_equals(42, 'a')
@@ -294,7 +296,7 @@ class VMTest(TestCase):
             'jmpf i exit',  # jump!
             'put 0 b',      # unreachable
         ]
-        self.vm.names = {'exit': 6}
+        self.vm.labels = {'exit': 6}
         for i in range(5):
             self.vm.tick()
         self._assert_name_equals(42, 'a')
@@ -306,7 +308,7 @@ class VMTest(TestCase):
             'add i 1 i',
             'br start',
         ]
-        self.vm.names = {'start': 1}
+        self.vm.labels = {'start': 1}
         self.vm.tick()      # i = 0
         for i in range(3):
             self._assert_name_equals(i, 'i')
@@ -323,7 +325,7 @@ class VMTest(TestCase):
             'brt i exit',   # jump!
             'put 0 b',      # unreachable
         ]
-        self.vm.names = {'exit': 6}
+        self.vm.labels = {'exit': 6}
         for i in range(5):
             self.vm.tick()
         self._assert_name_equals(42, 'a')
@@ -339,7 +341,7 @@ class VMTest(TestCase):
             'brf i exit',   # jump!
             'put 0 b',      # unreachable
         ]
-        self.vm.names = {'exit': 6}
+        self.vm.labels = {'exit': 6}
         for i in range(5):
             self.vm.tick()
         self._assert_name_equals(42, 'a')
@@ -354,7 +356,7 @@ class VMTest(TestCase):
             'put "hi" b',
             'back',
         ]
-        self.vm.names = {'make': 3}
+        self.vm.labels = {'make': 3}
         for i in range(4):
             self.vm.tick()
         self._assert_name_true('a')
@@ -374,6 +376,88 @@ class VMTest(TestCase):
         self.assertFalse(self.vm.err)
         self.assertFalse(self.vm.exit_code)
 
+    """ Injected stream tests. """
+    def test_reads_from_injected_batch_input(self):
+        self.vm.input = Input(StringIO('42\nhello\nwrong\n'), batch=True)
+        self.vm.instructions = ['ini a', 'ins b', 'ini c']
+        for i in range(3):
+            self.vm.tick()
+        self._assert_name_equals(42, 'a')
+        self._assert_name_equals('hello', 'b')
+        self.assertEqual(
+            'invalid literal "wrong" for integer conversion', self.vm.err)
+
+    """ Output buffering tests. """
+    def test_buffered_output_is_flushed_at_end(self):
+        stream = StringIO()
+        self.vm.output = Output(stream, buffer_size=1024)
+        self.vm.instructions = ['outl "hello"', 'out 42', 'nl', 'end']
+        self.vm.tick()
+        self.assertEqual('', stream.getvalue())
+        for i in range(3):
+            self.vm.tick()
+        self.assertEqual('hello\n42\n', stream.getvalue())
+
+    def test_buffered_output_is_flushed_before_input(self):
+        stream = StringIO()
+        self.vm.output = Output(stream, buffer_size=1024)
+        self.vm.instructions = ['out "age: "', 'ini age']
+        self.vm.tick()
+
+        def prompted_input():
+            self.assertEqual('age: ', stream.getvalue())
+            return '42'
+
+        with mock.patch('builtins.input', side_effect=prompted_input):
+            self.vm.tick()
+        self._assert_name_equals(42, 'age')
+
+    def test_buffered_output_is_flushed_on_err(self):
+        stream = StringIO()
+        self.vm.output = Output(stream, buffer_size=1024)
+        self.vm.instructions = ['out "bye"', 'err "failed" 3']
+        self.vm.tick()
+        self.vm.tick()
+        self.assertEqual('bye', stream.getvalue())
+
+    """ Superinstruction tests. """
+    def test_fused_compare_and_branch_still_writes_condition(self):
+        self.vm.instructions = [
+            'put 6 i',
+            'leq i 5 b',
+            'jmpf b exit',
+            'put 1 a',
+            'end',
+        ]
+        self.vm.labels = {'exit': 4}
+        while self.vm.run and not self.vm.err:
+            self.vm.tick()
+        self._assert_name_false('b')
+        self.assertTrue('a' not in self.vm.names)
+
+    def test_fused_pair_can_be_entered_in_the_middle(self):
+        self.vm.instructions = [
+            'put 1 b',
+            'jump middle',
+            'leq 1 0 b',
+            'jmpt b exit',
+            'put 1 a',
+            'end',
+        ]
+        self.vm.labels = {'middle': 3, 'exit': 5}
+        while self.vm.run and not self.vm.err:
+            self.vm.tick()
+        self.assertTrue('a' not in self.vm.names)
+
+    def test_fusion_can_be_turned_off(self):
+        self.vm.fuse = False
+        self.vm.instructions = ['put 0 i', 'add i 1 i', 'jump start']
+        self.vm.labels = {'start': 1}
+        self.vm.tick()
+        self.vm.tick()
+        self.assertEqual(2, self.vm.ip)
+        self.assertEqual('add:vc', self.vm.program[1][0])
+
     """ Destructive tests. """
     def test_fetch_sets_err_flag_on_invalid_ip(self):
         self.vm.instructions = ['put 50 mp', 'jump mp', 'end']
@@ -414,6 +498,113 @@ class VMTest(TestCase):
         self.vm.tick()
         self._assert_err_flag_set()
 
+    def test_computed_branch_catches_target_out_of_bounds(self):
+        self.vm.instructions = ['put 50 mp', 'jump mp', 'end']
+        self.vm.execute()
+        self.assertEqual('invalid branch target: 50', self.vm.err)
+        self.assertEqual(2, self.vm.ip)
+
+    def test_computed_branch_catches_string_target(self):
+        self.vm.instructions = ['put "exit" mp', 'jmpt 1 mp', 'end']
+        self.vm.execute()
+        self.assertEqual('invalid branch target: exit', self.vm.err)
+
+    def test_computed_branch_catches_unset_target(self):
+        self.vm.instructions = ['jmpf 0 mp', 'put 1 mp']
+        self.vm.execute()
+        self.assertEqual('unknown label: mp', self.vm.err)
+
+    def test_unknown_label_is_reported_before_execution(self):
+        self.vm.instructions = ['put 1 a', 'jump unknown']
+        self.vm.tick()
+        self._assert_err_flag_set()
+        self.assertTrue('a' not in self.vm.names)
+
+    def test_variable_does_not_shadow_label(self):
+        self.vm.instructions = [
+            'put 0 point',
+            'jump point',
+            'put 1 a',
+            'end',
+        ]
+        self.vm.labels = {'point': 3}
+        for i in range(3):
+            self.vm.tick()
+        self.assertFalse(self.vm.run)
+        self.assertTrue('a' not in self.vm.names)
+
+    def test_computed_jump_through_variable(self):
+        self.vm.instructions = [
+            'put 3 target',
+            'jump target',
+            'put 1 a',
+            'end',
+        ]
+        for i in range(3):
+            self.vm.tick()
+        self.assertFalse(self.vm.run)
+        self.assertTrue('a' not in self.vm.names)
+
+    def test_computed_branch_through_variable(self):
+        self.vm.instructions = [
+            'put 6 target',
+            'put 0 i',
+            'brt i target',  # no branch!
+            'put 1 i',
+            'brt i target',  # branch!
+            'end',
+            'put 42 a',
+            'back',
+        ]
+        self.vm.execute()
+        self._assert_name_equals(42, 'a')
+        self.assertEqual('', self.vm.err)
+
+    def test_con_builds_long_strings(self):
+        self.vm.output = Output(StringIO())
+        self.vm.instructions = [
+            'put 0 i',
+            'put "" s',
+            'con s "ab" s',
+            'add i 1 i',
+            'lth i 500 c',
+            'jmpt c loop',
+            f'eq s "{"ab" * 500}" e',
+            'con s "!" t',
+            'outl t',
+            'sti s n',
+        ]
+        self.vm.labels = {'loop': 2}
+        self.vm.execute()
+        self.assertEqual('ab' * 500, self.vm.names['s'])
+        self._assert_name_true('e')
+        self.assertEqual('ab' * 500 + '!\n',
+                         self.vm.output.stream.getvalue())
+        self.assertEqual(f'invalid literal "{"ab" * 500}" for integer '
+                         'conversion', self.vm.err)
+
+    def test_out_streams_long_strings_in_chunks(self):
+        writes = []
+        self.vm.input = Input(StringIO('x' * 300 + '\n'), batch=True)
+        self.vm.output = mock.Mock(write=writes.append)
+        self.vm.instructions = [
+            'ins s',
+            'con s "a" s',
+            'con s "b" s',
+            'outl s',
+        ]
+        self.vm.execute()
+        self.assertEqual(['x' * 300 + 'a', 'b', '\n'], writes)
+
+    def test_direct_branches_skip_the_jump_table(self):
+        self.vm.instructions = ['put 2 p', 'jump p', 'jump done', 'end']
+        self.vm.labels = {'done': 3}
+        for i in range(3):
+            self.vm.tick()
+        self.assertEqual(3, self.vm.ip)
+        self.assertEqual(('jump:ptr', 'jump'),
+                         (self.vm.program[1][0], self.vm.program[2][0]))
+
     """ Utility methods. """
     def _assert_err_flag_set(self):
         self.assertTrue(self.vm.err)